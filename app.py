@@ -1,12 +1,26 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import numpy as np
-import json
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-import re
+from typing import Dict, List, Mapping, Tuple, Optional, Union
+import json
+import time
+import plotly.colors
 import plotly.graph_objects as go
 
+from geoviz.ingest import default_workers, format_timings, load_timesteps, read_vtk_ymfs, timestep_files
+from geoviz.isosurface import marching_cubes
+from geoviz.npz_store import open_npz_store
+from geoviz.plotly_bundle import script_tag
+from geoviz.plume_index import PlumeIndex, axis_coordinates, build_plume_index, plume_mask, plume_volume
+from geoviz.preprocess_cache import PreprocessCache, cache_key
+from geoviz.reservoir_stats import PropertyStats, ReservoirStats, load_or_compute_stats
+from geoviz.slice_volume import SliceVolume, derive_volume, fit_stride
+from geoviz.summary import EclSummary
+from geoviz.timestep_store import open_timestep_store
+from geoviz.viewer_payload import DECODER_JS, Lazy, payload_js
+from geoviz.voxel_mesh import VoxelMesh, color_buckets, exposed_faces, greedy_faces
+
 st.set_page_config(
     page_title="GeoViz - Visualizador Geológico",
     page_icon="🌍",
@@ -22,109 +36,71 @@ GEOSX_VTK_DIR = BASE_DIR / "data" / "geosx" / "new_simulation" / "timesteps_vtk"
 GEOSX_VTK_DIR.mkdir(parents=True, exist_ok=True)
 CACHE_DIR = BASE_DIR / "outputs" / "cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+TIMESTEPS_STORE_DIR = CACHE_DIR / "timesteps_store"
 GEOSX_DIR = BASE_DIR / "data" / "geosx"
+GEOSX_CASE = GEOSX_DIR / "new_simulation" / "DEP_GAS"
 BUNTER_DIR = BASE_DIR / "data" / "BUNTER"
 SLEIPNER_DIR = BASE_DIR / "data" / "sleipner_data"
+# .npz de cada reservorio; sus estadísticas se guardan junto a metadata.json
+RESERVOIR_FILES = {
+    "Bunter": BUNTER_DIR / "bunter_data.npz",
+    "Sleipner": SLEIPNER_DIR / "sleipner_data.npz",
+}
+# Propiedades de los .npz descomprimidas para memory-map
+RESERVOIR_STORE_DIR = CACHE_DIR / "reservoirs"
+# Procesos para parsear timesteps sin sidecar (GEOVIZ_INGEST_WORKERS; por defecto en serie)
+INGEST_WORKERS = default_workers()
+# Grilla (nx, ny, nz) del visor CO₂ de timesteps_export/
+CO2_VIEWER_DIMS = (100, 100, 10)
+# Caché en disco de los datos de los visores (presupuesto: GEOVIZ_CACHE_BUDGET_MB).
+# Incrementar PREPROCESS_VERSION al cambiar el preprocesado invalida las entradas.
+PREPROCESS_VERSION = 1
+PREPROCESS_CACHE = PreprocessCache(CACHE_DIR / "preprocessed")
+# Triángulos máximos que se envían al navegador en la vista de bloques de facies
+MAX_BLOCK_TRIANGLES = 1_500_000
+# Celdas máximas del volumen que se envía al navegador en los cortes del lado del cliente
+MAX_SLICE_VIEWER_CELLS = 1_000_000
+# Archivos estáticos que Streamlit sirve en app/static/ (server.enableStaticServing)
+STATIC_DIR = BASE_DIR / "static"
+
+
+@st.cache_resource(show_spinner=False)
+def plotly_script() -> str:
+    """`<script>` de plotly.js para los visores HTML, sin CDN.
+
+    Con `server.enableStaticServing` la librería del paquete `plotly` se copia
+    a `static/` y el navegador la descarga una vez; sin él se embebe.
+    """
+    if st.get_option("server.enableStaticServing"):
+        return script_tag(STATIC_DIR, "app/static/")
+    return script_tag()
 
 
-@st.cache_data(show_spinner=False)
-def read_grdecl_property(filepath: str) -> np.ndarray:
-    """Lee valores de un archivo GRDECL."""
-    values: List[float] = []
-    reading = False
-    with open(filepath, "r", encoding="utf-8") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("--"):
-                continue
-            if any(key in line for key in ["YMFS", "SOIL", "SWAT", "SGAS", "PRESSURE"]):
-                reading = True
-                continue
-            if line == "/" or line.startswith("/"):
-                break
-            if reading:
-                parts = line.replace("/", "").split()
-                for part in parts:
-                    if "*" in part:
-                        count_str, value_str = part.split("*")
-                        try:
-                            values.extend([float(value_str)] * int(count_str))
-                        except Exception:
-                            continue
-                    else:
-                        try:
-                            values.append(float(part))
-                        except Exception:
-                            continue
-    return np.array(values, dtype=float)
-
-
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False)
 def load_all_timesteps() -> Tuple[Dict[int, np.ndarray], List[int]]:
-    """Carga todos los timesteps YMFS."""
+    """Carga todos los timesteps YMFS.
+
+    Los valores son vistas del almacén memory-mapped (propiedad, timestep, celda),
+    que se construye la primera vez y se reconstruye si cambian los GRDECL.
+    """
     if not TIMESTEPS_DIR.exists():
         return {}, []
 
-    files = sorted(TIMESTEPS_DIR.glob("YMFS_ts_*.GRDECL"))
-    data: Dict[int, np.ndarray] = {}
-    indices: List[int] = []
+    try:
+        store = open_timestep_store(TIMESTEPS_DIR, TIMESTEPS_STORE_DIR, workers=INGEST_WORKERS)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ No se pudo usar el almacén de timesteps: {e}")
+        store = None
 
-    for filepath in files:
-        match = re.search(r"ts_(\d+)", filepath.name)
-        if not match:
-            continue
-        timestep = int(match.group(1))
-        data[timestep] = read_grdecl_property(str(filepath))
-        indices.append(timestep)
+    if store is not None and "YMFS" in store.available:
+        data = store.as_dict("YMFS")
+        return data, sorted(data)
 
-    indices.sort()
-    return data, indices
-
-
-@st.cache_data(show_spinner=False)
-def load_vtk_ymfs(filepath: Path) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-    """Carga datos YMFS y coordenadas desde un archivo VTK.
-    
-    Returns:
-        Tuple de (ymfs_data, z_coords) o (None, None) si hay error
-    """
-    try:
-        import pyvista as pv
-        # Configurar para evitar problemas de OpenGL
-        import os
-        os.environ['PYVISTA_OFF_SCREEN'] = 'true'
-        pv.OFF_SCREEN = True
-        
-        grid = pv.read(str(filepath))
-        
-        # Intentar obtener YMFS de cell_data o cell_arrays
-        ymfs_data = None
-        if hasattr(grid, 'cell_data') and 'YMFS' in grid.cell_data:
-            ymfs_data = np.array(grid.cell_data['YMFS'])
-        elif hasattr(grid, 'cell_arrays') and 'YMFS' in grid.cell_arrays:
-            ymfs_data = np.array(grid.cell_arrays['YMFS'])
-        elif hasattr(grid, 'point_data') and 'YMFS' in grid.point_data:
-            ymfs_data = np.array(grid.point_data['YMFS'])
-        elif hasattr(grid, 'point_arrays') and 'YMFS' in grid.point_arrays:
-            ymfs_data = np.array(grid.point_arrays['YMFS'])
-        
-        # Obtener coordenadas Z reales de las celdas
-        z_coords = None
-        try:
-            centers = grid.cell_centers()
-            z_coords = centers.points[:, 2]  # Coordenada Z (depth)
-        except:
-            # Fallback: usar puntos del grid
-            if hasattr(grid, 'points'):
-                z_coords = grid.points[:, 2]
-        
-        if ymfs_data is not None and z_coords is not None:
-            return ymfs_data, z_coords
-        
-        return None, None
-    except Exception as e:
-        print(f"Error al cargar VTK {filepath}: {e}")
-        return None, None
+    start = time.perf_counter()
+    data, timings = load_timesteps(timestep_files(TIMESTEPS_DIR, "YMFS_ts_*.GRDECL"),
+                                   workers=INGEST_WORKERS)
+    print(f"Timesteps YMFS:\n{format_timings(timings, time.perf_counter() - start)}")
+    return data, sorted(data)
 
 
 @st.cache_data(show_spinner=False)
@@ -134,59 +110,61 @@ def load_all_timesteps_geosx() -> Tuple[Dict[int, np.ndarray], Dict[int, np.ndar
     Returns:
         Tuple de (ymfs_dict, z_coords_dict, timestep_indices)
     """
-    data: Dict[int, np.ndarray] = {}
-    z_coords_dict: Dict[int, np.ndarray] = {}
-    indices: List[int] = []
-    
-    # Primero intentar cargar desde VTK (preferido)
-    if GEOSX_VTK_DIR.exists():
-        vtk_files = sorted(GEOSX_VTK_DIR.glob("ymfs_ts_*.vtk"))
-        if vtk_files:
-            for filepath in vtk_files:
-                match = re.search(r"ts_(\d+)", filepath.name)
-                if not match:
-                    continue
-                timestep = int(match.group(1))
-                ymfs_data, z_coords = load_vtk_ymfs(filepath)
-                if ymfs_data is not None and z_coords is not None:
-                    data[timestep] = ymfs_data
-                    z_coords_dict[timestep] = z_coords
-                    indices.append(timestep)
-            
-            if indices:
-                indices.sort()
-                return data, z_coords_dict, indices
-    
-    # Si no hay VTK, intentar cargar desde GRDECL
-    if GEOSX_TIMESTEPS_DIR.exists():
-        grdecl_files = sorted(GEOSX_TIMESTEPS_DIR.glob("YMFS_ts_*.GRDECL"))
-        for filepath in grdecl_files:
-            match = re.search(r"ts_(\d+)", filepath.name)
-            if not match:
-                continue
-            timestep = int(match.group(1))
-            data[timestep] = read_grdecl_property(str(filepath))
-            # Para GRDECL, no tenemos coordenadas Z, así que usamos None
-            z_coords_dict[timestep] = None
-            indices.append(timestep)
-    
-    indices.sort()
-    return data, z_coords_dict, indices
+    # Primero intentar cargar desde VTK (preferido); cada proceso importa
+    # PyVista una sola vez
+    vtk_files = timestep_files(GEOSX_VTK_DIR, "ymfs_ts_*.vtk") if GEOSX_VTK_DIR.exists() else []
+    if vtk_files:
+        start = time.perf_counter()
+        loaded, timings = load_timesteps(vtk_files, read_vtk_ymfs, workers=INGEST_WORKERS)
+        print(f"Timesteps VTK GEOSX:\n{format_timings(timings, time.perf_counter() - start)}")
+        loaded = {ts: pair for ts, pair in loaded.items() if pair[0] is not None and pair[1] is not None}
+        if loaded:
+            indices = sorted(loaded)
+            return ({ts: loaded[ts][0] for ts in indices},
+                    {ts: loaded[ts][1] for ts in indices}, indices)
+    
+    # Si no hay VTK, intentar cargar desde GRDECL (sin coordenadas Z)
+    grdecl_files = timestep_files(GEOSX_TIMESTEPS_DIR, "YMFS_ts_*.GRDECL") if GEOSX_TIMESTEPS_DIR.exists() else []
+    start = time.perf_counter()
+    data, timings = load_timesteps(grdecl_files, workers=INGEST_WORKERS)
+    if timings:
+        print(f"Timesteps GRDECL GEOSX:\n{format_timings(timings, time.perf_counter() - start)}")
+    return data, {ts: None for ts in data}, sorted(data)
+
+
+@st.cache_resource(show_spinner=False)
+def load_plume_index() -> Tuple[Optional[PlumeIndex], List[int]]:
+    """Índice disperso de YMFS (celdas no nulas ordenadas por valor) de `load_all_timesteps`."""
+    ymfs_by_ts, ts_indices = load_all_timesteps()
+    if not ts_indices:
+        return None, []
+    nx, ny, nz = CO2_VIEWER_DIMS
+    return build_plume_index(ymfs_by_ts, ts_indices, n_cells=nx * ny * nz), ts_indices
+
+
+@st.cache_resource(show_spinner=False)
+def load_plume_index_geosx() -> Tuple[Optional[PlumeIndex], Dict[int, np.ndarray], List[int]]:
+    """Índice disperso de YMFS de GEOSX y coordenadas Z de `load_all_timesteps_geosx`."""
+    ymfs_by_ts, z_coords_dict, ts_indices = load_all_timesteps_geosx()
+    if not ts_indices:
+        return None, z_coords_dict, []
+    return build_plume_index(ymfs_by_ts, ts_indices), z_coords_dict, ts_indices
 
 
 @st.cache_data(show_spinner=False)
-def preprocess_all_data_geosx(ymfs_dict: Dict[int, np.ndarray], z_coords_dict: Dict[int, np.ndarray], ts_indices: List[int], threshold: float) -> Dict:
-    """Preprocesa todos los datos de GEOSX para JavaScript usando coordenadas reales del VTK."""
-    if not ts_indices or not ymfs_dict:
-        return {'timesteps': [], 'data': {}, 'injectors': {'vertices': [], 'faces': []}, 'grid': {}, 'bounds': {}}
+def preprocess_geosx_layout(_z_coords_dict: Dict[int, np.ndarray], ts_indices: List[int], total_cells: int) -> Tuple[Dict, Tuple[np.ndarray, np.ndarray, np.ndarray], Tuple[int, int, int]]:
+    """Parte del preprocesado GEOSX que no depende del umbral (grilla, pozos, bounds).
+
+    Returns:
+        Tuple de (datos para JavaScript sin 'timesteps'/'data', coordenadas x, y, z por celda, (nz, ny, nx))
+    """
+    z_coords_dict = _z_coords_dict
     
     # Obtener dimensiones del primer timestep
     first_ts = ts_indices[0]
-    first_data = ymfs_dict[first_ts]
     first_z_coords = z_coords_dict.get(first_ts)
     
     # Calcular dimensiones del grid basándose en el número total de celdas
-    total_cells = len(first_data)
     
     # Intentar detectar dimensiones comunes o usar valores por defecto
     # Para GEOSX, vamos a usar dimensiones típicas o detectarlas
@@ -291,7 +269,7 @@ def preprocess_all_data_geosx(ymfs_dict: Dict[int, np.ndarray], z_coords_dict: D
     first_z_coords_ts = z_coords_dict.get(first_ts)
     
     # Intentar obtener coordenadas completas (X, Y, Z) del VTK
-    grid_cells = []  # Para visualizar toda la grilla (una sola vez, muy transparente)
+    coords_all = None
     
     # Si tenemos coordenadas Z del VTK, intentar obtener también X e Y
     if first_z_coords_ts is not None and len(first_z_coords_ts) == total_cells:
@@ -306,114 +284,30 @@ def preprocess_all_data_geosx(ymfs_dict: Dict[int, np.ndarray], z_coords_dict: D
             if vtk_file.exists():
                 grid_vtk = pv.read(str(vtk_file))
                 centers = grid_vtk.cell_centers()
-                coords_all = centers.points  # Array de (n_cells, 3) con [x, y, z]
-                
-                # Usar coordenadas reales del VTK directamente
-                for idx in range(min(total_cells, len(coords_all))):
-                    grid_cells.append({
-                        'x': float(coords_all[idx, 0]),
-                        'y': float(coords_all[idx, 1]),
-                        'z': float(coords_all[idx, 2]),
-                        'value': 0.0
-                    })
-                
-                # Si faltan celdas, completar con cálculo
-                if len(grid_cells) < total_cells:
-                    for idx in range(len(grid_cells), total_cells):
-                        k = idx // (nx * ny)
-                        j = (idx % (nx * ny)) // nx
-                        i = idx % nx
-                        x = x_min + (i + 0.5) * cell_size_x
-                        y = y_min + (j + 0.5) * cell_size_y
-                        z = z_top + (k + 0.5) * cell_size_z
-                        grid_cells.append({
-                            'x': float(x),
-                            'y': float(y),
-                            'z': float(z),
-                            'value': 0.0
-                        })
+                coords_all = np.asarray(centers.points)  # Array de (n_cells, 3) con [x, y, z]
             else:
                 raise FileNotFoundError(f"VTK file not found: {vtk_file}")
         except Exception as e:
             print(f"⚠️ No se pudieron cargar coordenadas completas del VTK: {e}")
-            # Fallback: calcular coordenadas
-            use_real_coords_grid = False
-    else:
-        use_real_coords_grid = False
-    
-    # Si no se pudieron cargar coordenadas del VTK, calcularlas
-    if len(grid_cells) == 0:
-        # Calcular coordenadas para todas las celdas
-        for k in range(nz):
-            for j in range(ny):
-                for i in range(nx):
-                    idx = i + j * nx + k * nx * ny
-                    if idx >= total_cells:
-                        continue
-                    
-                    x = x_min + (i + 0.5) * cell_size_x
-                    y = y_min + (j + 0.5) * cell_size_y
-                    
-                    # Usar coordenada Z real si está disponible
-                    if first_z_coords_ts is not None and idx < len(first_z_coords_ts):
-                        z = float(first_z_coords_ts[idx])
-                    else:
-                        z = z_top + (k + 0.5) * cell_size_z
-                    
-                    grid_cells.append({
-                        'x': float(x),
-                        'y': float(y),
-                        'z': float(z),
-                        'value': 0.0
-                    })
-    
-    # Datos por timestep (solo índices y valores de celdas > threshold)
-    timestep_data = {}
     
-    for ts in ts_indices:
-        ymfs_values = ymfs_dict[ts]
-        z_coords_ts = z_coords_dict.get(ts)
-        use_real_coords_ts = (z_coords_ts is not None and len(z_coords_ts) == len(ymfs_values))
-        
-        total = nx * ny * nz
-        if len(ymfs_values) < total:
-            padded = np.zeros(total, dtype=float)
-            padded[:len(ymfs_values)] = ymfs_values
-            ymfs_values = padded
-        elif len(ymfs_values) > total:
-            ymfs_values = ymfs_values[:total]
-        
-        # Solo guardamos índices de celdas activas (> threshold)
-        active_cells = []
-        
-        # Procesar todas las celdas usando las coordenadas de la grilla
-        for idx in range(len(ymfs_values)):
-            value = ymfs_values[idx]
-            
-            # Usar coordenadas de la grilla ya calculadas
-            grid_cell = grid_cells[idx]
-            x = grid_cell['x']
-            y = grid_cell['y']
-            
-            # Si tenemos coordenadas Z reales para este timestep, usarlas
-            if use_real_coords_ts:
-                z = float(z_coords_ts[idx])
-            else:
-                z = grid_cell['z']
-            
-            # Guardar solo celdas activas (> threshold)
-            if value >= threshold:
-                active_cells.append({
-                    'x': float(x),
-                    'y': float(y),
-                    'z': float(z),
-                    'value': float(value)
-                })
-        
-        timestep_data[str(ts)] = {
-            'cells': active_cells,
-            'count': len(active_cells)
-        }
+    # Centros de celda calculados para toda la grilla (x varía más rápido)
+    n_grid = total_cells if coords_all is not None else min(nx * ny * nz, total_cells)
+    k, rest = np.divmod(np.arange(n_grid), nx * ny)
+    j, i = np.divmod(rest, nx)
+    cell_x = x_min + (i + 0.5) * cell_size_x
+    cell_y = y_min + (j + 0.5) * cell_size_y
+    cell_z = z_top + (k + 0.5) * cell_size_z
+    
+    if coords_all is not None:
+        # Usar coordenadas reales del VTK directamente; si faltan celdas quedan las calculadas
+        n_real = min(total_cells, len(coords_all))
+        cell_x[:n_real] = coords_all[:n_real, 0]
+        cell_y[:n_real] = coords_all[:n_real, 1]
+        cell_z[:n_real] = coords_all[:n_real, 2]
+    elif first_z_coords_ts is not None:
+        # Usar coordenada Z real si está disponible
+        n_real = min(n_grid, len(first_z_coords_ts))
+        cell_z[:n_real] = first_z_coords_ts[:n_real]
     
     # Calcular bounds reales desde las coordenadas Z
     if first_z_coords is not None and len(first_z_coords) > 0:
@@ -423,10 +317,19 @@ def preprocess_all_data_geosx(ymfs_dict: Dict[int, np.ndarray], z_coords_dict: D
         z_min_real = z_top
         z_max_real = z_bottom
     
-    return {
-        'timesteps': ts_indices,
-        'data': timestep_data,
-        'grid_cells': grid_cells,  # Todas las celdas de la grilla para visualización transparente
+    # Envoltura del reservorio: solo las caras exteriores de la grilla, calculada
+    # una vez aquí (el visor la dibuja como traza estática, sin reconstruirla)
+    n_shell = nz * ny * nx
+    shell_mask = np.zeros(n_shell, dtype=bool)
+    shell_mask[:min(n_shell, n_grid)] = True
+    shell_coords = [np.pad(c[:n_shell], (0, max(0, n_shell - n_grid))) for c in (cell_x, cell_y, cell_z)]
+    envelope = exposed_faces(shell_mask.reshape(nz, ny, nx), *shell_coords,
+                             (cell_size_x, cell_size_y, cell_size_z)).as_columns()
+    del envelope['intensity']
+    
+    layout = {
+        # Caras exteriores de la grilla para visualización transparente (columnas float32/uint32)
+        'envelope': envelope,
         'injectors': {
             'vertices': injector_vertices,
             'faces': injector_faces
@@ -442,12 +345,134 @@ def preprocess_all_data_geosx(ymfs_dict: Dict[int, np.ndarray], z_coords_dict: D
             'z': [float(z_min_real), float(z_max_real)]
         }
     }
+    return layout, (cell_x, cell_y, cell_z), (nz, ny, nx)
 
 
-@st.cache_data(show_spinner=False)
-def preprocess_all_data(ymfs_dict: Dict[int, np.ndarray], ts_indices: List[int], threshold: float) -> Dict:
-    """Preprocesa todos los datos para JavaScript (Bunter)."""
-    nx, ny, nz = 100, 100, 10
+def plume_surface(mask: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                  cell_size: Tuple[float, float, float], values: np.ndarray,
+                  greedy_buckets: int = 0) -> VoxelMesh:
+    """Malla de la pluma: caras expuestas o, con `greedy_buckets > 0`, caras
+    coplanares fusionadas por franja de color (YMFS en [0, 1])."""
+    if greedy_buckets <= 0:
+        return exposed_faces(mask, x, y, z, cell_size, values)
+    labels, centers = color_buckets(values, greedy_buckets)
+    return greedy_faces(mask, x, y, z, cell_size, labels, centers)
+
+
+def plume_isosurface(volume: np.ndarray, threshold: float, x: np.ndarray, y: np.ndarray,
+                     z: np.ndarray, cell_size: Tuple[float, float, float]) -> VoxelMesh:
+    """Isosuperficie YMFS = threshold; `x`, `y`, `z` son los orígenes de celda
+    de `plume_surface` y los nodos de marching cubes sus centros."""
+    half = [size / 2.0 for size in cell_size]
+    return marching_cubes(volume, threshold, np.asarray(x) + half[0], np.asarray(y) + half[1],
+                          np.asarray(z) + half[2])
+
+
+def plume_mesh_controls(key_prefix: str) -> Tuple[bool, int]:
+    """Controles de la malla de la pluma en el sidebar.
+
+    Returns:
+        (isosuperficie, franjas del mallado greedy; 0 = desactivado)
+    """
+    representation = st.sidebar.radio(
+        "Representación de la pluma", ["Vóxeles", "Isosuperficie"], key=f"{key_prefix}_surface",
+        help="Vóxeles: cubos de las celdas >= umbral | Isosuperficie: superficie suave YMFS = umbral"
+    )
+    if representation == "Isosuperficie":
+        return True, 0
+    greedy = st.sidebar.checkbox(
+        "Fusionar caras coplanares (greedy)", value=False, key=f"{key_prefix}_greedy",
+        help="Une caras vecinas del mismo color en rectángulos: muchos menos triángulos, "
+             "con el color de la pluma discretizado en franjas"
+    )
+    if not greedy:
+        return False, 0
+    return False, st.sidebar.slider("Franjas de color", 2, 64, 16, 1, key=f"{key_prefix}_buckets")
+
+
+def geosx_input_files() -> List[Path]:
+    """Archivos de entrada del visor GEOSX (VTK y GRDECL de YMFS)."""
+    files = timestep_files(GEOSX_VTK_DIR, "ymfs_ts_*.vtk") + timestep_files(GEOSX_TIMESTEPS_DIR, "YMFS_ts_*.GRDECL")
+    return [filepath for _, filepath in files]
+
+
+def bunter_input_files() -> List[Path]:
+    """Archivos de entrada del visor CO₂ (GRDECL de YMFS en timesteps_export/)."""
+    return [filepath for _, filepath in timestep_files(TIMESTEPS_DIR, "YMFS_ts_*.GRDECL")]
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def preprocess_all_data_geosx(_plume_index: PlumeIndex, _z_coords_dict: Dict[int, np.ndarray], ts_indices: List[int], threshold: float, greedy_buckets: int = 0, isosurface: bool = False) -> Dict:
+    """`build_viewer_data_geosx` con caché en disco (clave: huellas de los
+    archivos de entrada, `PREPROCESS_VERSION` y parámetros)."""
+    params = {'timesteps': ts_indices, 'threshold': threshold,
+              'greedy_buckets': greedy_buckets, 'isosurface': isosurface}
+    key = cache_key('co2_viewer_geosx', PREPROCESS_VERSION, params, geosx_input_files())
+    return PREPROCESS_CACHE.get_or_build(key, lambda: build_viewer_data_geosx(
+        _plume_index, _z_coords_dict, ts_indices, threshold, greedy_buckets, isosurface))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def preprocess_all_data(_plume_index: PlumeIndex, ts_indices: List[int], threshold: float, greedy_buckets: int = 0, isosurface: bool = False) -> Dict:
+    """`build_viewer_data` con caché en disco (clave: huellas de los archivos
+    de entrada, `PREPROCESS_VERSION` y parámetros)."""
+    params = {'timesteps': ts_indices, 'threshold': threshold, 'greedy_buckets': greedy_buckets,
+              'isosurface': isosurface, 'dims': CO2_VIEWER_DIMS}
+    key = cache_key('co2_viewer_bunter', PREPROCESS_VERSION, params, bunter_input_files())
+    return PREPROCESS_CACHE.get_or_build(key, lambda: build_viewer_data(
+        _plume_index, ts_indices, threshold, greedy_buckets, isosurface))
+
+
+def build_viewer_data_geosx(plume_index: PlumeIndex, z_coords_dict: Dict[int, np.ndarray], ts_indices: List[int], threshold: float, greedy_buckets: int = 0, isosurface: bool = False) -> Dict:
+    """Preprocesa todos los datos de GEOSX para JavaScript usando coordenadas reales del VTK.
+
+    La grilla se prepara una sola vez (`preprocess_geosx_layout`); por umbral
+    solo se recorren las celdas que devuelve `plume_index`. Cada timestep
+    lleva la malla de caras expuestas de la pluma (`exposed_faces`), o la
+    fusionada en `greedy_buckets` franjas de color (`greedy_faces`), o con
+    `isosurface` la isosuperficie YMFS = threshold (`marching_cubes`).
+    """
+    if not ts_indices or plume_index.n_cells == 0:
+        return {'timesteps': [], 'data': {}, 'injectors': {'vertices': [], 'faces': []}, 'grid': {}, 'bounds': {}}
+    
+    layout, (cell_x, cell_y, cell_z), shape = preprocess_geosx_layout(z_coords_dict, ts_indices, plume_index.n_cells)
+    cell_size = (layout['grid']['cell_size_x'], layout['grid']['cell_size_y'], layout['grid']['cell_size_z'])
+    
+    # Datos por timestep: solo las celdas >= threshold, tomadas del índice
+    timestep_data = {}
+    
+    for ts in ts_indices:
+        z_coords_ts = z_coords_dict.get(ts)
+        use_real_coords_ts = (z_coords_ts is not None and len(z_coords_ts) == plume_index.n_cells)
+        
+        # Usar coordenadas de la grilla; Z real del timestep si está disponible
+        cell_z_ts = np.asarray(z_coords_ts) if use_real_coords_ts else cell_z
+        mask, values = plume_mask(plume_index, ts, threshold, shape)
+        if isosurface:
+            volume = plume_volume(plume_index, ts, shape)
+            mesh = plume_isosurface(volume, threshold, cell_x, cell_y, cell_z_ts, cell_size)
+        else:
+            mesh = plume_surface(mask, cell_x, cell_y, cell_z_ts, cell_size, values, greedy_buckets)
+        
+        timestep_data[str(ts)] = {'mesh': mesh.as_columns(), 'count': int(np.count_nonzero(mask))}
+    
+    return {
+        'timesteps': ts_indices,
+        'threshold': float(threshold),
+        'data': timestep_data,
+        **layout
+    }
+
+
+def build_viewer_data(plume_index: PlumeIndex, ts_indices: List[int], threshold: float, greedy_buckets: int = 0, isosurface: bool = False) -> Dict:
+    """Preprocesa todos los datos para JavaScript (Bunter).
+
+    `plume_index` es el índice de `load_plume_index`. Cada
+    timestep lleva la malla de caras expuestas de la pluma (`exposed_faces`),
+    o la fusionada en `greedy_buckets` franjas de color (`greedy_faces`), o
+    con `isosurface` la isosuperficie YMFS = threshold (`marching_cubes`).
+    """
+    nx, ny, nz = CO2_VIEWER_DIMS
     x_min, x_max = 0.0, 10000.0
     y_min, y_max = 0.0, 10000.0
     z_top, z_bottom = -2500.0, -2700.0
@@ -493,44 +518,27 @@ def preprocess_all_data(ymfs_dict: Dict[int, np.ndarray], ts_indices: List[int],
             injector_faces.append([vertex_offset + face[0], vertex_offset + face[1], vertex_offset + face[2]])
         vertex_offset += 8
     
-    # Datos por timestep (solo índices y valores de celdas > threshold)
+    # Coordenadas por eje (tablas de nx, ny y nz valores)
+    x_axis = axis_coordinates(nx, x_min, cell_size_x)
+    y_axis = axis_coordinates(ny, y_min, cell_size_y)
+    z_axis = axis_coordinates(nz, z_top, cell_size_z)
+    
+    # Datos por timestep: malla de caras expuestas de las celdas >= threshold
     timestep_data = {}
     
     for ts in ts_indices:
-        ymfs_values = ymfs_dict[ts]
-        total = nx * ny * nz
-        if len(ymfs_values) < total:
-            padded = np.zeros(total, dtype=float)
-            padded[:len(ymfs_values)] = ymfs_values
-            ymfs_values = padded
-        elif len(ymfs_values) > total:
-            ymfs_values = ymfs_values[:total]
-        
-        # Solo guardamos índices de celdas activas (> threshold)
-        active_cells = []
-        for k in range(nz):
-            for j in range(ny):
-                for i in range(nx):
-                    idx = i + j * nx + k * nx * ny
-                    value = ymfs_values[idx]
-                    if value >= threshold:
-                        x = x_min + i * cell_size_x
-                        y = y_min + j * cell_size_y
-                        z = z_top + k * cell_size_z
-                        active_cells.append({
-                            'x': float(x),
-                            'y': float(y),
-                            'z': float(z),
-                            'value': float(value)
-                        })
-        
-        timestep_data[str(ts)] = {
-            'cells': active_cells,
-            'count': len(active_cells)
-        }
+        mask, values = plume_mask(plume_index, ts, threshold, (nz, ny, nx))
+        cell_size = (cell_size_x, cell_size_y, cell_size_z)
+        if isosurface:
+            volume = plume_volume(plume_index, ts, (nz, ny, nx))
+            mesh = plume_isosurface(volume, threshold, x_axis, y_axis, z_axis, cell_size)
+        else:
+            mesh = plume_surface(mask, x_axis, y_axis, z_axis, cell_size, values, greedy_buckets)
+        timestep_data[str(ts)] = {'mesh': mesh.as_columns(), 'count': int(np.count_nonzero(mask))}
     
     return {
         'timesteps': ts_indices,
+        'threshold': float(threshold),
         'data': timestep_data,
         'injectors': {
             'vertices': injector_vertices,
@@ -557,13 +565,21 @@ def load_npy_data(filepath: Path) -> Optional[np.ndarray]:
     return np.load(filepath)
 
 
-@st.cache_data(show_spinner=False)
-def load_bunter_data() -> Optional[Dict[str, np.ndarray]]:
-    """Carga los datos del reservorio BUNTER desde archivo NPZ."""
-    npz_file = BUNTER_DIR / "bunter_data.npz"
+def open_reservoir_data(reservoir_name: str) -> Optional[Mapping[str, np.ndarray]]:
+    """Propiedades del reservorio como arreglos memory-mapped de solo lectura.
+
+    La primera vez el NPZ se descomprime a un `.npy` por propiedad en
+    `outputs/cache/reservoirs/` (`geoviz.npz_store`); cada arreglo se abre al
+    pedirlo y solo se leen las páginas que se usan. Si no se puede escribir
+    el almacén se carga el NPZ en memoria.
+    """
+    npz_file = RESERVOIR_FILES[reservoir_name]
     if not npz_file.exists():
         return None
-    
+    try:
+        return open_npz_store(npz_file, RESERVOIR_STORE_DIR / reservoir_name.lower())
+    except (OSError, ValueError) as e:
+        print(f"⚠️ No se pudo usar el almacén de {reservoir_name}: {e}")
     data = np.load(npz_file)
     return {
         'facies': data['facies'],
@@ -572,19 +588,40 @@ def load_bunter_data() -> Optional[Dict[str, np.ndarray]]:
     }
 
 
-@st.cache_data(show_spinner=False)
-def load_sleipner_data() -> Optional[Dict[str, np.ndarray]]:
-    """Carga los datos del reservorio Sleipner desde archivo NPZ."""
-    npz_file = SLEIPNER_DIR / "sleipner_data.npz"
-    if not npz_file.exists():
-        return None
-    
-    data = np.load(npz_file)
-    return {
-        'facies': data['facies'],
-        'permeability': data['permeability'],
-        'porosity': data['porosity']
-    }
+@st.cache_resource(show_spinner=False)
+def load_bunter_data() -> Optional[Mapping[str, np.ndarray]]:
+    """Carga los datos del reservorio BUNTER (compartidos entre sesiones, sin copias)."""
+    return open_reservoir_data("Bunter")
+
+
+@st.cache_resource(show_spinner=False)
+def load_sleipner_data() -> Optional[Mapping[str, np.ndarray]]:
+    """Carga los datos del reservorio Sleipner (compartidos entre sesiones, sin copias)."""
+    return open_reservoir_data("Sleipner")
+
+
+@st.cache_resource(show_spinner=False)
+def reservoir_stats(reservoir_name: str, _data_dict: Mapping[str, np.ndarray]) -> ReservoirStats:
+    """Conteos de facies, celdas válidas, cuantiles e histogramas del reservorio,
+    calculados una vez y guardados junto a su `metadata.json` (sobreviven a reinicios)."""
+    return load_or_compute_stats(RESERVOIR_FILES[reservoir_name], _data_dict)
+
+
+def property_histogram(stats: PropertyStats, title: str, height: int = 260) -> go.Figure:
+    """Histograma precalculado de una propiedad (eje X en log10 si `stats.log`)."""
+    centers = (stats.edges[:-1] + stats.edges[1:]) / 2
+    fig = go.Figure(go.Bar(x=centers, y=stats.counts, width=np.diff(stats.edges),
+                           marker_color='#3984c6', hovertemplate='%{x:.3g}: %{y:,} celdas<extra></extra>'))
+    fig.update_layout(title=dict(text=title), height=height, bargap=0,
+                      margin=dict(l=0, r=0, t=40, b=0), yaxis_title='Celdas')
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def slice_volume(dataset: str, prop: str, _data: np.ndarray, transform: str) -> SliceVolume:
+    """Volumen float32 transformado (`derive_volume`) de una propiedad, calculado
+    una vez por dataset, propiedad y transformación; los sliders solo extraen planos."""
+    return derive_volume(_data, transform)
 
 
 def prepare_3d_data(data: np.ndarray) -> np.ndarray:
@@ -597,7 +634,7 @@ def prepare_3d_data(data: np.ndarray) -> np.ndarray:
         raise ValueError(f"Forma de datos no soportada: {data.shape}")
 
 
-def render_reservoir_data_tab(reservoir_name: str, data_dict: Dict[str, np.ndarray]):
+def render_reservoir_data_tab(reservoir_name: str, data_dict: Mapping[str, np.ndarray]):
     """Renderiza visualizaciones para un reservorio específico (BUNTER o Sleipner)."""
     st.markdown(f"""
     <div style="margin-bottom: 2rem;">
@@ -610,9 +647,10 @@ def render_reservoir_data_tab(reservoir_name: str, data_dict: Dict[str, np.ndarr
     </div>
     """, unsafe_allow_html=True)
     
-    # Obtener dimensiones
+    # Obtener dimensiones y estadísticas precalculadas
     facies_shape = data_dict['facies'].shape
     nz, ny, nx = facies_shape
+    stats = reservoir_stats(reservoir_name, data_dict)
     
     # Métricas del reservorio
     col1, col2, col3, col4 = st.columns(4)
@@ -635,7 +673,7 @@ def render_reservoir_data_tab(reservoir_name: str, data_dict: Dict[str, np.ndarr
         """, unsafe_allow_html=True)
     
     with col3:
-        unique_facies = len(np.unique(data_dict['facies']))
+        unique_facies = stats.n_facies
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-title">Facies Únicas</div>
@@ -644,7 +682,7 @@ def render_reservoir_data_tab(reservoir_name: str, data_dict: Dict[str, np.ndarr
         """, unsafe_allow_html=True)
     
     with col4:
-        poro_mean = np.mean(data_dict['porosity'][data_dict['porosity'] > 0])
+        poro_mean = stats['porosity'].mean
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-title">Porosidad Media</div>
@@ -657,39 +695,17 @@ def render_reservoir_data_tab(reservoir_name: str, data_dict: Dict[str, np.ndarr
     # Modo de visualización
     view_mode = st.radio(
         "Modo de visualización",
-        options=["Paralelo (3 propiedades)", "Individual"],
+        options=["Paralelo (3 propiedades)", "Individual", "Bloques de facies"],
         horizontal=True,
-        help="Vista paralela: 3 gráficos simultáneos | Vista individual: una propiedad a la vez"
+        help="Vista paralela: 3 gráficos simultáneos | Vista individual: una propiedad a la vez | "
+             "Bloques de facies: cuerpos 3D de las facies seleccionadas"
     )
     
     # Controles de cortes en sidebar
     with st.sidebar:
         st.markdown("---")
         st.markdown(f"### 🎮 Controles - {reservoir_name}")
-        
-        x_slice = st.slider(
-            "Corte X (plano YZ)",
-            min_value=0,
-            max_value=nx - 1,
-            value=nx // 2,
-            help="Índice para el corte en dirección X"
-        )
-        
-        y_slice = st.slider(
-            "Corte Y (plano XZ)",
-            min_value=0,
-            max_value=ny - 1,
-            value=ny // 2,
-            help="Índice para el corte en dirección Y"
-        )
-        
-        z_slice = st.slider(
-            "Corte Z (plano XY)",
-            min_value=0,
-            max_value=nz - 1,
-            value=nz // 2,
-            help="Índice para el corte en dirección Z"
-        )
+    slices, stride = slice_controls(facies_shape, reservoir_name)
     
     if view_mode == "Paralelo (3 propiedades)":
         # Vista paralela
@@ -699,67 +715,51 @@ def render_reservoir_data_tab(reservoir_name: str, data_dict: Dict[str, np.ndarr
         with col1:
             st.markdown("#### 🔴 Permeabilidad")
             with st.spinner("Generando..."):
-                fig_perm = create_3d_slices_plotly(
-                    data_dict['permeability'],
-                    x_slice=x_slice,
-                    y_slice=y_slice,
-                    z_slice=z_slice,
+                render_property_slices(
+                    reservoir_name, 'permeability', data_dict['permeability'], 'log10',
+                    slices, stride,
                     colormap='Hot',
-                    log_scale=True,
                     title="Permeabilidad",
-                    colorbar_title="log10(Permeabilidad mD)"
+                    colorbar_title="log10(Permeabilidad mD)",
+                    height=700
                 )
-                st.plotly_chart(fig_perm, use_container_width=True)
         
         # Porosidad
         with col2:
             st.markdown("#### 🟢 Porosidad")
             with st.spinner("Generando..."):
-                fig_poro = create_3d_slices_plotly(
-                    data_dict['porosity'],
-                    x_slice=x_slice,
-                    y_slice=y_slice,
-                    z_slice=z_slice,
+                render_property_slices(
+                    reservoir_name, 'porosity', data_dict['porosity'], 'linear',
+                    slices, stride,
                     colormap='Viridis',
-                    log_scale=False,
                     title="Porosidad",
-                    colorbar_title="Porosidad (fracción)"
+                    colorbar_title="Porosidad (fracción)",
+                    height=700
                 )
-                st.plotly_chart(fig_poro, use_container_width=True)
         
         # Facies
         with col3:
             st.markdown("#### 🟡 Facies")
             with st.spinner("Generando..."):
-                # Para facies, usar visualización especial
-                if unique_facies <= 3:
-                    fig_facies = create_3d_slices_facies(
-                        data_dict['facies'],
-                        x_slice=x_slice,
-                        y_slice=y_slice,
-                        z_slice=z_slice,
-                        title="Facies"
-                    )
-                else:
-                    # Para muchas facies, usar colormap continuo
-                    fig_facies = create_3d_slices_plotly(
-                        data_dict['facies'].astype(float),
-                        x_slice=x_slice,
-                        y_slice=y_slice,
-                        z_slice=z_slice,
-                        colormap='Turbo',
-                        log_scale=False,
-                        title="Facies",
-                        colorbar_title="Facies ID"
-                    )
-                st.plotly_chart(fig_facies, use_container_width=True)
+                # Para facies, usar visualización especial; para muchas facies, colormap continuo
+                render_property_slices(
+                    reservoir_name, 'facies', data_dict['facies'],
+                    'facies' if unique_facies <= 3 else 'linear',
+                    slices, stride,
+                    colormap='Turbo',
+                    title="Facies",
+                    colorbar_title="Facies ID",
+                    height=700
+                )
                 
                 # Estadísticas de facies
-                facies_unique, facies_counts = np.unique(data_dict['facies'], return_counts=True)
-                facies_info = " | ".join([f"Facies {fid}: {count:,} ({100*count/facies_shape[0]/facies_shape[1]/facies_shape[2]:.1f}%)" 
-                                         for fid, count in zip(facies_unique, facies_counts)])
+                facies_info = " | ".join([f"Facies {fid}: {count:,} ({100*count/stats.n_cells:.1f}%)"
+                                         for fid, count in zip(stats.facies_ids, stats.facies_counts)])
                 st.caption(facies_info)
     
+    elif view_mode == "Bloques de facies":
+        render_facies_blocks(reservoir_name, data_dict['facies'], stats)
+    
     else:
         # Vista individual
         selected_property = st.selectbox(
@@ -772,149 +772,233 @@ def render_reservoir_data_tab(reservoir_name: str, data_dict: Dict[str, np.ndarr
         
         if selected_property == 'permeability':
             with st.spinner("Generando visualización..."):
-                fig = create_3d_slices_plotly(
-                    data_3d,
-                    x_slice=x_slice,
-                    y_slice=y_slice,
-                    z_slice=z_slice,
+                render_property_slices(
+                    reservoir_name, selected_property, data_3d, 'log10',
+                    slices, stride,
                     colormap='Hot',
-                    log_scale=True,
                     title=f"{reservoir_name} - Permeabilidad",
                     colorbar_title="log10(Permeabilidad mD)"
                 )
-                st.plotly_chart(fig, use_container_width=True)
         
         elif selected_property == 'porosity':
             with st.spinner("Generando visualización..."):
-                fig = create_3d_slices_plotly(
-                    data_3d,
-                    x_slice=x_slice,
-                    y_slice=y_slice,
-                    z_slice=z_slice,
+                render_property_slices(
+                    reservoir_name, selected_property, data_3d, 'linear',
+                    slices, stride,
                     colormap='Viridis',
-                    log_scale=False,
                     title=f"{reservoir_name} - Porosidad",
                     colorbar_title="Porosidad (fracción)"
                 )
-                st.plotly_chart(fig, use_container_width=True)
         
         else:  # facies
-            unique_facies_count = len(np.unique(data_3d))
             with st.spinner("Generando visualización..."):
-                if unique_facies_count <= 3:
-                    fig = create_3d_slices_facies(
-                        data_3d,
-                        x_slice=x_slice,
-                        y_slice=y_slice,
-                        z_slice=z_slice,
-                        title=f"{reservoir_name} - Facies"
-                    )
-                else:
-                    fig = create_3d_slices_plotly(
-                        data_3d.astype(float),
-                        x_slice=x_slice,
-                        y_slice=y_slice,
-                        z_slice=z_slice,
-                        colormap='Turbo',
-                        log_scale=False,
-                        title=f"{reservoir_name} - Facies",
-                        colorbar_title="Facies ID"
-                    )
-                st.plotly_chart(fig, use_container_width=True)
+                render_property_slices(
+                    reservoir_name, selected_property, data_3d,
+                    'facies' if stats.n_facies <= 3 else 'linear',
+                    slices, stride,
+                    colormap='Turbo',
+                    title=f"{reservoir_name} - Facies",
+                    colorbar_title="Facies ID"
+                )
         
         # Información adicional
+        if slices is None:
+            slice_info = f"            - Cortes en el navegador (1 de cada {stride} celdas por eje)\n"
+        else:
+            slice_info = "".join(f"            - Corte {axis} (plano {plane}): Índice {index}/{n-1}\n"
+                                 for axis, plane, index, n in zip("XYZ", ("YZ", "XZ", "XY"), slices, (nx, ny, nz)))
         with st.expander("ℹ️ Información"):
             st.write(f"""
             **Datos del reservorio {reservoir_name}:**
             - Dimensiones: {nz} × {ny} × {nx} (Z × Y × X)
             - Total de celdas: {nx * ny * nz:,}
             - Propiedad: {selected_property.title()}
-            - Corte X (plano YZ): Índice {x_slice}/{nx-1}
-            - Corte Y (plano XZ): Índice {y_slice}/{ny-1}
-            - Corte Z (plano XY): Índice {z_slice}/{nz-1}
-            """)
+{slice_info}            """)
             
             if selected_property == 'permeability':
-                perm_data = data_dict['permeability']
-                perm_valid = perm_data[perm_data > 0]
+                perm_stats = stats['permeability']
                 st.write(f"""
                 **Estadísticas de Permeabilidad:**
-                - Mínimo: {perm_valid.min():.4f} mD
-                - Máximo: {perm_valid.max():.4f} mD
-                - Media: {perm_valid.mean():.4f} mD
-                - Mediana: {np.median(perm_valid):.4f} mD
+                - Mínimo: {perm_stats.min:.4f} mD
+                - Máximo: {perm_stats.max:.4f} mD
+                - Media: {perm_stats.mean:.4f} mD
+                - Mediana: {perm_stats.median:.4f} mD
+                - Percentiles 5-95: {perm_stats.quantiles[0.05]:.4f} - {perm_stats.quantiles[0.95]:.4f} mD
                 """)
+                st.plotly_chart(property_histogram(perm_stats, "Distribución de log10(Permeabilidad mD)"),
+                                use_container_width=True, key=f"{reservoir_name}_perm_histogram")
             
             elif selected_property == 'porosity':
-                poro_data = data_dict['porosity']
-                poro_valid = poro_data[poro_data > 0]
+                poro_stats = stats['porosity']
                 st.write(f"""
                 **Estadísticas de Porosidad:**
-                - Mínimo: {poro_valid.min():.6f}
-                - Máximo: {poro_valid.max():.6f}
-                - Media: {poro_valid.mean():.6f}
-                - Mediana: {np.median(poro_valid):.6f}
+                - Mínimo: {poro_stats.min:.6f}
+                - Máximo: {poro_stats.max:.6f}
+                - Media: {poro_stats.mean:.6f}
+                - Mediana: {poro_stats.median:.6f}
+                - Percentiles 5-95: {poro_stats.quantiles[0.05]:.6f} - {poro_stats.quantiles[0.95]:.6f}
                 """)
+                st.plotly_chart(property_histogram(poro_stats, "Distribución de Porosidad"),
+                                use_container_width=True, key=f"{reservoir_name}_poro_histogram")
             
             elif selected_property == 'facies':
-                facies_unique, facies_counts = np.unique(data_dict['facies'], return_counts=True)
                 st.write("**Distribución de Facies:**")
-                for fid, count in zip(facies_unique, facies_counts):
-                    percentage = 100 * count / (nx * ny * nz)
+                for fid, count in zip(stats.facies_ids, stats.facies_counts):
+                    percentage = 100 * count / stats.n_cells
                     st.write(f"- Facies {int(fid)}: {count:,} celdas ({percentage:.2f}%)")
 
 
-def create_3d_slices_facies(data_3d: np.ndarray, x_slice: Optional[int] = None,
+@st.cache_data(show_spinner=False, max_entries=8)
+def facies_block_mesh(_facies: np.ndarray, reservoir_name: str, selected: Tuple[float, ...],
+                      greedy: bool = True) -> Dict:
+    """
+    Malla de los bloques de las facies seleccionadas (caché por reservorio).
+
+    Solo se generan las caras hacia celdas no seleccionadas (o fuera de la
+    grilla); con `greedy` las coplanares de una misma facies se fusionan en
+    rectángulos. Las celdas van centradas en sus índices, con Z invertida
+    como en los cortes (capa 0 arriba).
+    """
+    facies_ids = np.unique(_facies)
+    labels = np.searchsorted(facies_ids, _facies)
+    mask = np.isin(_facies, selected)
+    nz, ny, nx = _facies.shape
+    x = np.arange(nx) - 0.5
+    y = np.arange(ny) - 0.5
+    z = (nz - 1) - np.arange(nz) + 0.5
+
+    build = greedy_faces if greedy else exposed_faces
+    mesh = build(mask, x, y, z, (1.0, 1.0, -1.0), labels)
+    return {'mesh': mesh.as_columns(), 'facies_ids': facies_ids, 'n_cells': int(np.count_nonzero(mask))}
+
+
+def facies_colors(n: int) -> List[str]:
+    """Un color por facies: marrón/dorado con 2 facies, Turbo con más."""
+    if n <= 2:
+        return ['rgb(139, 90, 43)', 'rgb(255, 215, 0)'][:n]
+    return plotly.colors.sample_colorscale('Turbo', [i / (n - 1) for i in range(n)])
+
+
+def create_3d_facies_blocks(mesh: Dict[str, np.ndarray], facies_ids: np.ndarray,
+                            title: str = "Bloques de Facies") -> go.Figure:
+    """
+    Figura Mesh3d de bloques de facies con un color discreto por facies.
+
+    `mesh` son las columnas de `facies_block_mesh`; la intensidad por
+    triángulo es el índice de la facies en `facies_ids`.
+    """
+    n = len(facies_ids)
+    colors = facies_colors(n)
+    # Escala escalonada: el índice i ocupa [i/n, (i+1)/n]
+    colorscale = []
+    for i, color in enumerate(colors):
+        colorscale += [[i / n, color], [(i + 1) / n, color]]
+
+    fig = go.Figure(go.Mesh3d(
+        x=mesh['x'], y=mesh['y'], z=mesh['z'],
+        i=mesh['i'], j=mesh['j'], k=mesh['k'],
+        intensity=mesh['intensity'],
+        intensitymode='cell',
+        colorscale=colorscale,
+        cmin=-0.5,
+        cmax=n - 0.5,
+        flatshading=True,
+        lighting=dict(ambient=0.6, diffuse=0.6, specular=0.1),
+        colorbar=dict(
+            title="Facies",
+            tickmode='array',
+            tickvals=list(range(n)),
+            ticktext=[f"{fid:g}" for fid in facies_ids]
+        ),
+        name='Facies'
+    ))
+
+    fig.update_layout(
+        title=title,
+        scene=dict(
+            xaxis_title='X',
+            yaxis_title='Y',
+            zaxis_title='Z',
+            aspectmode='data',
+            camera=dict(
+                eye=dict(x=2.4, y=2.4, z=2.4),
+                up=dict(x=0, y=0, z=1)
+            )
+        ),
+        width=1200,
+        height=900,
+        margin=dict(l=0, r=0, t=50, b=0)
+    )
+    return fig
+
+
+def render_facies_blocks(reservoir_name: str, facies: np.ndarray, stats: ReservoirStats):
+    """Vista de bloques de facies: cuerpos 3D de las facies seleccionadas."""
+    facies_ids, facies_counts = stats.facies_ids, stats.facies_counts
+    # Por defecto se oculta la facies más abundante (el "fondo")
+    default = [fid for fid in facies_ids.tolist() if fid != facies_ids[np.argmax(facies_counts)]]
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected = st.multiselect(
+            "Facies visibles",
+            options=facies_ids.tolist(),
+            default=default,
+            format_func=lambda fid: f"Facies {fid:g}",
+            key=f"{reservoir_name}_block_facies"
+        )
+    with col2:
+        greedy = st.checkbox(
+            "Fusionar caras (greedy)", value=True, key=f"{reservoir_name}_block_greedy",
+            help="Une caras coplanares de la misma facies en rectángulos"
+        )
+
+    if not selected:
+        st.info("Selecciona al menos una facies")
+        return
+
+    with st.spinner("Generando bloques..."):
+        blocks = facies_block_mesh(facies, reservoir_name, tuple(sorted(selected)), greedy)
+
+    n_triangles = len(blocks['mesh']['i'])
+    st.caption(f"{blocks['n_cells']:,} celdas | {n_triangles:,} triángulos")
+    if n_triangles > MAX_BLOCK_TRIANGLES:
+        st.warning(f"⚠️ La malla tiene {n_triangles:,} triángulos (máximo {MAX_BLOCK_TRIANGLES:,}). "
+                   "Activa la fusión de caras o selecciona menos facies.")
+        return
+
+    fig = create_3d_facies_blocks(blocks['mesh'], blocks['facies_ids'],
+                                  title=f"{reservoir_name} - Bloques de Facies")
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# Mapa de colores discreto de facies: shalty = marrón/beige, sand = amarillo/dorado
+FACIES_COLORSCALE = [
+    [0.0, 'rgb(139, 90, 43)'],   # Marrón para shalty (valor 2)
+    [0.5, 'rgb(139, 90, 43)'],   # Marrón para shalty
+    [0.5, 'rgb(255, 215, 0)'],   # Dorado para sand (valor 3)
+    [1.0, 'rgb(255, 215, 0)']    # Dorado para sand
+]
+
+
+def create_3d_slices_facies(data_3d: Union[np.ndarray, SliceVolume], x_slice: Optional[int] = None,
                              y_slice: Optional[int] = None, z_slice: Optional[int] = None,
                              title: str = "Mapa de Facies 3D") -> go.Figure:
     """
     Crea visualización 3D de facies con colores discretos para shalty y sand.
+
+    `data_3d` puede ser el volumen de `slice_volume(..., 'facies')`, ya
+    normalizado: así un cambio de corte solo extrae los tres planos.
     """
+    if not isinstance(data_3d, SliceVolume):
+        data_3d = derive_volume(data_3d, 'facies')
     nz_array, ny_array, nx_array = data_3d.shape
+    x_slice, y_slice, z_slice = data_3d.clamp(x_slice, y_slice, z_slice)
     
-    # Valores por defecto (mitad del dominio)
-    if x_slice is None:
-        x_slice = nx_array // 2
-    if y_slice is None:
-        y_slice = ny_array // 2
-    if z_slice is None:
-        z_slice = nz_array // 2
-    
-    # Asegurar que los índices estén dentro del rango
-    x_slice = max(0, min(nx_array - 1, x_slice))
-    y_slice = max(0, min(ny_array - 1, y_slice))
-    z_slice = max(0, min(nz_array - 1, z_slice))
-    
-    # Mapear valores de facies: 2 -> shalty, 3 -> sand
-    # Crear un mapa de colores discreto: shalty = marrón/beige, sand = amarillo/dorado
-    facies_map = {2: 0, 3: 1}  # 2 -> índice 0 (shalty), 3 -> índice 1 (sand)
-    
-    # Colores personalizados: shalty (marrón) y sand (amarillo/dorado)
-    facies_colorscale = [
-        [0.0, 'rgb(139, 90, 43)'],   # Marrón para shalty (valor 2)
-        [0.5, 'rgb(139, 90, 43)'],   # Marrón para shalty
-        [0.5, 'rgb(255, 215, 0)'],   # Dorado para sand (valor 3)
-        [1.0, 'rgb(255, 215, 0)']    # Dorado para sand
-    ]
-    
-    # Normalizar datos de facies a [0, 1] para el mapa de colores
-    def normalize_facies(data):
-        normalized = np.zeros_like(data, dtype=float)
-        normalized[data == 2] = 0.0  # shalty -> 0
-        normalized[data == 3] = 1.0  # sand -> 1
-        return normalized
+    facies_colorscale = FACIES_COLORSCALE
     
-    # Extraer los datos de los cortes
-    slice_x_data_raw = data_3d[:, :, x_slice]  # (nz, ny) - plano YZ
-    slice_x_data = np.flipud(slice_x_data_raw).T
-    slice_x_norm = normalize_facies(slice_x_data)
-    
-    slice_y_data_raw = data_3d[:, y_slice, :]  # (nz, nx) - plano XZ
-    slice_y_data = np.flipud(slice_y_data_raw).T
-    slice_y_norm = normalize_facies(slice_y_data)
-    
-    slice_z_data = data_3d[z_slice, :, :]  # (ny, nx) - plano XY
-    slice_z_norm = normalize_facies(slice_z_data)
+    # Cortes ya normalizados (2 -> shalty = 0, 3 -> sand = 1)
+    slice_x_norm, slice_y_norm, slice_z_norm = data_3d.slices(x_slice, y_slice, z_slice)
     
     # Crear coordenadas para cada corte
     y_coords_x = np.arange(ny_array)
@@ -931,7 +1015,7 @@ def create_3d_slices_facies(data_3d: np.ndarray, x_slice: Optional[int] = None,
     
     x_coords_z = np.arange(nx_array)
     y_coords_z = np.arange(ny_array)
-    X_z, Y_z = np.meshgrid(x_coords_z, y_coords_z, indexing='ij')
+    X_z, Y_z = np.meshgrid(x_coords_z, y_coords_z)  # (ny, nx), como el corte
     Z_z = np.full_like(X_z, nz_array - 1 - z_slice)
     
     # Crear figura
@@ -1000,50 +1084,31 @@ def create_3d_slices_facies(data_3d: np.ndarray, x_slice: Optional[int] = None,
     return fig
 
 
-def create_3d_slices_plotly(data_3d: np.ndarray, x_slice: Optional[int] = None, 
+def create_3d_slices_plotly(data_3d: Union[np.ndarray, SliceVolume], x_slice: Optional[int] = None, 
                             y_slice: Optional[int] = None, z_slice: Optional[int] = None,
                             colormap: str = 'Hot', log_scale: bool = True, 
                             title: str = "Mapa de Calor 3D", colorbar_title: str = None) -> go.Figure:
     """
     Crea visualización 3D con 3 cortes planos usando Plotly.
     Basado en los scripts de visualize_permeability_3d_plotly.py y visualize_porosity_3d_plotly.py
+
+    `data_3d` puede ser un volumen ya transformado de `slice_volume` (con
+    `log_scale` coherente): así un cambio de corte solo extrae los tres planos
+    en vez de recalcular log10 sobre el cubo completo.
     """
+    if not isinstance(data_3d, SliceVolume):
+        data_3d = derive_volume(data_3d, 'log10' if log_scale else 'linear')
     nz_array, ny_array, nx_array = data_3d.shape
+    x_slice, y_slice, z_slice = data_3d.clamp(x_slice, y_slice, z_slice)
     
-    # Valores por defecto (mitad del dominio)
-    if x_slice is None:
-        x_slice = nx_array // 2
-    if y_slice is None:
-        y_slice = ny_array // 2
-    if z_slice is None:
-        z_slice = nz_array // 2
-    
-    # Asegurar que los índices estén dentro del rango
-    x_slice = max(0, min(nx_array - 1, x_slice))
-    y_slice = max(0, min(ny_array - 1, y_slice))
-    z_slice = max(0, min(nz_array - 1, z_slice))
-    
-    # Aplicar escala logarítmica si es necesario
-    if log_scale:
-        data_viz = np.log10(data_3d + 1e-20)
-        if colorbar_title is None:
-            colorbar_title = 'log10(Valor)'
-    else:
-        data_viz = data_3d
-        if colorbar_title is None:
-            colorbar_title = 'Valor'
+    if colorbar_title is None:
+        colorbar_title = 'log10(Valor)' if log_scale else 'Valor'
     
     # Crear figura
     fig = go.Figure()
     
-    # Extraer los datos de los cortes
-    slice_x_data_raw = data_viz[:, :, x_slice]  # (nz, ny) - plano YZ
-    slice_x_data = np.flipud(slice_x_data_raw).T
-    
-    slice_y_data_raw = data_viz[:, y_slice, :]  # (nz, nx) - plano XZ
-    slice_y_data = np.flipud(slice_y_data_raw).T
-    
-    slice_z_data = data_viz[z_slice, :, :]  # (ny, nx) - plano XY
+    # Extraer los datos de los cortes (vistas del volumen transformado)
+    slice_x_data, slice_y_data, slice_z_data = data_3d.slices(x_slice, y_slice, z_slice)
     
     # Crear coordenadas para cada corte
     y_coords_x = np.arange(ny_array)
@@ -1060,7 +1125,7 @@ def create_3d_slices_plotly(data_3d: np.ndarray, x_slice: Optional[int] = None,
     
     x_coords_z = np.arange(nx_array)
     y_coords_z = np.arange(ny_array)
-    X_z, Y_z = np.meshgrid(x_coords_z, y_coords_z, indexing='ij')
+    X_z, Y_z = np.meshgrid(x_coords_z, y_coords_z)  # (ny, nx), como el corte
     Z_z = np.full_like(X_z, nz_array - 1 - z_slice)
     
     # Encontrar el rango de colores común
@@ -1127,6 +1192,341 @@ def create_3d_slices_plotly(data_3d: np.ndarray, x_slice: Optional[int] = None,
     return fig
 
 
+def create_slice_viewer_html(volume: SliceVolume, colormap: str = 'Hot', title: str = "Mapa de Calor 3D",
+                             colorbar_title: str = 'Valor', facies: bool = False, stride: int = 1,
+                             binary: bool = True, compress: bool = True) -> str:
+    """Crea el HTML de los 3 cortes planos con los cortes calculados en el navegador.
+
+    El volumen ya transformado (`slice_volume`), submuestreado con `stride`,
+    viaja una sola vez como Float32Array; los sliders extraen los planos en
+    JavaScript y actualizan solo la superficie que cambió (`Plotly.restyle`,
+    a lo sumo una por frame de pantalla), sin volver a ejecutar el script.
+    Misma geometría que `create_3d_slices_plotly` / `create_3d_slices_facies`.
+    """
+    stride = max(1, int(stride))
+    data = volume.strided(stride)
+    nz, ny, nx = data.shape
+    start = [index // stride for index in volume.clamp(None, None, None)]
+    colorbar = dict(title=dict(text=colorbar_title if not facies else "Facies"), y=-0.1, len=0.5, orientation='h')
+    if facies:
+        colorbar.update(tickmode='array', tickvals=[0.25, 0.75], ticktext=['Shalty', 'Sand'])
+    config = {
+        'shape': [nz, ny, nx],
+        'fullShape': list(volume.shape),
+        'stride': stride,
+        'start': start,
+        'colorscale': FACIES_COLORSCALE if facies else plotly.colors.get_colorscale(colormap),
+        'fixedRange': [0.0, 1.0] if facies else None,
+        'colorbar': colorbar,
+        'layout': {
+            'title': {'text': title},
+            'scene': {
+                'xaxis': {'title': {'text': 'X'}}, 'yaxis': {'title': {'text': 'Y'}}, 'zaxis': {'title': {'text': 'Z'}},
+                'aspectmode': 'data',
+                'camera': {'eye': {'x': 2.4, 'y': 2.4, 'z': 2.4}, 'up': {'x': 0, 'y': 0, 'z': 1}},
+            },
+            'margin': {'l': 0, 'r': 0, 't': 50, 'b': 80},
+        },
+    }
+    payload = payload_js({'volume': data.ravel()}, binary=binary, compress=compress)
+    return f"""
+<!DOCTYPE html>
+<html>
+<head>
+    {plotly_script()}
+    <style>
+        body {{ margin: 0; padding: 0; overflow: hidden; font-family: Arial, sans-serif; }}
+        #plot {{ width: 100vw; height: calc(100vh - 70px); }}
+        #controls {{
+            display: flex;
+            gap: 16px;
+            padding: 10px 15px;
+            background: rgba(255,255,255,0.95);
+            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
+        }}
+        .control-group {{
+            flex: 1;
+        }}
+        label {{
+            display: block;
+            font-size: 12px;
+            font-weight: bold;
+            margin-bottom: 4px;
+            color: #333;
+        }}
+        input[type="range"] {{
+            width: 100%;
+        }}
+        .info {{
+            font-size: 11px;
+            color: #666;
+            align-self: center;
+            white-space: nowrap;
+        }}
+        #loading {{
+            position: absolute;
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            font-size: 20px;
+            color: #007bff;
+        }}
+    </style>
+</head>
+<body>
+    <div id="loading">Cargando volumen...</div>
+    <div id="controls" style="visibility:hidden;">
+        <div class="control-group">
+            <label>Corte X (plano YZ): <span id="x-label">0</span></label>
+            <input type="range" id="x-slider" min="0" max="{nx - 1}" value="{start[0]}" step="1">
+        </div>
+        <div class="control-group">
+            <label>Corte Y (plano XZ): <span id="y-label">0</span></label>
+            <input type="range" id="y-slider" min="0" max="{ny - 1}" value="{start[1]}" step="1">
+        </div>
+        <div class="control-group">
+            <label>Corte Z (plano XY): <span id="z-label">0</span></label>
+            <input type="range" id="z-slider" min="0" max="{nz - 1}" value="{start[2]}" step="1">
+        </div>
+        <div class="info">
+            <div>Celdas: {nx}×{ny}×{nz}{f" (1 de cada {stride})" if stride > 1 else ""}</div>
+            <div>Corte: <span id="slice-ms">0</span> ms</div>
+        </div>
+    </div>
+    <div id="plot"></div>
+
+    <script>{DECODER_JS}</script>
+    <script>
+        const CONFIG = {json.dumps(config)};
+        const VOLUME_READY = {payload};
+        const [NZ, NY, NX] = CONFIG.shape;
+        const STRIDE = CONFIG.stride;
+        const AXES = ['x', 'y', 'z'];
+        const NAMES = ['Corte X (YZ)', 'Corte Y (XZ)', 'Corte Z (XY)'];
+        let VOLUME = null;
+        // Índices de corte en la grilla submuestreada
+        const current = {{ x: CONFIG.start[0], y: CONFIG.start[1], z: CONFIG.start[2] }};
+        // Planos pendientes de dibujar; un solo restyle en curso
+        const dirty = new Set();
+        let frameRequested = false;
+        let renderInFlight = false;
+        const planeRanges = [null, null, null];
+        let shownRange = null;
+
+        // Plano como filas de Plotly, con la orientación de create_3d_slices_plotly:
+        // X -> (Y, Z invertido), Y -> (X, Z invertido), Z -> (Y, X)
+        function extractPlane(axis, index) {{
+            const nRows = axis === 'y' ? NX : NY;
+            const nCols = axis === 'z' ? NX : NZ;
+            const color = new Array(nRows), xs = new Array(nRows), ys = new Array(nRows), zs = new Array(nRows);
+            let lo = Infinity, hi = -Infinity;
+            for (let r = 0; r < nRows; r++) {{
+                const c = new Array(nCols), xr = new Array(nCols), yr = new Array(nCols), zr = new Array(nCols);
+                for (let col = 0; col < nCols; col++) {{
+                    let k, j, i, height;
+                    if (axis === 'x') {{
+                        k = NZ - 1 - col; j = r; i = index; height = k * STRIDE;
+                    }} else if (axis === 'y') {{
+                        k = NZ - 1 - col; j = index; i = r; height = k * STRIDE;
+                    }} else {{
+                        k = index; j = r; i = col; height = CONFIG.fullShape[0] - 1 - k * STRIDE;
+                    }}
+                    const v = VOLUME[(k * NY + j) * NX + i];
+                    if (v < lo) lo = v;
+                    if (v > hi) hi = v;
+                    c[col] = v;
+                    xr[col] = i * STRIDE;
+                    yr[col] = j * STRIDE;
+                    zr[col] = height;
+                }}
+                color[r] = c; xs[r] = xr; ys[r] = yr; zs[r] = zr;
+            }}
+            return {{ color, x: xs, y: ys, z: zs, range: [lo, hi] }};
+        }}
+
+        // Rango de color común a los 3 planos (como cmin/cmax en Python)
+        function colorRange() {{
+            if (CONFIG.fixedRange) {{
+                return CONFIG.fixedRange;
+            }}
+            return [Math.min(...planeRanges.map(r => r[0])), Math.max(...planeRanges.map(r => r[1]))];
+        }}
+
+        function updateLabel(axis) {{
+            const n = AXES.indexOf(axis);
+            const full = CONFIG.fullShape[2 - n];
+            document.getElementById(axis + '-label').textContent = `${{current[axis] * STRIDE}}/${{full - 1}}`;
+        }}
+
+        function scheduleRender() {{
+            if (!frameRequested) {{
+                frameRequested = true;
+                requestAnimationFrame(render);
+            }}
+        }}
+
+        // A lo sumo un restyle por frame: los movimientos intermedios del
+        // slider solo actualizan `current` y se dibuja el último
+        function render() {{
+            frameRequested = false;
+            if (renderInFlight || dirty.size === 0) {{
+                return;
+            }}
+            const start = performance.now();
+            const traces = [...dirty].map(axis => AXES.indexOf(axis)).sort();
+            dirty.clear();
+            const planes = traces.map(t => extractPlane(AXES[t], current[AXES[t]]));
+            traces.forEach((t, n) => {{ planeRanges[t] = planes[n].range; }});
+            const [cmin, cmax] = colorRange();
+            const calls = [Plotly.restyle('plot', {{
+                surfacecolor: planes.map(p => p.color),
+                x: planes.map(p => p.x),
+                y: planes.map(p => p.y),
+                z: planes.map(p => p.z),
+                cmin: traces.map(() => cmin),
+                cmax: traces.map(() => cmax)
+            }}, traces)];
+            const others = [0, 1, 2].filter(t => !traces.includes(t));
+            if (others.length && (cmin !== shownRange[0] || cmax !== shownRange[1])) {{
+                calls.push(Plotly.restyle('plot', {{ cmin, cmax }}, others));
+            }}
+            shownRange = [cmin, cmax];
+            renderInFlight = true;
+            Promise.all(calls).then(() => {{
+                document.getElementById('slice-ms').textContent = (performance.now() - start).toFixed(1);
+            }}).finally(() => {{
+                renderInFlight = false;
+                if (dirty.size) {{
+                    scheduleRender();
+                }}
+            }});
+        }}
+
+        VOLUME_READY.then(data => {{
+            VOLUME = data.volume;
+            const planes = AXES.map(axis => extractPlane(axis, current[axis]));
+            planes.forEach((p, n) => {{ planeRanges[n] = p.range; }});
+            shownRange = colorRange();
+            const traces = planes.map((p, n) => ({{
+                type: 'surface',
+                x: p.x, y: p.y, z: p.z,
+                surfacecolor: p.color,
+                colorscale: CONFIG.colorscale,
+                cmin: shownRange[0],
+                cmax: shownRange[1],
+                name: NAMES[n],
+                showscale: n === 0,
+                colorbar: CONFIG.colorbar
+            }}));
+            Plotly.newPlot('plot', traces, CONFIG.layout, {{ responsive: true }});
+
+            for (const axis of AXES) {{
+                const slider = document.getElementById(axis + '-slider');
+                slider.addEventListener('input', () => {{
+                    current[axis] = parseInt(slider.value);
+                    updateLabel(axis);
+                    dirty.add(axis);
+                    scheduleRender();
+                }});
+                updateLabel(axis);
+            }}
+            document.getElementById('loading').style.display = 'none';
+            document.getElementById('controls').style.visibility = 'visible';
+        }});
+    </script>
+</body>
+</html>
+"""
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def slice_viewer_html(dataset: str, prop: str, _data: np.ndarray, transform: str, stride: int,
+                      colormap: str, title: str, colorbar_title: str) -> str:
+    """`create_slice_viewer_html` del volumen de `slice_volume`; cacheado para
+    no volver a serializar el volumen en cada rerun."""
+    volume = slice_volume(dataset, prop, _data, transform)
+    return create_slice_viewer_html(volume, colormap, title, colorbar_title,
+                                    facies=transform == 'facies', stride=stride)
+
+
+def slice_controls(shape: Tuple[int, int, int], key_prefix: str) -> Tuple[Optional[Tuple[int, int, int]], int]:
+    """Controles de cortes del sidebar.
+
+    Returns:
+        Tuple de ((x, y, z) de los sliders, o None con los cortes en el navegador,
+        paso de submuestreo del volumen enviado al navegador)
+    """
+    nz, ny, nx = shape
+    in_browser = st.sidebar.checkbox(
+        "Cortes en el navegador",
+        value=True,
+        key=f"{key_prefix}_browser_slices",
+        help="El volumen se envía una vez y los cortes se mueven en el navegador, sin recargar la página"
+    )
+    if in_browser:
+        auto_stride = fit_stride(shape, MAX_SLICE_VIEWER_CELLS)
+        stride = st.sidebar.selectbox(
+            "Submuestreo del volumen",
+            options=[0, 1, 2, 3, 4],
+            format_func=lambda s: f"Automático (1 de cada {auto_stride})" if s == 0 else f"1 de cada {s}",
+            key=f"{key_prefix}_stride",
+            help="Una celda de cada N por eje: menos datos que enviar al navegador"
+        ) or auto_stride
+        sent = int(np.prod([-(-n // stride) for n in shape]))
+        st.sidebar.caption(f"{sent:,} celdas enviadas ({sent * 4 / 1e6:.1f} MB en float32)")
+        return None, stride
+    
+    x_slice = st.sidebar.slider(
+        "Corte X (plano YZ)",
+        min_value=0,
+        max_value=nx - 1,
+        value=nx // 2,
+        key=f"{key_prefix}_x_slice",
+        help="Índice para el corte en dirección X"
+    )
+    
+    y_slice = st.sidebar.slider(
+        "Corte Y (plano XZ)",
+        min_value=0,
+        max_value=ny - 1,
+        value=ny // 2,
+        key=f"{key_prefix}_y_slice",
+        help="Índice para el corte en dirección Y"
+    )
+    
+    z_slice = st.sidebar.slider(
+        "Corte Z (plano XY)",
+        min_value=0,
+        max_value=nz - 1,
+        value=nz // 2,
+        key=f"{key_prefix}_z_slice",
+        help="Índice para el corte en dirección Z"
+    )
+    return (x_slice, y_slice, z_slice), 1
+
+
+def render_property_slices(dataset: str, prop: str, data: np.ndarray, transform: str,
+                           slices: Optional[Tuple[int, int, int]], stride: int = 1,
+                           colormap: str = 'Hot', title: str = "Mapa de Calor 3D",
+                           colorbar_title: str = 'Valor', height: int = 900):
+    """Cortes 3D de una propiedad: con `slices` como figura de Streamlit y, si
+    es None, en el navegador (`create_slice_viewer_html`)."""
+    if slices is None:
+        components.html(slice_viewer_html(dataset, prop, data, transform, stride, colormap, title, colorbar_title),
+                         height=height, scrolling=False)
+        return
+    
+    volume = slice_volume(dataset, prop, data, transform)
+    x_slice, y_slice, z_slice = slices
+    if transform == 'facies':
+        fig = create_3d_slices_facies(volume, x_slice=x_slice, y_slice=y_slice, z_slice=z_slice, title=title)
+    else:
+        fig = create_3d_slices_plotly(volume, x_slice=x_slice, y_slice=y_slice, z_slice=z_slice,
+                                      colormap=colormap, log_scale=transform == 'log10',
+                                      title=title, colorbar_title=colorbar_title)
+    st.plotly_chart(fig, use_container_width=True)
+
+
 def render_geological_properties_tab():
     """Renderiza la pestaña de propiedades geológicas (permeabilidad y porosidad)."""
     st.markdown("""
@@ -1204,30 +1604,7 @@ def render_geological_properties_tab():
         # Controles en sidebar (sincronizados para todos)
         st.sidebar.header("Controles de Visualización")
         st.sidebar.info("Los controles se aplican a los 3 gráficos simultáneamente")
-        
-        x_slice = st.sidebar.slider(
-            "Corte X (plano YZ)",
-            min_value=0,
-            max_value=nx - 1,
-            value=nx // 2,
-            help="Índice para el corte en dirección X"
-        )
-        
-        y_slice = st.sidebar.slider(
-            "Corte Y (plano XZ)",
-            min_value=0,
-            max_value=ny - 1,
-            value=ny // 2,
-            help="Índice para el corte en dirección Y"
-        )
-        
-        z_slice = st.sidebar.slider(
-            "Corte Z (plano XY)",
-            min_value=0,
-            max_value=nz - 1,
-            value=nz // 2,
-            help="Índice para el corte en dirección Z"
-        )
+        slices, stride = slice_controls(first_shape, "geosx_parallel")
         
         # Controles adicionales para propiedades no-facies
         colormaps = ['Hot', 'Viridis', 'Plasma', 'Cividis', 'Jet', 'Rainbow', 'Turbo', 'Magma', 'Inferno']
@@ -1265,48 +1642,42 @@ def render_geological_properties_tab():
             with cols[0]:
                 st.subheader("🔴 Permeabilidad")
                 with st.spinner("Generando gráfico de permeabilidad..."):
-                    fig_perm = create_3d_slices_plotly(
-                        all_data_3d["permeability"],
-                        x_slice=x_slice,
-                        y_slice=y_slice,
-                        z_slice=z_slice,
+                    render_property_slices(
+                        str(available_files["permeability"]), "permeability", all_data_3d["permeability"],
+                        'log10' if log_scale_perm else 'linear',
+                        slices, stride,
                         colormap=permeability_colormap,
-                        log_scale=log_scale_perm,
                         title="Permeabilidad",
-                        colorbar_title="log10(Permeabilidad)" if log_scale_perm else "Permeabilidad"
+                        colorbar_title="log10(Permeabilidad)" if log_scale_perm else "Permeabilidad",
+                        height=700
                     )
-                    st.plotly_chart(fig_perm, use_container_width=True)
         
         # Gráfico 2: Porosidad
         if "porosity" in all_data_3d:
             with cols[1]:
                 st.subheader("🟢 Porosidad")
                 with st.spinner("Generando gráfico de porosidad..."):
-                    fig_poro = create_3d_slices_plotly(
-                        all_data_3d["porosity"],
-                        x_slice=x_slice,
-                        y_slice=y_slice,
-                        z_slice=z_slice,
+                    render_property_slices(
+                        str(available_files["porosity"]), "porosity", all_data_3d["porosity"],
+                        'log10' if log_scale_poro else 'linear',
+                        slices, stride,
                         colormap=porosity_colormap,
-                        log_scale=log_scale_poro,
                         title="Porosidad",
-                        colorbar_title="log10(Porosidad)" if log_scale_poro else "Porosidad"
+                        colorbar_title="log10(Porosidad)" if log_scale_poro else "Porosidad",
+                        height=700
                     )
-                    st.plotly_chart(fig_poro, use_container_width=True)
         
         # Gráfico 3: Facies
         if "facies" in all_data_3d:
             with cols[2]:
                 st.subheader("🟡 Facies")
                 with st.spinner("Generando gráfico de facies..."):
-                    fig_facies = create_3d_slices_facies(
-                        all_data_3d["facies"],
-                        x_slice=x_slice,
-                        y_slice=y_slice,
-                        z_slice=z_slice,
-                        title="Facies"
+                    render_property_slices(
+                        str(available_files["facies"]), "facies", all_data_3d["facies"], 'facies',
+                        slices, stride,
+                        title="Facies",
+                        height=700
                     )
-                    st.plotly_chart(fig_facies, use_container_width=True)
                     
                     # Estadísticas de facies
                     facies_data = all_data_3d["facies"]
@@ -1351,33 +1722,7 @@ def render_geological_properties_tab():
     
     # Controles en sidebar
     st.sidebar.header("Controles de Visualización")
-    
-    # Slice X
-    x_slice = st.sidebar.slider(
-        "Corte X (plano YZ)",
-        min_value=0,
-        max_value=nx - 1,
-        value=nx // 2,
-        help="Índice para el corte en dirección X"
-    )
-    
-    # Slice Y
-    y_slice = st.sidebar.slider(
-        "Corte Y (plano XZ)",
-        min_value=0,
-        max_value=ny - 1,
-        value=ny // 2,
-        help="Índice para el corte en dirección Y"
-    )
-    
-    # Slice Z
-    z_slice = st.sidebar.slider(
-        "Corte Z (plano XY)",
-        min_value=0,
-        max_value=nz - 1,
-        value=nz // 2,
-        help="Índice para el corte en dirección Z"
-    )
+    slices, stride = slice_controls(data_3d.shape, "geosx_individual")
     
     # Inicializar variables para información
     colormap = None
@@ -1389,19 +1734,14 @@ def render_geological_properties_tab():
         property_title = selected_property.replace("_", " ").title()
         title = f"Mapa de Facies 3D - {property_title}<br>3 Cortes Planos (Shalty y Sand)"
         
-        with st.spinner("Generando visualización 3D de facies..."):
-            fig = create_3d_slices_facies(
-                data_3d,
-                x_slice=x_slice,
-                y_slice=y_slice,
-                z_slice=z_slice,
-                title=title
-            )
-        
         # Información sobre facies
         shalty_count = np.sum(data_3d == 2)
         sand_count = np.sum(data_3d == 3)
         st.info(f"📊 Distribución de facies: Shalty = {shalty_count:,} celdas ({100*shalty_count/data_3d.size:.1f}%) | Sand = {sand_count:,} celdas ({100*sand_count/data_3d.size:.1f}%)")
+        
+        with st.spinner("Generando visualización 3D de facies..."):
+            render_property_slices(str(filepath), selected_property, data_3d, 'facies',
+                                   slices, stride, title=title)
     else:
         # Visualización normal para otras propiedades
         colormaps = [
@@ -1428,21 +1768,20 @@ def render_geological_properties_tab():
         
         # Crear visualización
         with st.spinner("Generando visualización 3D..."):
-            fig = create_3d_slices_plotly(
-                data_3d,
-                x_slice=x_slice,
-                y_slice=y_slice,
-                z_slice=z_slice,
+            render_property_slices(
+                str(filepath), selected_property, data_3d, 'log10' if log_scale else 'linear',
+                slices, stride,
                 colormap=colormap,
-                log_scale=log_scale,
                 title=title,
                 colorbar_title=colorbar_title
             )
     
-    # Mostrar gráfico
-    st.plotly_chart(fig, use_container_width=True)
-    
     # Información adicional
+    if slices is None:
+        slice_info = f"            - Cortes en el navegador (1 de cada {stride} celdas por eje)\n"
+    else:
+        slice_info = "".join(f"            - Corte {axis} (plano {plane}): Índice {index}/{n-1}\n"
+                             for axis, plane, index, n in zip("XYZ", ("YZ", "XZ", "XY"), slices, (nx, ny, nz)))
     with st.expander("ℹ️ Información"):
         if is_facies:
             st.write(f"""
@@ -1450,10 +1789,7 @@ def render_geological_properties_tab():
             - Archivo: `{filepath.name}`
             - Dimensiones: {nz} × {ny} × {nx} (Z × Y × X)
             - Valores: 2 (Shalty) y 3 (Sand)
-            - Corte X (plano YZ): Índice {x_slice}/{nx-1}
-            - Corte Y (plano XZ): Índice {y_slice}/{ny-1}
-            - Corte Z (plano XY): Índice {z_slice}/{nz-1}
-            - Colores: Marrón (Shalty) y Dorado (Sand)
+{slice_info}            - Colores: Marrón (Shalty) y Dorado (Sand)
             """)
         else:
             st.write(f"""
@@ -1461,21 +1797,31 @@ def render_geological_properties_tab():
             - Archivo: `{filepath.name}`
             - Dimensiones: {nz} × {ny} × {nx} (Z × Y × X)
             - Rango de valores: [{data_3d.min():.4e}, {data_3d.max():.4e}]
-            - Corte X (plano YZ): Índice {x_slice}/{nx-1}
-            - Corte Y (plano XZ): Índice {y_slice}/{ny-1}
-            - Corte Z (plano XY): Índice {z_slice}/{nz-1}
-            - Colormap: {colormap}
+{slice_info}            - Colormap: {colormap}
             - Escala: {'Logarítmica' if log_scale else 'Lineal'}
             """)
 
 
-def create_viewer_html(data_json: str) -> str:
-    """Crea el HTML del viewer con Plotly."""
+def create_viewer_html(data: Dict, binary: bool = True, compress: bool = True,
+                       frame_cache_size: int = 16) -> str:
+    """Crea el HTML del viewer con Plotly.
+
+    Las columnas de `data` viajan como buffer binario base64 (comprimido con
+    deflate si `compress`) y se decodifican en el navegador a Float32Array;
+    con `binary=False` se embeben como texto.
+
+    Cada timestep va en su propio buffer (`Lazy`): se decodifica al mostrarlo
+    o, en tiempo ocioso, antes (el siguiente), y los últimos
+    `frame_cache_size` quedan en un LRU por timestep (el umbral es fijo en
+    cada HTML).
+    """
+    data = {**data, 'data': {ts: Lazy(ts_data) for ts, ts_data in data['data'].items()}}
+    payload = payload_js(data, binary=binary, compress=compress)
     return f"""
 <!DOCTYPE html>
 <html>
 <head>
-    <script src="https://cdn.plot.ly/plotly-2.26.0.min.js"></script>
+    {plotly_script()}
     <style>
         body {{ margin: 0; padding: 0; overflow: hidden; }}
         #plot {{ width: 100vw; height: 100vh; }}
@@ -1548,6 +1894,10 @@ def create_viewer_html(data_json: str) -> str:
             <button onclick="previousTimestep()">◀</button>
             <button onclick="nextTimestep()">▶</button>
         </div>
+        <div class="control-group">
+            <label>Velocidad: <span id="speed-label">2</span> ts/s</label>
+            <input type="range" id="speed-slider" min="0.5" max="20" value="2" step="0.5">
+        </div>
         <div class="control-group">
             <label>Z Scale: <span id="zscale-label">1</span></label>
             <input type="range" id="zscale-slider" min="1" max="20" value="1" step="1">
@@ -1560,77 +1910,76 @@ def create_viewer_html(data_json: str) -> str:
         </div>
         <div class="info">
             <div>Celdas activas: <span id="cell-count">0</span></div>
-            <div>FPS: <span id="fps">0</span></div>
+            <div>Triángulos: <span id="tri-count">0</span></div>
+            <div>FPS: <span id="fps">0</span> | Render: <span id="render-ms">0</span> ms</div>
+            <div>Frames descartados: <span id="dropped">0</span></div>
         </div>
     </div>
     <div id="plot"></div>
 
+    <script>{DECODER_JS}</script>
     <script>
-        const DATA = {data_json};
+        const DATA_READY = {payload};
+        let DATA = null;
         let currentTimestepIndex = 0;
         let isPlaying = false;
-        let playInterval = null;
         let showInjectors = true;
-        let lastFrameTime = Date.now();
-        let frameCount = 0;
-        let fps = 0;
-
-        function updateFPS() {{
-            frameCount++;
-            const now = Date.now();
-            if (now - lastFrameTime >= 1000) {{
-                fps = frameCount;
-                document.getElementById('fps').textContent = fps;
-                frameCount = 0;
-                lastFrameTime = now;
+        // Reproducción: requestAnimationFrame avanza según el tiempo transcurrido
+        let playFrameId = null;
+        let playStartTime = 0;
+        let playStartIndex = 0;
+        let playStep = 0;
+        let droppedFrames = 0;
+        // Un solo Plotly.react en curso; los pedidos intermedios se colapsan
+        let renderInFlight = false;
+        let renderQueued = false;
+        let fpsWindowStart = performance.now();
+        let renderedFrames = 0;
+        // Trazas que no cambian entre frames: se construyen una vez al cargar
+        let envelopeTrace = null;
+        let injectorTrace = null;
+
+        // LRU de frames decodificados por timestep (el umbral va fijo en el
+        // payload de cada HTML, así que no forma parte de la clave); Map
+        // conserva el orden de inserción: la primera clave es la menos reciente
+        class FrameCache {{
+            constructor(capacity) {{
+                this.capacity = capacity;
+                this.entries = new Map();
+            }}
+            get(key) {{
+                const entry = this.entries.get(key);
+                if (entry !== undefined) {{
+                    this.entries.delete(key);
+                    this.entries.set(key, entry);
+                }}
+                return entry;
+            }}
+            set(key, entry) {{
+                this.entries.delete(key);
+                this.entries.set(key, entry);
+                while (this.entries.size > this.capacity) {{
+                    this.entries.delete(this.entries.keys().next().value);
+                }}
+            }}
+            delete(key) {{
+                this.entries.delete(key);
             }}
         }}
-
-        function buildMesh(cells, cellSize) {{
-            if (!cells || cells.length === 0) {{
-                return {{
-                    x: [], y: [], z: [],
-                    i: [], j: [], k: [],
-                    intensity: []
-                }};
+        const frameCache = new FrameCache({max(1, int(frame_cache_size))});
+        const whenIdle = window.requestIdleCallback || (callback => setTimeout(callback, 1));
+
+        function recordFrame(renderMs) {{
+            // Frames efectivamente dibujados y su tiempo de render real
+            renderedFrames++;
+            document.getElementById('render-ms').textContent = renderMs.toFixed(0);
+            const now = performance.now();
+            if (now - fpsWindowStart >= 1000) {{
+                const fps = renderedFrames * 1000 / (now - fpsWindowStart);
+                document.getElementById('fps').textContent = fps.toFixed(1);
+                renderedFrames = 0;
+                fpsWindowStart = now;
             }}
-
-            const x = [], y = [], z = [];
-            const i = [], j = [], k = [];
-            const intensity = [];
-            
-            const dx = cellSize.x;
-            const dy = cellSize.y;
-            const dz = cellSize.z;
-
-            let vertexIndex = 0;
-            
-            cells.forEach(cell => {{
-                const x0 = cell.x, y0 = cell.y, z0 = cell.z;
-                
-                // 8 vértices del cubo
-                x.push(x0, x0+dx, x0+dx, x0, x0, x0+dx, x0+dx, x0);
-                y.push(y0, y0, y0+dy, y0+dy, y0, y0, y0+dy, y0+dy);
-                z.push(z0, z0, z0, z0, z0+dz, z0+dz, z0+dz, z0+dz);
-                
-                // 12 triángulos (6 caras × 2 triángulos)
-                const faces = [
-                    [0,1,2],[0,2,3], [4,6,5],[4,7,6],
-                    [0,4,5],[0,5,1], [2,6,7],[2,7,3],
-                    [0,3,7],[0,7,4], [1,5,6],[1,6,2]
-                ];
-                
-                faces.forEach(face => {{
-                    i.push(vertexIndex + face[0]);
-                    j.push(vertexIndex + face[1]);
-                    k.push(vertexIndex + face[2]);
-                    intensity.push(cell.value);
-                }});
-                
-                vertexIndex += 8;
-            }});
-
-            return {{ x, y, z, i, j, k, intensity }};
         }}
 
         function buildInjectorMesh() {{
@@ -1651,85 +2000,133 @@ def create_viewer_html(data_json: str) -> str:
             return {{ x, y, z, i, j, k }};
         }}
 
+        function buildStaticTraces() {{
+            // Envoltura del reservorio (caras exteriores, calculada en el servidor)
+            const env = DATA.envelope;
+            if (env && env.i.length > 0) {{
+                envelopeTrace = {{
+                    type: 'mesh3d',
+                    x: env.x, y: env.y, z: env.z,
+                    i: env.i, j: env.j, k: env.k,
+                    color: '#3984c6',  // Azul sólido
+                    opacity: 0.08,  // Muy transparente pero visible
+                    flatshading: true,
+                    showscale: false,
+                    lighting: {{
+                        ambient: 1.0,
+                        diffuse: 0.1,
+                        specular: 0.0
+                    }},
+                    name: 'Grid',
+                    hovertemplate: 'Grid<extra></extra>'
+                }};
+            }}
+            
+            const injMesh = buildInjectorMesh();
+            injectorTrace = {{
+                type: 'mesh3d',
+                x: injMesh.x, y: injMesh.y, z: injMesh.z,
+                i: injMesh.i, j: injMesh.j, k: injMesh.k,
+                color: 'blue',
+                opacity: 0.9,
+                flatshading: true,
+                showscale: false,
+                name: 'Inyectores'
+            }};
+        }}
+
+        function buildPlumeTrace(mesh) {{
+            if (mesh.x.length === 0) {{
+                return null;
+            }}
+            return {{
+                type: 'mesh3d',
+                x: mesh.x, y: mesh.y, z: mesh.z,
+                i: mesh.i, j: mesh.j, k: mesh.k,
+                intensity: mesh.intensity,
+                intensitymode: 'cell',
+                colorscale: 'Hot',
+                cmin: 0.1,
+                cmax: 1.0,
+                showscale: true,
+                flatshading: false,
+                lighting: {{
+                    ambient: 0.6,
+                    diffuse: 0.7,
+                    specular: 0.2
+                }},
+                name: 'YMFS'
+            }};
+        }}
+
+        // Frame de un timestep: {{ready, frame, promise}}. La decodificación se
+        // pide una sola vez; mientras está en curso, `promise` la comparte
+        function requestFrame(ts) {{
+            let entry = frameCache.get(ts);
+            if (entry === undefined) {{
+                entry = {{ ready: false, frame: null }};
+                entry.promise = loadLazy(DATA.data[ts]).then(tsData => {{
+                    // Malla de caras expuestas calculada en el servidor (un valor por triángulo)
+                    entry.frame = {{
+                        count: tsData.count,
+                        triangles: tsData.mesh.i.length,
+                        trace: buildPlumeTrace(tsData.mesh)
+                    }};
+                    entry.ready = true;
+                }}, err => {{
+                    frameCache.delete(ts);
+                    throw err;
+                }});
+                frameCache.set(ts, entry);
+            }}
+            return entry;
+        }}
+
+        // Decodifica el timestep siguiente mientras el actual está en pantalla
+        function prefetchNext() {{
+            const next = DATA.timesteps[(currentTimestepIndex + 1) % DATA.timesteps.length];
+            whenIdle(() => requestFrame(next).promise.catch(() => {{}}));
+        }}
+
         function updatePlot() {{
+            if (renderInFlight) {{
+                renderQueued = true;
+                return;
+            }}
             const ts = DATA.timesteps[currentTimestepIndex];
-            const tsData = DATA.data[ts];
-            const zScale = parseInt(document.getElementById('zscale-slider').value);
-            
+            const entry = requestFrame(ts);
             document.getElementById('ts-label').textContent = ts;
-            document.getElementById('cell-count').textContent = tsData.count;
+            if (!entry.ready) {{
+                // Se dibuja al terminar la decodificación, si sigue siendo el actual
+                entry.promise.then(() => {{
+                    if (DATA.timesteps[currentTimestepIndex] === ts) {{
+                        updatePlot();
+                    }}
+                }}, err => {{
+                    document.getElementById('loading').style.display = 'block';
+                    document.getElementById('loading').textContent = 'Error al decodificar los datos: ' + err;
+                }});
+                return;
+            }}
+            const frame = entry.frame;
+            const zScale = parseInt(document.getElementById('zscale-slider').value);
             
-            const cellSize = DATA.grid;
-            const mesh = buildMesh(tsData.cells, {{
-                x: cellSize.cell_size_x,
-                y: cellSize.cell_size_y,
-                z: cellSize.cell_size_z
-            }});
+            document.getElementById('cell-count').textContent = frame.count;
+            document.getElementById('tri-count').textContent = frame.triangles;
             
             const traces = [];
             
-            // SIEMPRE agregar grilla completa transparente (debe cubrir toda la dimensión)
-            if (DATA.grid_cells && DATA.grid_cells.length > 0) {{
-                const gridMesh = buildMesh(DATA.grid_cells, {{
-                    x: cellSize.cell_size_x,
-                    y: cellSize.cell_size_y,
-                    z: cellSize.cell_size_z
-                }});
-                
-                // Renderizar la grilla SIEMPRE, sin importar si hay YMFS o no
-                if (gridMesh.x.length > 0) {{
-                    traces.push({{
-                        type: 'mesh3d',
-                        x: gridMesh.x, y: gridMesh.y, z: gridMesh.z,
-                        i: gridMesh.i, j: gridMesh.j, k: gridMesh.k,
-                        color: '#3984c6',  // Azul sólido
-                        opacity: 0.08,  // Muy transparente pero visible
-                        flatshading: true,
-                        showscale: false,
-                        lighting: {{
-                            ambient: 1.0,
-                            diffuse: 0.1,
-                            specular: 0.0
-                        }},
-                        name: 'Grid',
-                        hovertemplate: 'Grid Cell<extra></extra>',
-                        visible: true  // Siempre visible
-                    }});
-                }}
+            // Envoltura estática (mismo objeto en todos los frames)
+            if (envelopeTrace) {{
+                traces.push(envelopeTrace);
             }}
             
-            if (mesh.x.length > 0) {{
-                traces.push({{
-                    type: 'mesh3d',
-                    x: mesh.x, y: mesh.y, z: mesh.z,
-                    i: mesh.i, j: mesh.j, k: mesh.k,
-                    intensity: mesh.intensity,
-                    colorscale: 'Hot',
-                    cmin: 0.1,
-                    cmax: 1.0,
-                    showscale: true,
-                    flatshading: false,
-                    lighting: {{
-                        ambient: 0.6,
-                        diffuse: 0.7,
-                        specular: 0.2
-                    }},
-                    name: 'YMFS'
-                }});
+            if (frame.trace) {{
+                traces.push(frame.trace);
             }}
             
             if (showInjectors) {{
-                const injMesh = buildInjectorMesh();
-                traces.push({{
-                    type: 'mesh3d',
-                    x: injMesh.x, y: injMesh.y, z: injMesh.z,
-                    i: injMesh.i, j: injMesh.j, k: injMesh.k,
-                    color: 'blue',
-                    opacity: 0.9,
-                    flatshading: true,
-                    showscale: false,
-                    name: 'Inyectores'
-                }});
+                traces.push(injectorTrace);
             }}
             
             // Calcular proporciones reales basadas en los bounds
@@ -1744,11 +2141,11 @@ def create_viewer_html(data_json: str) -> str:
             const aspectZ = (zRange / maxRange) * zScale;
             
             const layout = {{
-                title: `CO₂ (YMFS) - Timestep ${{ts}}`,
+                title: {{ text: `CO₂ (YMFS) - Timestep ${{ts}}` }},
                 scene: {{
-                    xaxis: {{ title: 'X (m)', range: DATA.bounds.x }},
-                    yaxis: {{ title: 'Y (m)', range: DATA.bounds.y }},
-                    zaxis: {{ title: 'Z (m)', range: DATA.bounds.z }},
+                    xaxis: {{ title: {{ text: 'X (m)' }}, range: DATA.bounds.x }},
+                    yaxis: {{ title: {{ text: 'Y (m)' }}, range: DATA.bounds.y }},
+                    zaxis: {{ title: {{ text: 'Z (m)' }}, range: DATA.bounds.z }},
                     aspectmode: 'manual',
                     aspectratio: {{ x: aspectX, y: aspectY, z: aspectZ }},
                     camera: {{
@@ -1759,8 +2156,48 @@ def create_viewer_html(data_json: str) -> str:
                 paper_bgcolor: '#f8f9fa'
             }};
             
-            Plotly.react('plot', traces, layout, {{ responsive: true }});
-            updateFPS();
+            // El render termina cuando Plotly resuelve y el navegador pinta el frame
+            const renderStart = performance.now();
+            renderInFlight = true;
+            Promise.resolve(Plotly.react('plot', traces, layout, {{ responsive: true }})).then(() => {{
+                requestAnimationFrame(() => {{
+                    recordFrame(performance.now() - renderStart);
+                    renderInFlight = false;
+                    if (renderQueued) {{
+                        renderQueued = false;
+                        updatePlot();
+                    }}
+                }});
+            }});
+            prefetchNext();
+        }}
+
+        function playbackSpeed() {{
+            return parseFloat(document.getElementById('speed-slider').value);
+        }}
+
+        function restartPlaybackClock() {{
+            playStartTime = performance.now();
+            playStartIndex = currentTimestepIndex;
+            playStep = 0;
+        }}
+
+        function playbackTick(now) {{
+            if (!isPlaying) {{
+                return;
+            }}
+            // Paso que corresponde al tiempo transcurrido a la velocidad pedida
+            const step = Math.floor((now - playStartTime) / 1000 * playbackSpeed());
+            if (step > playStep && !renderInFlight) {{
+                // Si el render se atrasó se saltan los timesteps intermedios
+                droppedFrames += step - playStep - 1;
+                document.getElementById('dropped').textContent = droppedFrames;
+                playStep = step;
+                currentTimestepIndex = (playStartIndex + step) % DATA.timesteps.length;
+                document.getElementById('ts-slider').value = currentTimestepIndex;
+                updatePlot();
+            }}
+            playFrameId = requestAnimationFrame(playbackTick);
         }}
 
         function nextTimestep() {{
@@ -1785,20 +2222,13 @@ def create_viewer_html(data_json: str) -> str:
             
             if (isPlaying) {{
                 btn.textContent = '⏸ Pause';
-                playInterval = setInterval(() => {{
-                    if (currentTimestepIndex < DATA.timesteps.length - 1) {{
-                        nextTimestep();
-                    }} else {{
-                        currentTimestepIndex = 0;
-                        document.getElementById('ts-slider').value = 0;
-                        updatePlot();
-                    }}
-                }}, 500);
+                restartPlaybackClock();
+                playFrameId = requestAnimationFrame(playbackTick);
             }} else {{
                 btn.textContent = '▶ Play';
-                if (playInterval) {{
-                    clearInterval(playInterval);
-                    playInterval = null;
+                if (playFrameId !== null) {{
+                    cancelAnimationFrame(playFrameId);
+                    playFrameId = null;
                 }}
             }}
         }}
@@ -1811,22 +2241,37 @@ def create_viewer_html(data_json: str) -> str:
         // Event listeners
         document.getElementById('ts-slider').addEventListener('input', (e) => {{
             currentTimestepIndex = parseInt(e.target.value);
+            if (isPlaying) {{
+                restartPlaybackClock();
+            }}
             updatePlot();
         }});
 
+        document.getElementById('speed-slider').addEventListener('input', (e) => {{
+            document.getElementById('speed-label').textContent = e.target.value;
+            restartPlaybackClock();
+        }});
+
         document.getElementById('zscale-slider').addEventListener('input', (e) => {{
             document.getElementById('zscale-label').textContent = e.target.value;
             updatePlot();
         }});
 
-        // Inicializar
-        window.addEventListener('load', () => {{
+        // Inicializar (los datos binarios se decodifican de forma asíncrona)
+        window.addEventListener('load', async () => {{
+            try {{
+                DATA = await DATA_READY;
+            }} catch (err) {{
+                document.getElementById('loading').textContent = 'Error al decodificar los datos: ' + err;
+                return;
+            }}
             document.getElementById('loading').style.display = 'none';
             document.getElementById('controls').style.display = 'block';
             
             const slider = document.getElementById('ts-slider');
             slider.max = DATA.timesteps.length - 1;
             
+            buildStaticTraces();
             updatePlot();
         }});
     </script>
@@ -1835,6 +2280,14 @@ def create_viewer_html(data_json: str) -> str:
 """
 
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def viewer_html(dataset: str, ts_indices: List[int], threshold: float, greedy_buckets: int,
+                isosurface: bool, _data: Dict) -> str:
+    """`create_viewer_html` de los datos de `preprocess_all_data*`; cacheado
+    para no volver a serializar y comprimir el payload en cada rerun."""
+    return create_viewer_html(_data)
+
+
 def render_co2_viewer_tab_geosx():
     """Renderiza la pestaña del viewer de CO₂ para GEOSX."""
     st.markdown("""
@@ -1849,10 +2302,11 @@ def render_co2_viewer_tab_geosx():
     """, unsafe_allow_html=True)
 
     threshold = st.sidebar.slider("Umbral mínimo YMFS", 0.0, 1.0, 0.10, 0.01, key="geosx_threshold")
+    isosurface, greedy_buckets = plume_mesh_controls("geosx")
 
     # Cargar datos
     with st.spinner("Cargando timesteps de GEOSX..."):
-        ymfs_by_ts, z_coords_dict, ts_indices = load_all_timesteps_geosx()
+        plume_index, z_coords_dict, ts_indices = load_plume_index_geosx()
 
     if not ts_indices:
         st.error("❌ No se encontraron archivos YMFS de GEOSX")
@@ -1878,22 +2332,14 @@ python scripts/export_ymfs_geosx_to_vtk.py</pre>
 
     st.success(f"✅ {len(ts_indices)} timesteps de GEOSX cargados")
 
-    # Preprocesar datos
-    cache_file = CACHE_DIR / f"geosx_data_thr{threshold:.2f}.json"
-    
-    if cache_file.exists():
-        with st.spinner("Cargando datos preprocesados..."):
-            with open(cache_file, "r") as f:
-                processed_data = json.load(f)
-    else:
-        with st.spinner("Preprocesando datos de GEOSX (solo la primera vez)..."):
-            processed_data = preprocess_all_data_geosx(ymfs_by_ts, z_coords_dict, ts_indices, threshold)
-            with open(cache_file, "w") as f:
-                json.dump(processed_data, f)
+    # Preprocesar datos (el índice responde cualquier umbral sin recorrer la grilla)
+    with st.spinner("Preprocesando datos de GEOSX..."):
+        processed_data = preprocess_all_data_geosx(plume_index, z_coords_dict, ts_indices, threshold, greedy_buckets, isosurface)
 
     # Métricas en tarjetas
-    total_cells = sum(processed_data['data'][str(ts)]['count'] for ts in ts_indices)
-    max_cells = max(processed_data['data'][str(ts)]['count'] for ts in ts_indices)
+    counts = [plume_index.count(ts, threshold) for ts in ts_indices]
+    total_cells = sum(counts)
+    max_cells = max(counts)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -1932,12 +2378,128 @@ python scripts/export_ymfs_geosx_to_vtk.py</pre>
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Crear HTML
-    html_content = create_viewer_html(json.dumps(processed_data))
+    html_content = viewer_html('geosx', ts_indices, threshold, greedy_buckets, isosurface, processed_data)
     
     # Mostrar
     components.html(html_content, height=900, scrolling=False)
 
 
+@st.cache_resource(show_spinner=False)
+def load_geosx_summary() -> Optional[EclSummary]:
+    """Carga los vectores de resumen (SMSPEC/UNSMRY) del caso GEOSX."""
+    if not (GEOSX_CASE.with_suffix(".SMSPEC").exists() and GEOSX_CASE.with_suffix(".UNSMRY").exists()):
+        return None
+    return EclSummary(GEOSX_CASE)
+
+
+def create_summary_figure(summary: EclSummary, keys: List[str], x_values: np.ndarray,
+                          title: str, yaxis_title: str, scale: float = 1.0) -> go.Figure:
+    """Curvas de varios vectores de resumen (Scattergl para miles de ministeps)."""
+    fig = go.Figure()
+    for key in keys:
+        fig.add_trace(go.Scattergl(
+            x=x_values,
+            y=summary[key] * scale,
+            mode="lines",
+            name=key,
+            hovertemplate=f"<b>{key}</b><br>%{{x}}<br>%{{y:.4g}}<extra></extra>"
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Fecha" if np.issubdtype(x_values.dtype, np.datetime64) else "Tiempo (días)",
+        yaxis_title=yaxis_title,
+        height=420,
+        margin=dict(l=10, r=10, t=50, b=10),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified"
+    )
+    return fig
+
+
+def render_summary_tab():
+    """Renderiza la pestaña de resumen (series temporales SMSPEC/UNSMRY)."""
+    st.markdown("""
+    <div style="margin-bottom: 2rem;">
+        <h2 style="font-size: 1.5rem; font-weight: 700; margin-bottom: 0.5rem;">
+            Resumen de la Simulación
+        </h2>
+        <p style="color: var(--text-secondary-dark); font-size: 0.875rem;">
+            Series temporales de campo y pozos del caso DEP_GAS (SMSPEC/UNSMRY)
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with st.spinner("Cargando vectores de resumen..."):
+        summary = load_geosx_summary()
+
+    if summary is None:
+        st.error("❌ No se encontraron DEP_GAS.SMSPEC / DEP_GAS.UNSMRY")
+        st.info(f"Buscando en: {GEOSX_CASE.parent}")
+        return
+
+    time_axis = st.radio("Eje temporal", ["Fecha", "Días"], horizontal=True, key="summary_time_axis")
+    x_values = summary.dates if time_axis == "Fecha" else summary.time
+
+    # FCMIP3: masa en sitio del componente inyectado (comp. 3), no la acumulada inyectada
+    mass_keys = summary.match("FCMIP3")
+    pressure_keys = summary.match(["FPAV", "FHPAV", "WBHP:INJ*"])
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-title">Ministeps</div>
+            <div class="metric-value">{summary.n_ministeps:,}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        final_mass = summary["FCMIP3"][-1] / 1e9 if mass_keys else float("nan")
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-title">Masa de CO₂ en sitio (FCMIP3, Mt)</div>
+            <div class="metric-value">{final_mass:.2f}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    with col3:
+        final_pressure = summary["FPAV"][-1] if "FPAV" in summary else float("nan")
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-title">Presión Media Final (bar)</div>
+            <div class="metric-value">{final_pressure:.1f}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if mass_keys:
+            st.plotly_chart(create_summary_figure(summary, mass_keys, x_values,
+                                                  "Masa de CO₂ en sitio (FCMIP3)", "Masa (Mt)", scale=1e-9),
+                            use_container_width=True)
+        else:
+            st.info("El resumen no contiene FCMIP3")
+    with col2:
+        if pressure_keys:
+            st.plotly_chart(create_summary_figure(summary, pressure_keys, x_values,
+                                                  "Presión", "Presión (bar)"),
+                            use_container_width=True)
+        else:
+            st.info("El resumen no contiene vectores de presión")
+
+    # Vectores arbitrarios por nombre o comodín
+    patterns = st.text_input("Otros vectores (nombre o comodín, separados por coma)",
+                             value="FNIT, FVIT", key="summary_patterns")
+    custom_keys = summary.match([p.strip() for p in patterns.split(",") if p.strip()]) if patterns.strip() else []
+    if custom_keys:
+        units = sorted({summary.units[k] for k in custom_keys})
+        st.plotly_chart(create_summary_figure(summary, custom_keys, x_values,
+                                              f"{len(custom_keys)} vectores", " / ".join(u for u in units if u)),
+                        use_container_width=True)
+    elif patterns.strip():
+        st.warning("Ningún vector coincide con el patrón")
+
+
 def render_co2_viewer_tab():
     """Renderiza la pestaña del viewer de CO₂."""
     st.markdown("""
@@ -1952,10 +2514,11 @@ def render_co2_viewer_tab():
     """, unsafe_allow_html=True)
 
     threshold = st.sidebar.slider("Umbral mínimo YMFS", 0.0, 1.0, 0.10, 0.01)
+    isosurface, greedy_buckets = plume_mesh_controls("bunter")
 
     # Cargar datos
     with st.spinner("Cargando timesteps..."):
-        ymfs_by_ts, ts_indices = load_all_timesteps()
+        plume_index, ts_indices = load_plume_index()
 
     if not ts_indices:
         st.error("❌ No se encontraron archivos YMFS en timesteps_export/")
@@ -1963,22 +2526,14 @@ def render_co2_viewer_tab():
 
     st.success(f"✅ {len(ts_indices)} timesteps cargados")
 
-    # Preprocesar datos
-    cache_file = CACHE_DIR / f"data_thr{threshold:.2f}.json"
-    
-    if cache_file.exists():
-        with st.spinner("Cargando datos preprocesados..."):
-            with open(cache_file, "r") as f:
-                processed_data = json.load(f)
-    else:
-        with st.spinner("Preprocesando datos (solo la primera vez)..."):
-            processed_data = preprocess_all_data(ymfs_by_ts, ts_indices, threshold)
-            with open(cache_file, "w") as f:
-                json.dump(processed_data, f)
+    # Preprocesar datos (el índice responde cualquier umbral sin recorrer la grilla)
+    with st.spinner("Preprocesando datos..."):
+        processed_data = preprocess_all_data(plume_index, ts_indices, threshold, greedy_buckets, isosurface)
 
     # Métricas en tarjetas
-    total_cells = sum(processed_data['data'][str(ts)]['count'] for ts in ts_indices)
-    max_cells = max(processed_data['data'][str(ts)]['count'] for ts in ts_indices)
+    counts = [plume_index.count(ts, threshold) for ts in ts_indices]
+    total_cells = sum(counts)
+    max_cells = max(counts)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -2017,7 +2572,7 @@ def render_co2_viewer_tab():
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Crear HTML
-    html_content = create_viewer_html(json.dumps(processed_data))
+    html_content = viewer_html('bunter', ts_indices, threshold, greedy_buckets, isosurface, processed_data)
     
     # Mostrar
     components.html(html_content, height=900, scrolling=False)
@@ -2937,13 +3492,16 @@ def main() -> None:
         """, unsafe_allow_html=True)
         
         # Pestañas para Propiedades
-        tab1, tab2 = st.tabs(["📊 Propiedades Estáticas", "🧊 Simulación CO₂ GEOSX"])
+        tab1, tab2, tab3 = st.tabs(["📊 Propiedades Estáticas", "🧊 Simulación CO₂ GEOSX", "📈 Resumen"])
         
         with tab1:
             render_geological_properties_tab()
         
         with tab2:
             render_co2_viewer_tab_geosx()
+        
+        with tab3:
+            render_summary_tab()
     
     elif page == "📚 Referencias":
         render_references_page()
@@ -5,10 +5,14 @@ WITH CORRECT UNIT CONVERSION
 """
 
 import numpy as np
-import sys
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from geoviz.grdecl import to_file_order, write_grdecl_keyword  # noqa: E402
+
 
-def convert_npy_to_inc(npy_file, inc_file, property_name, nx, ny, nz, component_idx=0):
+def convert_npy_to_inc(npy_file, inc_file, property_name, nx, ny, nz, component_idx=0, rle=False):
     """
     Convert a numpy array to PFLOTRAN .inc format
     
@@ -24,6 +28,8 @@ def convert_npy_to_inc(npy_file, inc_file, property_name, nx, ny, nz, component_
         Grid dimensions
     component_idx : int
         Index of component to use if array is 4D (default: 0)
+    rle : bool
+        Write runs of equal values as N*value (default: False)
     """
     # Load the numpy array
     data = np.load(npy_file)
@@ -47,40 +53,18 @@ def convert_npy_to_inc(npy_file, inc_file, property_name, nx, ny, nz, component_
         else:
             raise ValueError(f"Cannot reshape {data.shape} to ({nz}, {ny}, {nx})")
     
-    # Write to .inc file
+    # Data in Fortran order (z, y, x): x varies fastest
+    values = to_file_order(data, axes="zyx", order="zyx")
+    if property_name.startswith('PERM'):
+        # Permeability: convert from m^2 to mD
+        # 1 mD = 9.869233e-16 m^2
+        values = values / 9.869233e-16
+
     with open(inc_file, 'w') as f:
-        # Write property name header
-        f.write(f"{property_name}\n")
-        
-        # Write data in Fortran order (z, y, x)
-        values_per_line = 5  # Standard format: 5 values per line
-        count = 0
-        
-        for z in range(nz):
-            for y in range(ny):
-                for x in range(nx):
-                    value = data[z, y, x]
-                    
-                    # Format based on property type
-                    if property_name.startswith('PERM'):
-                        # Permeability: convert from m^2 to mD
-                        # 1 mD = 9.869233e-16 m^2
-                        value_mD = value / 9.869233e-16
-                        f.write(f"   {value_mD:.6f}")
-                    else:
-                        # Porosity (dimensionless)
-                        f.write(f"   {value:.6f}")
-                    
-                    count += 1
-                    
-                    # New line every 5 values
-                    if count % values_per_line == 0:
-                        f.write("\n")
-        
-        # Add final newline if needed
-        if count % values_per_line != 0:
-            f.write("\n")
-    
+        write_grdecl_keyword(f, property_name, values, fmt="%.6f", per_line=5,
+                             sep="   ", prefix="   ", rle=rle, terminator=False)
+    count = values.size
+
     print(f"  Written {inc_file}")
     print(f"  Total values written: {count}")
     if property_name.startswith('PERM'):
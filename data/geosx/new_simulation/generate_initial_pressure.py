@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 """Generate noisy initial pressure include file for PFLOTRAN."""
+import os
+import sys
+
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from geoviz.grdecl import to_file_order, write_grdecl_keyword  # noqa: E402
+
 NX, NY, NZ = 64, 28, 25
 MEAN_PRESSURE = 100.0  # Bar
 NOISE_STD = 5.0        # Bar (1-sigma)
@@ -14,10 +20,10 @@ rng = np.random.default_rng(SEED)
 pressure = MEAN_PRESSURE + rng.normal(loc=0.0, scale=NOISE_STD, size=(NX, NY, NZ))
 pressure = np.clip(pressure, LOWER_BOUND, UPPER_BOUND)
 
-flattened = pressure.transpose(2, 1, 0).flatten(order='F')
+# pressure tiene forma (NX, NY, NZ); un valor por línea con z variando más rápido
+flattened = to_file_order(pressure, axes="xyz", order="xyz")
 with open(OUTPUT_FILE, 'w') as f:
-    f.write("PRESSURE\n")
-    for val in flattened:
-        f.write(f" {val:.6e}\n")
+    write_grdecl_keyword(f, "PRESSURE", flattened, fmt="%.6e", per_line=1,
+                         prefix=" ", terminator=False)
 
 print(f"Wrote {OUTPUT_FILE} with {flattened.size} values (mean={flattened.mean():.2f} Bar)")
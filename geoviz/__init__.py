@@ -0,0 +1,4 @@
+"""
+Utilidades compartidas de GeoViz (lectura de archivos de simulación, cachés
+y geometría) usadas por `app.py`, `streamlit_co2_frames.py` y `scripts/`.
+"""
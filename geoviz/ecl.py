@@ -0,0 +1,354 @@
+"""
+Lector nativo de archivos binarios de Eclipse (EGRID, INIT, UNRST, SMSPEC, UNSMRY).
+
+Los archivos unformatted son una secuencia de registros Fortran (marcador de
+longitud big-endian antes y después de cada registro). Cada palabra clave es
+un registro de cabecera de 16 bytes (nombre de 8 caracteres, número de
+elementos, tipo de 4 caracteres) seguido de sus datos, partidos en bloques de
+1000 elementos (105 para cadenas).
+
+El archivo se abre con memory-map y se indexa una sola vez; cada arreglo se
+lee en bloque con NumPy, sin necesidad de ResInsight (`rips`).
+"""
+
+import mmap
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+# Tipo Eclipse -> (dtype big-endian, elementos por bloque)
+_NUMERIC_TYPES = {
+    "INTE": (np.dtype(">i4"), 1000),
+    "REAL": (np.dtype(">f4"), 1000),
+    "DOUB": (np.dtype(">f8"), 1000),
+    "LOGI": (np.dtype(">i4"), 1000),
+}
+_CHAR_BLOCK = 105
+_HEADER_SIZE = 16
+
+
+class EclRecord(NamedTuple):
+    """Entrada del índice: palabra clave y ubicación de sus datos."""
+    name: str
+    count: int
+    type: str
+    offset: int   # inicio del primer registro de datos (marcador incluido)
+    end: int      # fin del último registro de datos
+
+
+def _item_layout(ecl_type: str):
+    """(dtype, elementos por bloque) de un tipo Eclipse."""
+    if ecl_type in _NUMERIC_TYPES:
+        return _NUMERIC_TYPES[ecl_type]
+    if ecl_type == "CHAR":
+        return np.dtype("S8"), _CHAR_BLOCK
+    if ecl_type.startswith("C0"):
+        return np.dtype(f"S{int(ecl_type[1:])}"), _CHAR_BLOCK
+    if ecl_type == "MESS":
+        return np.dtype("S1"), 1
+    raise ValueError(f"Tipo Eclipse no soportado: {ecl_type!r}")
+
+
+class EclFile:
+    """
+    Archivo binario de Eclipse indexado por palabra clave.
+
+    Parameters
+    ----------
+    filepath : str or Path
+        Ruta al archivo (.EGRID, .INIT, .UNRST, .SMSPEC, .UNSMRY...)
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        self.filepath = Path(filepath)
+        with open(self.filepath, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.records: List[EclRecord] = self._index()
+        self._by_name: Dict[str, List[int]] = {}
+        for i, record in enumerate(self.records):
+            self._by_name.setdefault(record.name, []).append(i)
+
+    def _index(self) -> List[EclRecord]:
+        """Recorre las cabeceras saltando los bloques de datos (sin leerlos)."""
+        buffer = self._buffer
+        size = len(buffer)
+        records = []
+        pos = 0
+        while pos < size:
+            marker = int.from_bytes(buffer[pos:pos + 4], "big")
+            if marker != _HEADER_SIZE:
+                raise ValueError(f"{self.filepath.name}: cabecera inválida en el byte {pos}")
+            header = buffer[pos + 4:pos + 4 + _HEADER_SIZE]
+            name = header[:8].decode("ascii").strip()
+            count = int.from_bytes(header[8:12], "big", signed=True)
+            ecl_type = header[12:16].decode("ascii")
+            pos += _HEADER_SIZE + 8
+
+            offset = pos
+            if count > 0 and ecl_type != "MESS":
+                _, block = _item_layout(ecl_type)
+                n_blocks = -(-count // block)
+                for _ in range(n_blocks):
+                    length = int.from_bytes(buffer[pos:pos + 4], "big")
+                    pos += length + 8
+            if pos > size:
+                raise ValueError(f"{self.filepath.name}: archivo truncado en {name}")
+            records.append(EclRecord(name, count, ecl_type, offset, pos))
+        return records
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def keywords(self) -> List[str]:
+        """Palabras clave distintas, en orden de aparición."""
+        return list(self._by_name)
+
+    def __contains__(self, name: str) -> bool:
+        return name.upper() in self._by_name
+
+    def count(self, name: str) -> int:
+        """Número de apariciones de una palabra clave."""
+        return len(self._by_name.get(name.upper(), []))
+
+    def read_record(self, record: EclRecord) -> np.ndarray:
+        """Lee los datos de una entrada del índice como arreglo nativo."""
+        dtype, block = _item_layout(record.type)
+        if record.count <= 0 or record.type == "MESS":
+            return np.empty(0, dtype=dtype.newbyteorder("="))
+
+        # Bloques completos equiespaciados (datos + 8 bytes de marcadores):
+        # se leen con una vista de pasos y una sola copia
+        itemsize = dtype.itemsize
+        block_stride = block * itemsize + 8
+        n_full, tail = divmod(record.count, block)
+        raw = np.frombuffer(self._buffer, dtype=np.uint8,
+                            count=record.end - record.offset, offset=record.offset)
+        parts = []
+        if n_full:
+            full = np.lib.stride_tricks.as_strided(
+                raw[4:], shape=(n_full, block * itemsize), strides=(block_stride, 1))
+            parts.append(full.reshape(-1))
+        if tail:
+            start = n_full * block_stride + 4
+            parts.append(raw[start:start + tail * itemsize])
+        data = np.concatenate(parts) if len(parts) > 1 else parts[0].copy()
+        values = data.view(dtype)
+
+        if record.type == "LOGI":
+            return values != 0
+        if dtype.kind == "S":
+            return np.char.strip(np.char.decode(values, "ascii"))
+        return values.astype(dtype.newbyteorder("="))
+
+    def get(self, name: str, occurrence: int = 0) -> np.ndarray:
+        """
+        Valores de una palabra clave.
+
+        Parameters
+        ----------
+        name : str
+            Palabra clave (ej. 'PERMX', 'ACTNUM')
+        occurrence : int
+            Índice de aparición (las palabras clave de UNRST se repiten por
+            paso de reporte)
+
+        Returns
+        -------
+        np.ndarray
+            Arreglo 1D nativo (float32/float64/int32, bool para LOGI, str para CHAR)
+        """
+        indices = self._by_name.get(name.upper())
+        if not indices:
+            raise KeyError(f"{name} no está en {self.filepath.name}")
+        return self.read_record(self.records[indices[occurrence]])
+
+    def iter_arrays(self, name: str) -> Iterator[np.ndarray]:
+        """Todas las apariciones de una palabra clave, en orden."""
+        for i in self._by_name.get(name.upper(), []):
+            yield self.read_record(self.records[i])
+
+    def stack(self, name: str) -> np.ndarray:
+        """
+        Apila todas las apariciones de una palabra clave numérica en 2D.
+
+        Si cada aparición cabe en un solo bloque (caso de PARAMS en UNSMRY),
+        las filas se extraen del memory-map con un único indexado vectorizado.
+        """
+        records = [self.records[i] for i in self._by_name.get(name.upper(), [])]
+        if not records:
+            raise KeyError(f"{name} no está en {self.filepath.name}")
+        count, ecl_type = records[0].count, records[0].type
+        if any(r.count != count or r.type != ecl_type for r in records):
+            raise ValueError(f"{name}: las apariciones tienen tamaños distintos")
+
+        dtype, block = _item_layout(ecl_type)
+        if ecl_type not in _NUMERIC_TYPES or ecl_type == "LOGI" or count > block:
+            return np.stack([self.read_record(r) for r in records])
+
+        nbytes = count * dtype.itemsize
+        starts = np.fromiter((r.offset + 4 for r in records), dtype=np.int64, count=len(records))
+        raw = np.frombuffer(self._buffer, dtype=np.uint8)
+        rows = raw[starts[:, None] + np.arange(nbytes)]
+        return rows.view(dtype).astype(dtype.newbyteorder("="))
+
+
+class EclGrid:
+    """Dimensiones, celdas activas y geometría corner-point de un EGRID."""
+
+    def __init__(self, egrid_file: Union[str, Path]):
+        with EclFile(egrid_file) as f:
+            head = f.get("GRIDHEAD")
+            self.nx, self.ny, self.nz = (int(v) for v in head[1:4])
+            self.coord = f.get("COORD")
+            self.zcorn = f.get("ZCORN")
+            if "ACTNUM" in f:
+                self.actnum = f.get("ACTNUM") > 0
+            else:
+                self.actnum = np.ones(self.n_cells, dtype=bool)
+
+    @property
+    def dims(self):
+        return self.nx, self.ny, self.nz
+
+    @property
+    def n_cells(self) -> int:
+        return self.nx * self.ny * self.nz
+
+    @property
+    def n_active(self) -> int:
+        return int(np.count_nonzero(self.actnum))
+
+    def to_global(self, active_values: np.ndarray, fill=np.nan) -> np.ndarray:
+        """Expande valores de celdas activas al grid completo (orden i, j, k)."""
+        if active_values.size == self.n_cells:
+            return active_values
+        full = np.full(self.n_cells, fill, dtype=np.result_type(active_values.dtype, type(fill)))
+        full[self.actnum] = active_values
+        return full
+
+    def corner_bounds(self):
+        """(min, max) de X, Y y profundidad a partir de COORD y ZCORN."""
+        pillars = self.coord.reshape(-1, 6)
+        x = np.concatenate([pillars[:, 0], pillars[:, 3]])
+        y = np.concatenate([pillars[:, 1], pillars[:, 4]])
+        return ((float(x.min()), float(x.max())),
+                (float(y.min()), float(y.max())),
+                (float(self.zcorn.min()), float(self.zcorn.max())))
+
+
+def restart_path(egrid_file: Union[str, Path]) -> Optional[Path]:
+    """Archivo .UNRST junto al EGRID, si existe."""
+    candidate = Path(egrid_file).with_suffix(".UNRST")
+    return candidate if candidate.exists() else None
+
+
+def read_restart_property(unrst_file: Union[str, Path], keyword: str) -> Dict[int, np.ndarray]:
+    """
+    Lee una propiedad dinámica de todos los pasos de reporte de un UNRST.
+
+    Returns
+    -------
+    dict
+        {paso de reporte (SEQNUM): valores sobre celdas activas}
+    """
+    keyword = keyword.upper()
+    values: Dict[int, np.ndarray] = {}
+    with EclFile(unrst_file) as f:
+        seqnum = None
+        for record in f.records:
+            if record.name == "SEQNUM":
+                seqnum = int(f.read_record(record)[0])
+            elif record.name == keyword and seqnum is not None:
+                values[seqnum] = f.read_record(record)
+    return values
+
+
+def export_restart_to_grdecl(egrid_file: Union[str, Path], output_dir: Union[str, Path],
+                             properties: List[str], header: str = "Exported from UNRST",
+                             rle: bool = False) -> Dict[str, List[Path]]:
+    """
+    Exporta propiedades por timestep a `{PROP}_ts_{NNNN}.GRDECL`.
+
+    Reemplaza la exportación por gRPC de ResInsight: el índice del timestep es
+    la posición del paso de reporte (igual que `case.time_steps()` en `rips`)
+    y los valores se expanden al grid completo (celdas inactivas en 0). Las
+    propiedades que no están en el UNRST se buscan en el INIT (estáticas) y se
+    repiten en cada timestep. Con `rle=True` las rachas de valores iguales se
+    escriben como `N*valor`.
+
+    Returns
+    -------
+    dict
+        {propiedad: [archivos escritos]}; las no encontradas no aparecen
+    """
+    unrst_file = restart_path(egrid_file)
+    if unrst_file is None:
+        raise FileNotFoundError(f"No se encontró {Path(egrid_file).with_suffix('.UNRST').name}")
+
+    # Import local: grdecl no depende de este módulo
+    from geoviz.grdecl import write_grdecl_property
+
+    grid = EclGrid(egrid_file)
+    init_file = Path(egrid_file).with_suffix(".INIT")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with EclFile(unrst_file) as f:
+        n_steps = f.count("SEQNUM")
+
+    written: Dict[str, List[Path]] = {}
+    for prop in (p.upper() for p in properties):
+        by_step = read_restart_property(unrst_file, prop)
+        if by_step:
+            steps = [by_step[seq] for seq in sorted(by_step)]
+        elif init_file.exists():
+            with EclFile(init_file) as f:
+                if prop not in f:
+                    continue
+                steps = [f.get(prop)] * n_steps
+        else:
+            continue
+
+        for i, values in enumerate(steps):
+            output_file = output_dir / f"{prop}_ts_{i:04d}.GRDECL"
+            write_grdecl_property(output_file, prop, grid.to_global(values, fill=0.0),
+                                  header=f"{header} - Timestep {i}", rle=rle)
+            written.setdefault(prop, []).append(output_file)
+    return written
+
+
+def try_export_restart(egrid_file: Union[str, Path], output_dir: Union[str, Path],
+                       properties: List[str], header: str = "Exported from UNRST",
+                       rle: bool = False) -> bool:
+    """
+    `export_restart_to_grdecl` para los scripts de exportación, con su salida por pantalla.
+
+    Returns
+    -------
+    bool
+        False si no hay UNRST junto al EGRID (hay que exportar con ResInsight)
+    """
+    unrst_file = restart_path(egrid_file)
+    if unrst_file is None:
+        return False
+
+    print(f"\nLeyendo {unrst_file.name} directamente (sin ResInsight)...")
+    written = export_restart_to_grdecl(egrid_file, output_dir, properties, header=header, rle=rle)
+    for prop in properties:
+        files = written.get(prop.upper(), [])
+        if files:
+            print(f"  ✓ {prop}: {len(files)} timesteps exportados")
+        else:
+            print(f"  ⚠ {prop} no está en el UNRST ni en el INIT")
+    print("\n" + "="*60)
+    print("✓ Exportación completada")
+    print("="*60)
+    return True
@@ -0,0 +1,86 @@
+"""
+Huellas de archivos de entrada (tamaño, mtime y hash de contenido).
+
+Se usan como clave de las cachés en disco: si el tamaño y el mtime coinciden
+se confía en la caché sin leer el archivo; si solo cambió el mtime (copia,
+`touch`, checkout) se compara el hash antes de invalidarla. `atomic_write`
+escribe los archivos de esas cachés sin dejar nunca uno a medias.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+_CHUNK_SIZE = 1 << 20
+
+
+def content_hash(filepath: Union[str, Path]) -> str:
+    """Hash BLAKE2b (128 bits) del contenido del archivo."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(filepath: Union[str, Path], with_hash: bool = True) -> Dict:
+    """Devuelve `{'size', 'mtime_ns'[, 'hash']}` del archivo."""
+    stat = os.stat(filepath)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        fingerprint["hash"] = content_hash(filepath)
+    return fingerprint
+
+
+def matches_fingerprint(filepath: Union[str, Path], stored: Optional[Dict]) -> bool:
+    """
+    Indica si el archivo sigue correspondiendo a la huella guardada.
+
+    Compara tamaño y mtime (barato) y, si solo difiere el mtime, el hash.
+    """
+    if not stored:
+        return False
+    stat = os.stat(filepath)
+    if stat.st_size != stored.get("size"):
+        return False
+    if stat.st_mtime_ns == stored.get("mtime_ns"):
+        return True
+    return "hash" in stored and content_hash(filepath) == stored["hash"]
+
+
+def _current_umask() -> int:
+    """umask del proceso (de /proc si existe: `os.umask` lo cambia un instante para todos los hilos)."""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+_DEFAULT_MODE = 0o666 & ~_current_umask()
+
+
+def atomic_write(target: Path, write) -> None:
+    """
+    Escribe en un temporal del mismo directorio y lo renombra sobre `target`.
+
+    El archivo queda con los permisos de un archivo nuevo (`0666 & ~umask`),
+    no con los 0600 con que `mkstemp` crea el temporal.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            os.fchmod(f.fileno(), _DEFAULT_MODE)
+        os.replace(tmp_name, target)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
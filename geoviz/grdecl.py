@@ -0,0 +1,307 @@
+"""
+Lector vectorizado de propiedades GRDECL.
+
+Reemplaza los parsers línea a línea (un `float()` por token) que estaban
+copiados en la app y en los scripts. El archivo se lee completo, se eliminan
+los comentarios y el bloque de datos se convierte con NumPy, expandiendo los
+contadores de repetición `N*valor` en bloque.
+
+`read_grdecl_property_cached` guarda además el arreglo parseado en un sidecar
+`.npy` junto al archivo (clave: tamaño, mtime y hash del contenido) y en
+cargas posteriores lo abre con memory-map, sin volver a parsear el texto.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from geoviz.fingerprint import atomic_write, file_fingerprint, matches_fingerprint
+
+# Palabra clave: un identificador que empieza con letra (PORO, YMFS...) al
+# inicio de una línea; los valores pueden seguir en la misma línea
+# (`PERMX 1 2 3 /`). Los valores numéricos nunca empiezan con letra, así que
+# no hay ambigüedad.
+_KEYWORD_RE = re.compile(rb"^[ \t]*([A-Za-z][A-Za-z0-9_]*)(?![^\s])", re.MULTILINE)
+_COMMENT_RE = re.compile(rb"--[^\n]*")
+
+
+def _find_data_block(buffer: bytes, keyword: Optional[str]) -> Optional[bytes]:
+    """Devuelve el texto entre la palabra clave y su terminador `/`."""
+    buffer = _COMMENT_RE.sub(b"", buffer)
+    wanted = keyword.upper().encode("ascii") if keyword else None
+
+    for match in _KEYWORD_RE.finditer(buffer):
+        if wanted is not None and match.group(1).upper() != wanted:
+            continue
+        start = match.end()
+        end = buffer.find(b"/", start)
+        if end < 0:
+            end = len(buffer)
+        return buffer[start:end]
+    return None
+
+
+def _parse_values(block: bytes, dtype) -> np.ndarray:
+    """Convierte un bloque de tokens numéricos, expandiendo `N*valor`."""
+    if b"*" not in block:
+        # Caso común (exportaciones de ResInsight): sin repeticiones
+        return np.array(block.split(), dtype=dtype)
+
+    tokens = np.array(block.split())
+    is_repeat = np.char.find(tokens, b"*") >= 0
+
+    counts = np.ones(tokens.size, dtype=np.int64)
+    values = np.empty(tokens.size, dtype=dtype)
+    values[~is_repeat] = tokens[~is_repeat].astype(dtype)
+
+    parts = np.char.partition(tokens[is_repeat], b"*")
+    if np.any(parts[:, 2] == b""):
+        raise ValueError("Repeticiones sin valor explícito ('N*') no soportadas")
+    counts[is_repeat] = parts[:, 0].astype(np.int64)
+    values[is_repeat] = parts[:, 2].astype(dtype)
+
+    return np.repeat(values, counts)
+
+
+def parse_grdecl_buffer(buffer: bytes, keyword: Optional[str] = None,
+                        dtype=np.float64) -> np.ndarray:
+    """
+    Parsea el contenido de un archivo GRDECL ya leído en memoria.
+
+    Parameters
+    ----------
+    buffer : bytes
+        Contenido completo del archivo
+    keyword : str, optional
+        Palabra clave a leer (ej. 'PERMY'). Por defecto, la primera del archivo
+    dtype : numpy dtype
+        Tipo de los valores devueltos
+
+    Returns
+    -------
+    np.ndarray
+        Valores 1D en el orden del archivo (vacío si no hay palabra clave)
+    """
+    block = _find_data_block(buffer, keyword)
+    if block is None:
+        return np.empty(0, dtype=dtype)
+    return _parse_values(block, dtype)
+
+
+def read_grdecl_property(filepath: Union[str, Path], keyword: Optional[str] = None,
+                         dtype=np.float64) -> np.ndarray:
+    """Lee valores de un archivo GRDECL (ver `parse_grdecl_buffer`)."""
+    return parse_grdecl_buffer(Path(filepath).read_bytes(), keyword=keyword, dtype=dtype)
+
+
+# Versión del formato del sidecar; incrementarla invalida los existentes.
+SIDECAR_VERSION = 2
+
+
+def sidecar_path(filepath: Union[str, Path], keyword: Optional[str] = None) -> Path:
+    """Ruta del sidecar `.npy` de un archivo GRDECL (y palabra clave)."""
+    filepath = Path(filepath)
+    suffix = f".{keyword.upper()}.npy" if keyword else ".npy"
+    return filepath.with_name(filepath.name + suffix)
+
+
+def _fresh_sidecar_meta(filepath: Path, meta_file: Path, keyword: Optional[str],
+                        dtype) -> Optional[Dict]:
+    """Metadatos del sidecar si corresponde al archivo actual, o None."""
+    try:
+        with open(meta_file, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (meta.get("version") != SIDECAR_VERSION
+            or meta.get("keyword") != (keyword.upper() if keyword else None)
+            or meta.get("dtype") != np.dtype(dtype).str
+            or not matches_fingerprint(filepath, meta.get("source"))):
+        return None
+    return meta
+
+
+def sidecar_is_fresh(filepath: Union[str, Path], keyword: Optional[str] = None,
+                     dtype=np.float64) -> bool:
+    """Indica si `read_grdecl_property_cached` leería el sidecar sin parsear el texto."""
+    filepath = Path(filepath)
+    npy_file = sidecar_path(filepath, keyword)
+    meta_file = npy_file.with_name(npy_file.name + ".json")
+    try:
+        return npy_file.is_file() and _fresh_sidecar_meta(filepath, meta_file, keyword, dtype) is not None
+    except OSError:
+        return False
+
+
+def _load_sidecar(filepath: Path, npy_file: Path, meta_file: Path, keyword: Optional[str],
+                  dtype) -> Optional[np.ndarray]:
+    """Devuelve el sidecar memory-mapped si sigue vigente, o None."""
+    meta = _fresh_sidecar_meta(filepath, meta_file, keyword, dtype)
+    if meta is None:
+        return None
+
+    try:
+        values = np.load(npy_file, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+
+    # Mismo contenido con otro mtime (copia, checkout): refrescar la clave
+    if os.stat(filepath).st_mtime_ns != meta["source"]["mtime_ns"]:
+        meta["source"] = file_fingerprint(filepath)
+        try:
+            atomic_write(meta_file, lambda f: f.write(json.dumps(meta).encode("utf-8")))
+        except OSError:
+            pass
+    return values
+
+
+def read_grdecl_property_cached(filepath: Union[str, Path], keyword: Optional[str] = None,
+                                dtype=np.float64) -> np.ndarray:
+    """
+    Igual que `read_grdecl_property`, usando un sidecar `.npy` como caché.
+
+    Si el sidecar corresponde al archivo actual se devuelve memory-mapped
+    (solo lectura). Si no existe o está desactualizado se parsea el texto y
+    se regenera; si el directorio no es escribible se devuelve el arreglo
+    parseado sin cachear.
+    """
+    filepath = Path(filepath)
+    npy_file = sidecar_path(filepath, keyword)
+    meta_file = npy_file.with_name(npy_file.name + ".json")
+
+    cached = _load_sidecar(filepath, npy_file, meta_file, keyword, dtype)
+    if cached is not None:
+        return cached
+
+    source = file_fingerprint(filepath)
+    values = read_grdecl_property(filepath, keyword=keyword, dtype=dtype)
+    meta = {
+        "version": SIDECAR_VERSION,
+        "keyword": keyword.upper() if keyword else None,
+        "dtype": np.dtype(dtype).str,
+        "source": source,
+    }
+    try:
+        # El .json se escribe al final: sin él el sidecar no se considera válido
+        atomic_write(npy_file, lambda f: np.save(f, values))
+        atomic_write(meta_file, lambda f: f.write(json.dumps(meta).encode("utf-8")))
+    except OSError:
+        return values
+    return np.load(npy_file, mmap_mode="r")
+
+
+# Escritura: los valores se formatean por bloques de líneas completas con un
+# único `%` de cadena (formateo en C) en lugar de un `f.write` por valor.
+_WRITE_CHUNK_LINES = 20000
+_WIDTH_RE = re.compile(r"%[-+ 0#]*\d+")
+
+
+def to_file_order(data: np.ndarray, axes: str = "zyx", order: str = "zyx",
+                  flip_z: bool = False) -> np.ndarray:
+    """
+    Aplana un arreglo 3D en el orden de escritura de un include.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Arreglo 3D (o 4D: se usa la componente 0 del último eje)
+    axes : str
+        Ejes del arreglo, ej. 'zyx' para forma (nz, ny, nx) o 'xyz'
+    order : str
+        Bucles de escritura del más lento al más rápido. 'zyx' es el orden
+        Eclipse/PFLOTRAN (x varía más rápido); 'xyz' hace variar z más rápido
+    flip_z : bool
+        Invertir el eje Z (capa 1 <-> capa nz) antes de aplanar
+    """
+    data = np.asarray(data)
+    if data.ndim == 4:
+        data = data[..., 0]
+    if flip_z:
+        data = np.flip(data, axis=axes.index("z"))
+    return data.transpose([axes.index(axis) for axis in order]).ravel()
+
+
+def _format_lines(values: np.ndarray, fmt: str, per_line: int, sep: str, prefix: str) -> str:
+    """Formatea valores en líneas de `per_line` (la última puede ser más corta)."""
+    n_full = values.size // per_line * per_line
+    line = prefix + sep.join([fmt] * per_line) + "\n"
+    text = (line * (n_full // per_line)) % tuple(values[:n_full].tolist()) if n_full else ""
+    if values.size > n_full:
+        rest = values.size - n_full
+        text += (prefix + sep.join([fmt] * rest) + "\n") % tuple(values[n_full:].tolist())
+    return text
+
+
+def _rle_tokens(values: np.ndarray, fmt: str) -> np.ndarray:
+    """
+    Tokens `N*valor` para las rachas de valores iguales (sin ancho fijo).
+
+    Las rachas se detectan sobre el texto formateado, así que valores que
+    difieren por debajo de la precisión escrita (ej. 1e-9 con '%.6f') también
+    se agrupan y la expansión reproduce exactamente el archivo sin comprimir.
+    """
+    fmt = _WIDTH_RE.sub("%", fmt)
+    formatted = np.array(("\n".join([fmt] * values.size) % tuple(values.tolist())).split("\n"))
+    starts = np.flatnonzero(np.concatenate(([True], formatted[1:] != formatted[:-1])))
+    counts = np.diff(np.append(starts, values.size))
+    tokens = formatted[starts].astype(object)
+    repeat = counts > 1
+    tokens[repeat] = np.char.add(np.char.add(counts[repeat].astype(str), "*"), formatted[starts][repeat])
+    return tokens
+
+
+def write_grdecl_keyword(f, keyword: str, values: np.ndarray, fmt: str = "%15.6f",
+                         per_line: int = 5, sep: str = " ", prefix: str = "",
+                         rle: bool = False, terminator: bool = True) -> None:
+    """
+    Escribe una palabra clave y sus valores en un archivo de texto abierto.
+
+    Parameters
+    ----------
+    f : file
+        Archivo abierto en modo texto
+    keyword : str
+        Palabra clave (ej. 'PERMX', 'YMFS')
+    values : np.ndarray
+        Valores ya en orden de archivo (ver `to_file_order`)
+    fmt : str
+        Formato `%` de cada valor (ej. '%15.6f', '%.6e')
+    per_line, sep, prefix : int, str, str
+        Valores por línea, separador entre valores e indentación de línea
+    rle : bool
+        Comprimir rachas de valores iguales como `N*valor`
+    terminator : bool
+        Cerrar el bloque con `/`
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    f.write(f"{keyword}\n")
+    if rle:
+        tokens = _rle_tokens(values, fmt)
+        for start in range(0, tokens.size, _WRITE_CHUNK_LINES * per_line):
+            chunk = tokens[start:start + _WRITE_CHUNK_LINES * per_line]
+            f.write(_format_lines(chunk, "%s", per_line, sep, prefix))
+    else:
+        for start in range(0, values.size, _WRITE_CHUNK_LINES * per_line):
+            chunk = values[start:start + _WRITE_CHUNK_LINES * per_line]
+            f.write(_format_lines(chunk, fmt, per_line, sep, prefix))
+    if terminator:
+        f.write("/\n")
+
+
+def write_grdecl_property(filepath: Union[str, Path], keyword: str, values: np.ndarray,
+                          header: Optional[str] = None, rle: bool = False) -> None:
+    """
+    Escribe una propiedad en formato GRDECL (5 valores por línea, `%15.6f`).
+
+    Es el mismo formato que exportaba ResInsight en `timesteps_export/`; con
+    `rle=True` las rachas de valores iguales se escriben como `N*valor`.
+    """
+    with open(filepath, "w", encoding="utf-8") as f:
+        if header:
+            f.write(f"-- {header}\n")
+        write_grdecl_keyword(f, keyword, values, rle=rle)
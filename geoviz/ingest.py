@@ -0,0 +1,163 @@
+"""
+Ingesta paralela de archivos por timestep (`*_ts_NNNN.GRDECL`, `ymfs_ts_NNNN.vtk`).
+
+Los resultados se devuelven en el orden de los timesteps, junto con el
+tiempo de lectura de cada archivo y el proceso que lo leyó. Por defecto se
+lee en serie en el proceso actual; con `workers > 1` (o la variable de
+entorno `GEOVIZ_INGEST_WORKERS`) los archivos que haya que parsear se
+reparten entre procesos de un pool. Los que ya tienen su sidecar `.npy` al
+día se leen siempre en el proceso actual: abrirlos cuesta milisegundos y no
+compensa arrancar intérpretes.
+"""
+
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from geoviz.grdecl import read_grdecl_property_cached, sidecar_is_fresh
+
+_TIMESTEP_RE = re.compile(r"ts_(\d+)")
+
+
+class FileTiming(NamedTuple):
+    """Tiempo de lectura de un archivo."""
+    timestep: int
+    name: str
+    seconds: float
+    pid: int
+
+
+def default_workers() -> int:
+    """Procesos a usar: `GEOVIZ_INGEST_WORKERS` o 1 (en serie)."""
+    env = os.environ.get("GEOVIZ_INGEST_WORKERS", "").strip()
+    if env:
+        return max(1, int(env))
+    return 1
+
+
+def timestep_files(directory: Union[str, Path], pattern: str) -> List[Tuple[int, Path]]:
+    """[(timestep, ruta)] ordenado por timestep de los archivos que coinciden."""
+    found = []
+    for filepath in Path(directory).glob(pattern):
+        match = _TIMESTEP_RE.search(filepath.name)
+        if match:
+            found.append((int(match.group(1)), filepath))
+    return sorted(found)
+
+
+_pyvista = None
+
+
+def _import_pyvista():
+    """Importa PyVista una sola vez por proceso (modo sin pantalla)."""
+    global _pyvista
+    if _pyvista is None:
+        os.environ['PYVISTA_OFF_SCREEN'] = 'true'
+        import pyvista as pv
+        pv.OFF_SCREEN = True
+        _pyvista = pv
+    return _pyvista
+
+
+def read_vtk_ymfs(filepath: Union[str, Path]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Lee YMFS y la coordenada Z de los centros de celda de un VTK.
+
+    Returns
+    -------
+    tuple
+        (ymfs, z_coords) o (None, None) si el archivo no tiene YMFS o falla
+    """
+    try:
+        grid = _import_pyvista().read(str(filepath))
+
+        ymfs_data = None
+        for attr in ('cell_data', 'cell_arrays', 'point_data', 'point_arrays'):
+            arrays = getattr(grid, attr, None)
+            if arrays is not None and 'YMFS' in arrays:
+                ymfs_data = np.array(arrays['YMFS'])
+                break
+
+        try:
+            z_coords = np.asarray(grid.cell_centers().points[:, 2])
+        except Exception:
+            z_coords = np.asarray(grid.points[:, 2]) if hasattr(grid, 'points') else None
+
+        if ymfs_data is not None and z_coords is not None:
+            return ymfs_data, z_coords
+        return None, None
+    except Exception as e:
+        print(f"Error al cargar VTK {filepath}: {e}")
+        return None, None
+
+
+def _timed_load(loader: Callable, timestep: int, filepath: Path):
+    start = time.perf_counter()
+    result = loader(filepath)
+    if isinstance(result, np.memmap):
+        # Un memmap no se envía entre procesos como vista; devolver ndarray
+        result = np.asarray(result)
+    timing = FileTiming(timestep, filepath.name, time.perf_counter() - start, os.getpid())
+    return result, timing
+
+
+def iter_load(files: Sequence[Tuple[int, Path]], loader: Callable = read_grdecl_property_cached,
+              workers: Optional[int] = None,
+              is_cached: Optional[Callable[[Path], bool]] = None) -> Iterator[Tuple[int, object, FileTiming]]:
+    """
+    Lee `files` ([(timestep, ruta)]) con `loader` y produce los resultados en orden.
+
+    `is_cached(ruta)` indica qué archivos se leen rápido en el proceso actual
+    aunque haya pool; con `read_grdecl_property_cached` es `sidecar_is_fresh`.
+    `loader` debe ser una función de un módulo importable (no del script
+    principal): se envía por pickle a los procesos.
+    """
+    workers = default_workers() if workers is None else workers
+    if is_cached is None and loader is read_grdecl_property_cached:
+        is_cached = sidecar_is_fresh
+    pending = [(ts, fp) for ts, fp in files if is_cached is None or not is_cached(fp)]
+    workers = min(workers, len(pending))
+    if workers <= 1:
+        for timestep, filepath in files:
+            result, timing = _timed_load(loader, timestep, filepath)
+            yield timestep, result, timing
+        return
+
+    # spawn: Streamlit ejecuta el script en un hilo y fork con hilos no es seguro
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {ts: pool.submit(_timed_load, loader, ts, fp) for ts, fp in pending}
+        for timestep, filepath in files:
+            if timestep in futures:
+                result, timing = futures.pop(timestep).result()
+            else:
+                result, timing = _timed_load(loader, timestep, filepath)
+            yield timestep, result, timing
+
+
+def load_timesteps(files: Sequence[Tuple[int, Path]], loader: Callable = read_grdecl_property_cached,
+                   workers: Optional[int] = None) -> Tuple[Dict[int, object], List[FileTiming]]:
+    """Como `iter_load`, pero devuelve `({timestep: resultado}, tiempos)`."""
+    data: Dict[int, object] = {}
+    timings: List[FileTiming] = []
+    for timestep, result, timing in iter_load(files, loader, workers):
+        data[timestep] = result
+        timings.append(timing)
+    return data, timings
+
+
+def format_timings(timings: Sequence[FileTiming], wall_seconds: Optional[float] = None) -> str:
+    """Resumen legible de los tiempos por archivo y por proceso."""
+    lines = [f"  {t.name:28s} {t.seconds * 1e3:8.1f} ms  (pid {t.pid})" for t in timings]
+    total = sum(t.seconds for t in timings)
+    n_procs = len({t.pid for t in timings})
+    summary = f"{len(timings)} archivos, {n_procs} procesos, suma {total:.2f} s"
+    if wall_seconds:
+        summary += f", total {wall_seconds:.2f} s (paralelismo x{total / wall_seconds:.1f})"
+    return "\n".join(lines + [summary])
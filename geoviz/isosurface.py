@@ -0,0 +1,217 @@
+"""
+Isosuperficie `valor = nivel` de un volumen 3D por marching cubes vectorizado.
+
+Los nodos del método son los centros de celda. La tabla de triángulos de los
+256 casos se genera al importar: en cada cara del cubo se unen los cortes de
+sus aristas (en las caras ambiguas, separando las esquinas interiores) y los
+lazos resultantes se triangulan en abanico. Como la decisión de cada cara
+depende solo de sus 4 esquinas, cubos vecinos coinciden y la superficie es
+cerrada.
+
+La extracción recorre solo los cubos cortados, todos a la vez: cada vértice
+se interpola una única vez por arista de la grilla y se comparte entre los
+triángulos de los cubos que la tocan.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from geoviz.voxel_mesh import VoxelMesh, _empty_mesh
+
+# Esquinas del cubo como (di, dj, dk) y aristas como pares de esquinas
+_CORNERS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+])
+_EDGES = np.array([
+    (0, 1), (1, 2), (3, 2), (0, 3),
+    (4, 5), (5, 6), (7, 6), (4, 7),
+    (0, 4), (1, 5), (2, 6), (3, 7),
+])
+# Caras del cubo como ciclos de esquinas
+_CUBE_FACES = [
+    (0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 5, 4),
+    (3, 2, 6, 7), (0, 3, 7, 4), (1, 2, 6, 5),
+]
+
+
+def _edge_id(a: int, b: int) -> int:
+    for e, (p, q) in enumerate(_EDGES):
+        if {p, q} == {a, b}:
+            return e
+    raise ValueError((a, b))
+
+
+def _on_same_face(a: int, b: int) -> bool:
+    """Si dos aristas del cubo pertenecen a una misma cara."""
+    corners = set(_EDGES[a]) | set(_EDGES[b])
+    return any(corners <= set(face) for face in _CUBE_FACES)
+
+
+def _fan(loop: List[int]) -> List[Tuple[int, int, int]]:
+    """
+    Triangula un lazo en abanico desde el vértice cuyas diagonales no caen
+    sobre una cara del cubo (ahí coincidirían con segmentos del cubo vecino).
+    """
+    for start in range(len(loop)):
+        rotated = loop[start:] + loop[:start]
+        if not any(_on_same_face(rotated[0], e) for e in rotated[2:-1]):
+            break
+    else:
+        rotated = loop
+    return [(rotated[0], rotated[n], rotated[n + 1]) for n in range(1, len(rotated) - 1)]
+
+
+def _case_triangles(case: int) -> List[Tuple[int, int, int]]:
+    """Triángulos (como aristas del cubo) de una configuración de esquinas."""
+    inside = [(case >> c) & 1 == 1 for c in range(8)]
+
+    # Segmentos entre aristas cortadas, cara por cara
+    links: Dict[int, List[int]] = {}
+    for face in _CUBE_FACES:
+        ring = [(face[n], face[(n + 1) % 4]) for n in range(4)]
+        cut = [_edge_id(a, b) for a, b in ring if inside[a] != inside[b]]
+        if len(cut) == 2:
+            pairs = [cut]
+        elif len(cut) == 4:
+            # Cara ambigua: cada esquina interior queda separada por sus dos aristas
+            pairs = [[_edge_id(face[n - 1], face[n]), _edge_id(face[n], face[(n + 1) % 4])]
+                     for n in range(4) if inside[face[n]]]
+        else:
+            pairs = []
+        for a, b in pairs:
+            links.setdefault(a, []).append(b)
+            links.setdefault(b, []).append(a)
+
+    midpoints = (_CORNERS[_EDGES[:, 0]] + _CORNERS[_EDGES[:, 1]]) / 2.0
+    triangles = []
+    pending = set(links)
+    while pending:
+        loop = [min(pending)]
+        pending.discard(loop[0])
+        while True:
+            step = [e for e in links[loop[-1]] if e in pending]
+            if not step:
+                break
+            loop.append(step[0])
+            pending.discard(step[0])
+
+        # Normal hacia los valores menores (afuera de la región >= nivel)
+        points = midpoints[loop]
+        normal = np.cross(points - points.mean(axis=0), np.roll(points, -1, axis=0) - points.mean(axis=0)).sum(axis=0)
+        inward = sum(_CORNERS[a] - _CORNERS[b] if inside[a] else _CORNERS[b] - _CORNERS[a]
+                     for a, b in _EDGES[loop])
+        if np.dot(normal, inward) > 0:
+            loop = loop[::-1]
+        triangles += _fan(loop)
+    return triangles
+
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray]:
+    cases = [_case_triangles(case) for case in range(256)]
+    width = max(len(t) for t in cases)
+    table = np.full((256, width, 3), -1, dtype=np.int64)
+    for case, triangles in enumerate(cases):
+        if triangles:
+            table[case, :len(triangles)] = triangles
+    return table, np.array([len(t) for t in cases])
+
+
+_TRI_TABLE, _TRI_COUNT = _build_tables()
+
+
+def _padded_nodes(coords: np.ndarray, axis: int) -> np.ndarray:
+    """Añade un nodo a cada lado de `axis`, sobre la cara exterior de la celda del borde."""
+    coords = np.asarray(coords, dtype=np.float64)
+    n = coords.shape[axis]
+    first = np.take(coords, [0], axis=axis)
+    last = np.take(coords, [n - 1], axis=axis)
+    if n > 1:
+        before = 1.5 * first - 0.5 * np.take(coords, [1], axis=axis)
+        after = 1.5 * last - 0.5 * np.take(coords, [n - 2], axis=axis)
+    else:
+        before, after = first - 0.5, last + 0.5
+    return np.concatenate([before, coords, after], axis=axis)
+
+
+def marching_cubes(volume: np.ndarray, level: float, x: np.ndarray, y: np.ndarray,
+                   z: np.ndarray, outside: float = 0.0) -> VoxelMesh:
+    """
+    Isosuperficie `volume = level` como malla indexada.
+
+    Parameters
+    ----------
+    volume : np.ndarray
+        Valores por celda (nz, ny, nx); las celdas `>= level` quedan dentro
+    level : float
+        Nivel de la isosuperficie
+    x, y, z : np.ndarray
+        Centros de celda: tablas por eje (nx, ny y nz valores) o coordenadas
+        por celda (cualquier forma con nz * ny * nx valores)
+    outside : float
+        Valor supuesto fuera de la grilla, para cerrar la superficie en los
+        bordes (si no es menor que `level` se usa `level - 1`)
+
+    Returns
+    -------
+    VoxelMesh
+        Vértices compartidos entre triángulos; cada triángulo vale `level`
+    """
+    volume = np.asarray(volume, dtype=np.float64)
+    shape = volume.shape
+    pad = outside if outside < level else level - 1.0
+    padded = np.pad(volume, 1, constant_values=pad)
+    inside = padded >= level
+
+    # Configuración de cada cubo entre 8 nodos vecinos
+    nz, ny, nx = (n - 1 for n in padded.shape)
+    case = np.zeros((nz, ny, nx), dtype=np.int64)
+    for c, (di, dj, dk) in enumerate(_CORNERS):
+        case |= inside[dk:dk + nz, dj:dj + ny, di:di + nx].astype(np.int64) << c
+    cubes = np.flatnonzero(_TRI_COUNT[case.ravel()])
+    if cubes.size == 0:
+        return _empty_mesh()
+
+    # Triángulos de cada cubo cortado, como (cubo, arista local)
+    cube_case = case.ravel()[cubes]
+    n_tris = _TRI_COUNT[cube_case]
+    tri_cube = np.repeat(cubes, n_tris)
+    tri_slot = np.arange(n_tris.sum()) - np.repeat(np.cumsum(n_tris) - n_tris, n_tris)
+    local_edges = _TRI_TABLE[np.repeat(cube_case, n_tris), tri_slot]
+
+    # Arista global: nodo inferior (en la grilla con borde) y eje
+    ck, cj, ci = np.unravel_index(tri_cube, (nz, ny, nx))
+    low = _CORNERS[_EDGES[:, 0]]
+    edge_axis = np.argmax(_CORNERS[_EDGES[:, 1]] - low, axis=1)
+    node = np.ravel_multi_index((ck[:, None] + low[local_edges, 2], cj[:, None] + low[local_edges, 1],
+                                 ci[:, None] + low[local_edges, 0]), padded.shape)
+    keys, triangles = np.unique(node * 3 + edge_axis[local_edges], return_inverse=True)
+
+    # Un vértice por arista cortada, interpolado entre sus dos nodos
+    node0, axis = np.divmod(keys, 3)
+    strides = np.array([1, padded.shape[2], padded.shape[2] * padded.shape[1]])
+    node1 = node0 + strides[axis]
+    v0, v1 = padded.ravel()[node0], padded.ravel()[node1]
+    t = (level - v0) / (v1 - v0)
+
+    if np.ndim(x) == 1 and len(x) == shape[2] and len(y) == shape[1] and len(z) == shape[0]:
+        axes = [_padded_nodes(x, 0), _padded_nodes(y, 0), _padded_nodes(z, 0)]
+        k0, j0, i0 = np.unravel_index(node0, padded.shape)
+        k1, j1, i1 = np.unravel_index(node1, padded.shape)
+        p0 = np.stack([axes[0][i0], axes[1][j0], axes[2][k0]], axis=1)
+        p1 = np.stack([axes[0][i1], axes[1][j1], axes[2][k1]], axis=1)
+    else:
+        nodes = []
+        for coords in (x, y, z):
+            coords = np.asarray(coords, dtype=np.float64).reshape(shape)
+            for ax in range(3):
+                coords = _padded_nodes(coords, ax)
+            nodes.append(coords.ravel())
+        p0 = np.stack([c[node0] for c in nodes], axis=1)
+        p1 = np.stack([c[node1] for c in nodes], axis=1)
+
+    vertices = p0 + t[:, None] * (p1 - p0)
+    triangles = triangles.reshape(-1, 3).astype(np.uint32)
+    return VoxelMesh(vertices.astype(np.float32), triangles,
+                     np.full(len(triangles), level, dtype=np.float32))
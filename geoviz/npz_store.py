@@ -0,0 +1,132 @@
+"""
+Arreglos de un `.npz` como `.npy` sin comprimir, abiertos con memory-map.
+
+Un `.npz` comprimido obliga a descomprimir cada arreglo completo en memoria
+al leerlo. La primera vez, `build_npz_store` copia cada miembro del `.npz`
+(que ya es un `.npy`) descomprimido a su propio archivo, en streaming, más un
+`manifest.json` con la huella del `.npz`. `NpzStore` abre cada arreglo con
+`mmap_mode='r'` recién al pedirlo: solo se leen del disco las páginas que se
+usan, y varios procesos o sesiones comparten la caché de páginas del sistema
+en lugar de tener cada uno su copia.
+"""
+
+import json
+import os
+import shutil
+import zipfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+from geoviz.fingerprint import atomic_write, file_fingerprint, matches_fingerprint
+
+STORE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+class NpzStore(Mapping):
+    """
+    {nombre: arreglo memory-mapped de solo lectura}, abierto al primer acceso.
+
+    Parameters
+    ----------
+    store_dir : str or Path
+        Directorio con los `.npy` y `manifest.json`
+    """
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.arrays: Dict[str, Dict] = self.manifest["arrays"]
+        self._open: Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._open:
+            entry = self.arrays[name]
+            self._open[name] = np.load(self.store_dir / entry["file"], mmap_mode="r")
+        return self._open[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.arrays)
+
+    def __len__(self) -> int:
+        return len(self.arrays)
+
+    def shape(self, name: str):
+        """Forma de un arreglo sin abrirlo."""
+        return tuple(self.arrays[name]["shape"])
+
+    def is_fresh(self, source: Union[str, Path]) -> bool:
+        """Indica si el almacén corresponde al `.npz` actual."""
+        return (self.manifest.get("version") == STORE_VERSION
+                and matches_fingerprint(source, self.manifest.get("source")))
+
+
+def build_npz_store(source: Union[str, Path], store_dir: Union[str, Path]) -> NpzStore:
+    """
+    Descomprime los miembros de `source` como `{nombre}.npy` en `store_dir`.
+
+    Cada miembro se copia en streaming a un temporal y se renombra; el
+    manifiesto se escribe al final, así que un almacén a medias no se usa.
+    """
+    source, store_dir = Path(source), Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    arrays = {}
+    with zipfile.ZipFile(source) as archive:
+        for member in archive.namelist():
+            if not member.endswith(".npy"):
+                continue
+            name = member[:-len(".npy")]
+            target = store_dir / member
+
+            def write(f, member=member):
+                with archive.open(member) as src:
+                    shutil.copyfileobj(src, f, length=1 << 20)
+
+            atomic_write(target, write)
+            # Valida que se pueda abrir con memory-map (p. ej. sin objetos Python)
+            values = np.load(target, mmap_mode="r")
+            arrays[name] = {"file": member, "shape": list(values.shape), "dtype": values.dtype.str}
+            del values
+    if not arrays:
+        raise ValueError(f"{source} no contiene arreglos .npy")
+
+    manifest = {
+        "version": STORE_VERSION,
+        "source": file_fingerprint(source),
+        "arrays": arrays,
+    }
+    text = json.dumps(manifest, indent=2).encode("utf-8")
+    atomic_write(store_dir / MANIFEST_FILE, lambda f: f.write(text))
+
+    # Restos de un `.npz` anterior con otros miembros
+    for stale in store_dir.glob("*.npy"):
+        if stale.name not in {entry["file"] for entry in arrays.values()}:
+            os.unlink(stale)
+    return NpzStore(store_dir)
+
+
+def open_npz_store(source: Union[str, Path], store_dir: Union[str, Path],
+                   rebuild: bool = True) -> Optional[NpzStore]:
+    """
+    Abre el almacén de `store_dir` si está al día con `source`.
+
+    Si falta o está desactualizado lo reconstruye (con `rebuild=True`) o
+    devuelve None. También devuelve None si `source` no existe.
+    """
+    if not Path(source).exists():
+        return None
+    try:
+        store = NpzStore(store_dir)
+        if store.is_fresh(source):
+            return store
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if not rebuild:
+        return None
+    return build_npz_store(source, store_dir)
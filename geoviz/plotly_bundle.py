@@ -0,0 +1,84 @@
+"""
+plotly.js local para los visores HTML, sin depender del CDN.
+
+La librería sale del paquete `plotly` instalado (`plotly.offline.get_plotlyjs`)
+y se copia una sola vez como `plotly-<versión>.min.js` en un directorio de
+archivos estáticos. Los visores la cargan con un `<script src>` relativo, así
+que el navegador la descarga una vez y la reutiliza (el nombre lleva la
+versión: actualizar `plotly` cambia la URL; la copia conserva el mtime del
+original, así que su `Last-Modified` no se renueva al reinstalarla). Si no
+hay directorio servido, `script_tag` embebe la librería en el HTML: más
+pesado, pero funciona sin red.
+"""
+
+import functools
+import importlib.util
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from geoviz.fingerprint import atomic_write
+
+
+def bundle_name() -> str:
+    """Nombre del archivo: `plotly-<versión>.min.js`."""
+    return f"plotly-{get_plotlyjs_version()}.min.js"
+
+
+def _source_mtime() -> Optional[float]:
+    """mtime de plotly.min.js dentro del paquete `plotly`, si se encuentra."""
+    spec = importlib.util.find_spec("plotly")
+    if spec is None or spec.origin is None:
+        return None
+    try:
+        return os.stat(Path(spec.origin).parent / "package_data" / "plotly.min.js").st_mtime
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def bundle_bytes() -> bytes:
+    """Contenido de plotly.min.js del paquete instalado."""
+    return get_plotlyjs().encode("utf-8")
+
+
+def install_bundle(directory: Union[str, Path]) -> Optional[Path]:
+    """
+    Copia la librería a `directory` si falta o está incompleta.
+
+    Returns
+    -------
+    Path or None
+        Ruta del archivo, o None si el directorio no es escribible
+    """
+    target = Path(directory) / bundle_name()
+    data = bundle_bytes()
+    try:
+        if target.is_file() and target.stat().st_size == len(data):
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(target, lambda f: f.write(data))
+        mtime = _source_mtime()
+        if mtime is not None:
+            os.utime(target, (mtime, mtime))
+    except OSError:
+        return None
+    return target
+
+
+def script_tag(directory: Optional[Union[str, Path]] = None, url_prefix: str = "") -> str:
+    """
+    `<script>` que carga plotly.js.
+
+    Parameters
+    ----------
+    directory : str or Path, optional
+        Directorio servido donde instalar la librería; None para embeberla
+    url_prefix : str
+        URL (relativa a la página) bajo la que se sirve `directory`
+    """
+    if directory is not None and install_bundle(directory) is not None:
+        return f'<script src="{url_prefix}{bundle_name()}"></script>'
+    return f'<script type="text/javascript">{bundle_bytes().decode("utf-8")}</script>'
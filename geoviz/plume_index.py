@@ -0,0 +1,153 @@
+"""
+Índice disperso de la pluma (celdas con YMFS distinto de cero) por timestep.
+
+Para cada timestep se guardan las celdas no nulas ordenadas por valor de
+mayor a menor. Las celdas con `valor >= umbral` son entonces un prefijo de
+ese orden: una búsqueda binaria da su número y un corte las devuelve, así
+que cualquier umbral se responde sin recorrer la grilla ni cachear
+resultados por umbral.
+
+`plume_mask` convierte una selección en una máscara 3D para extraer mallas
+(`geoviz.voxel_mesh`) y `plume_volume` da el volumen completo para
+isosuperficies (`geoviz.isosurface`).
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class PlumeIndex:
+    """
+    Celdas no nulas por timestep, ordenadas por valor descendente.
+
+    Parameters
+    ----------
+    cells : dict
+        {timestep: índices de celda (uint32)} en orden de valor descendente
+    values : dict
+        {timestep: valores} alineados con `cells`
+    n_cells : int
+        Celdas de la grilla (las que no aparecen valen cero)
+    """
+
+    def __init__(self, cells: Dict[int, np.ndarray], values: Dict[int, np.ndarray], n_cells: int):
+        self.cells = cells
+        self.values = values
+        self.n_cells = n_cells
+        # Claves ascendentes para searchsorted: -valor
+        self._keys = {ts: -v for ts, v in values.items()}
+
+    @property
+    def timesteps(self) -> List[int]:
+        return sorted(self.cells)
+
+    def count(self, timestep: int, threshold: float) -> int:
+        """Número de celdas con `valor >= threshold`."""
+        if threshold <= 0:
+            return self.n_cells - int(np.count_nonzero(~(self.values[timestep] >= threshold)))
+        return int(np.searchsorted(self._keys[timestep], -threshold, side="right"))
+
+    def dense(self, timestep: int) -> np.ndarray:
+        """Valores de todas las celdas del timestep (cero fuera de la pluma)."""
+        cells, values = self.cells[timestep], self.values[timestep]
+        dense = np.zeros(self.n_cells, dtype=values.dtype)
+        dense[cells] = values
+        return dense
+
+    def select(self, timestep: int, threshold: float,
+               cell_order: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Celdas con `valor >= threshold` y sus valores.
+
+        Con `threshold > 0` es un corte (vista) del índice, en orden de valor
+        descendente salvo que se pida `cell_order`. Con `threshold <= 0` se
+        incluyen también las celdas nulas y el resultado va en orden de celda.
+        """
+        if threshold > 0:
+            n = self.count(timestep, threshold)
+            cells, values = self.cells[timestep][:n], self.values[timestep][:n]
+            if cell_order:
+                order = np.argsort(cells, kind="stable")
+                cells, values = cells[order], values[order]
+            return cells, values
+
+        cells, values = self.cells[timestep], self.values[timestep]
+        dense = self.dense(timestep)
+        selected = np.ones(self.n_cells, dtype=bool)
+        selected[cells[~(values >= threshold)]] = False
+        selected = np.flatnonzero(selected).astype(np.uint32)
+        return selected, dense[selected]
+
+
+def _sorted_nonzero(values: np.ndarray, n_cells: int) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.asarray(values)[:n_cells]
+    cells = np.flatnonzero(values)
+    nonzero = values[cells]
+    # Estable: a igual valor se conserva el orden de celda
+    order = np.argsort(-nonzero, kind="stable")
+    return cells[order].astype(np.uint32), nonzero[order]
+
+
+def build_plume_index(values_by_ts: Dict[int, np.ndarray], timesteps: Optional[Iterable[int]] = None,
+                      n_cells: Optional[int] = None) -> PlumeIndex:
+    """
+    Construye el índice a partir de {timestep: valores por celda}.
+
+    Parameters
+    ----------
+    values_by_ts : dict
+        Valores densos por timestep (arreglos o vistas memory-mapped)
+    timesteps : iterable, optional
+        Timesteps a indexar (por defecto: todos)
+    n_cells : int, optional
+        Celdas de la grilla. Los timesteps más largos se recortan y los más
+        cortos se completan con ceros. Por defecto: el tamaño del primero
+    """
+    timesteps = sorted(values_by_ts) if timesteps is None else list(timesteps)
+    if n_cells is None:
+        n_cells = len(values_by_ts[timesteps[0]]) if timesteps else 0
+
+    cells, values = {}, {}
+    for ts in timesteps:
+        cells[ts], values[ts] = _sorted_nonzero(values_by_ts[ts], n_cells)
+    return PlumeIndex(cells, values, n_cells)
+
+
+def axis_coordinates(n: int, start: float, step: float) -> np.ndarray:
+    """Tabla de coordenadas de un eje: `start + i * step` para i en [0, n)."""
+    return start + np.arange(n) * step
+
+
+def plume_mask(index: PlumeIndex, timestep: int, threshold: float,
+               shape: Tuple[int, int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Máscara 3D de las celdas `>= threshold` y sus valores (cero fuera).
+
+    Parameters
+    ----------
+    shape : tuple
+        (nz, ny, nx) de la grilla; las celdas fuera de ella se descartan
+
+    Returns
+    -------
+    tuple
+        (máscara bool, valores float32), ambos con forma `shape`
+    """
+    n_cells = int(np.prod(shape))
+    cells, values = index.select(timestep, threshold)
+    keep = cells < n_cells
+    mask = np.zeros(n_cells, dtype=bool)
+    mask[cells[keep]] = True
+    dense = np.zeros(n_cells, dtype=np.float32)
+    dense[cells[keep]] = values[keep]
+    return mask.reshape(shape), dense.reshape(shape)
+
+
+def plume_volume(index: PlumeIndex, timestep: int, shape: Tuple[int, int, int]) -> np.ndarray:
+    """Valores float32 de todas las celdas con forma `shape` (cero fuera de la pluma)."""
+    n_cells = int(np.prod(shape))
+    dense = np.zeros(n_cells, dtype=np.float32)
+    values = index.dense(timestep)[:n_cells]
+    dense[:values.size] = values
+    return dense.reshape(shape)
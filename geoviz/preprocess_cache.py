@@ -0,0 +1,214 @@
+"""
+Caché en disco de datos preprocesados, direccionada por contenido.
+
+La clave de cada entrada es un hash de: espacio de nombres (qué se
+preprocesa), versión del preprocesado, parámetros y huellas de contenido
+(tamaño y hash) de los archivos de entrada. Si se reexportan los timesteps o
+cambia el código (y se incrementa su versión) la clave cambia y la entrada
+vieja simplemente deja de usarse.
+
+Formato de cada entrada (`<clave>.gvc`): cabecera `GVC1`, longitud y JSON
+de la estructura (dicts, listas, escalares y referencias
+`{"$nd": [dtype, offset, forma]}`) y el buffer de los arreglos comprimido con
+zlib. Las escrituras son atómicas (temporal + rename), así que dos sesiones
+no pueden dejar un archivo a medias. El directorio tiene un presupuesto de
+disco: al superarlo se borran las entradas usadas hace más tiempo (el mtime
+se actualiza en cada lectura).
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from geoviz.fingerprint import atomic_write, content_hash
+
+MAGIC = b"GVC1"
+SUFFIX = ".gvc"
+DEFAULT_BUDGET_MB = 512
+
+# Hash de contenido por (ruta, tamaño, mtime): no se relee un archivo sin cambios
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def default_budget_bytes() -> int:
+    """Presupuesto de disco: `GEOVIZ_CACHE_BUDGET_MB` o 512 MB."""
+    env = os.environ.get("GEOVIZ_CACHE_BUDGET_MB", "").strip()
+    try:
+        megabytes = float(env) if env else DEFAULT_BUDGET_MB
+    except ValueError:
+        megabytes = DEFAULT_BUDGET_MB
+    return int(max(0.0, megabytes) * 1024 * 1024)
+
+
+def input_fingerprint(filepath: Union[str, Path]) -> Dict:
+    """`{'name', 'size', 'hash'}` de un archivo de entrada (sin mtime: copias y `touch` no invalidan)."""
+    filepath = Path(filepath)
+    stat = os.stat(filepath)
+    memo_key = (str(filepath.resolve()), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _hash_memo:
+        _hash_memo[memo_key] = content_hash(filepath)
+    return {"name": filepath.name, "size": stat.st_size, "hash": _hash_memo[memo_key]}
+
+
+def cache_key(namespace: str, version: int, params: Dict, inputs: Iterable[Union[str, Path]]) -> str:
+    """
+    Clave de una entrada.
+
+    Parameters
+    ----------
+    namespace : str
+        Qué se preprocesa (ej. 'co2_viewer_bunter')
+    version : int
+        Versión del código de preprocesado; incrementarla invalida la caché
+    params : dict
+        Parámetros (serializables a JSON) que afectan al resultado
+    inputs : iterable
+        Archivos de entrada
+    """
+    description = {
+        "namespace": namespace,
+        "version": version,
+        "params": params,
+        "inputs": sorted((input_fingerprint(f) for f in inputs), key=lambda fp: fp["name"]),
+    }
+    text = json.dumps(description, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _encode(obj, chunks: List[bytes], offset: List[int]):
+    if isinstance(obj, np.ndarray):
+        values = np.ascontiguousarray(obj)
+        data = values.tobytes()
+        ref = {"$nd": [values.dtype.str, offset[0], list(values.shape)]}
+        padding = -len(data) % 8
+        chunks.append(data + b"\0" * padding)
+        offset[0] += len(data) + padding
+        return ref
+    if isinstance(obj, dict):
+        return {str(key): _encode(value, chunks, offset) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode(value, chunks, offset) for value in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def _decode(node, buffer: bytes):
+    if isinstance(node, dict):
+        if "$nd" in node:
+            dtype, offset, shape = node["$nd"]
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape)) if shape else 1
+            return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+        return {key: _decode(value, buffer) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_decode(value, buffer) for value in node]
+    return node
+
+
+def dumps(obj) -> bytes:
+    """Serializa `obj` en el formato de la caché."""
+    chunks: List[bytes] = []
+    meta = json.dumps(_encode(obj, chunks, [0])).encode("utf-8")
+    return MAGIC + struct.pack("<I", len(meta)) + meta + zlib.compress(b"".join(chunks), 1)
+
+
+def loads(data: bytes):
+    """Inverso de `dumps` (los arreglos son de solo lectura)."""
+    if len(data) < 8 or data[:4] != MAGIC:
+        raise ValueError("No es una entrada de caché GVC1")
+    (meta_len,) = struct.unpack_from("<I", data, 4)
+    if len(data) < 8 + meta_len:
+        raise ValueError("No es una entrada de caché GVC1")
+    meta = json.loads(data[8:8 + meta_len].decode("utf-8"))
+    return _decode(meta, zlib.decompress(data[8 + meta_len:]))
+
+
+class PreprocessCache:
+    """
+    Directorio de entradas `<clave>.gvc` con presupuesto de disco LRU.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Directorio de la caché (se crea si no existe)
+    budget_bytes : int, optional
+        Tamaño máximo del directorio (por defecto `default_budget_bytes`)
+    """
+
+    def __init__(self, directory: Union[str, Path], budget_bytes: Optional[int] = None):
+        self.directory = Path(directory)
+        self.budget_bytes = default_budget_bytes() if budget_bytes is None else budget_bytes
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Entrada de `key`, o None si no existe o no se puede leer."""
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            value = loads(data)
+        except (OSError, ValueError, zlib.error):
+            return None
+        try:
+            os.utime(path)  # uso reciente para el LRU
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> bool:
+        """Guarda `value` y aplica el presupuesto; False si no se pudo escribir."""
+        data = dumps(value)
+        if len(data) > self.budget_bytes:
+            return False
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path(key), lambda f: f.write(data))
+        except OSError:
+            return False
+        self.evict(keep=key)
+        return True
+
+    def entries(self) -> List[Tuple[Path, int, float]]:
+        """(ruta, bytes, mtime) de las entradas, de la menos a la más reciente."""
+        found = []
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # borrada por otra sesión
+            found.append((path, stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda entry: entry[2])
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Borra las entradas menos recientes hasta entrar en el presupuesto; devuelve cuántas."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= self.budget_bytes:
+                break
+            if keep is not None and path == self.path(keep):
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def get_or_build(self, key: str, build) -> Any:
+        """Entrada de `key`, o `build()` guardado en la caché."""
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.put(key, value)
+        return value
@@ -0,0 +1,174 @@
+"""
+Estadísticas precalculadas de un reservorio (facies, permeabilidad, porosidad).
+
+Conteos por facies, máscara de celdas válidas (`valor > 0`), mínimo, máximo,
+media, cuantiles e histograma de cada propiedad se calculan una sola vez y se
+guardan junto a `metadata.json` como `reservoir_stats.gvc` (formato de
+`geoviz.preprocess_cache`). El archivo lleva la huella del `.npz` de origen:
+si el `.npz` cambia, o cambia `STATS_VERSION`, se recalcula.
+"""
+
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from geoviz.fingerprint import atomic_write, file_fingerprint, matches_fingerprint
+from geoviz.preprocess_cache import dumps, loads
+
+STATS_VERSION = 1
+STATS_NAME = "reservoir_stats.gvc"
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+HISTOGRAM_BINS = 50
+# Propiedades continuas y si su histograma va en escala log10
+PROPERTIES = {"permeability": True, "porosity": False}
+
+
+class PropertyStats:
+    """
+    Estadísticas de una propiedad sobre sus celdas válidas (`valor > 0`).
+
+    Attributes
+    ----------
+    n_valid, min, max, mean : escalares (NaN sin celdas válidas)
+    quantiles : dict
+        {q: valor} para q en `QUANTILES`
+    edges, counts : np.ndarray
+        Histograma (`HISTOGRAM_BINS` intervalos; bordes en log10 si `log`)
+    """
+
+    def __init__(self, entry: Dict, shape):
+        self.n_valid = int(entry["n_valid"])
+        self.min = float(entry["min"])
+        self.max = float(entry["max"])
+        self.mean = float(entry["mean"])
+        self.quantiles = dict(zip(QUANTILES, np.asarray(entry["quantiles"]).tolist()))
+        self.edges = entry["edges"]
+        self.counts = entry["counts"]
+        self.log = bool(entry["log"])
+        self._packed_mask = entry["valid_mask"]
+        self._shape = tuple(shape)
+
+    @property
+    def median(self) -> float:
+        return self.quantiles[0.5]
+
+    def valid_mask(self) -> np.ndarray:
+        """Máscara bool de celdas válidas con la forma del cubo."""
+        n_cells = int(np.prod(self._shape))
+        return np.unpackbits(self._packed_mask, count=n_cells).astype(bool).reshape(self._shape)
+
+
+class ReservoirStats:
+    """
+    Estadísticas de un reservorio.
+
+    Attributes
+    ----------
+    shape : tuple
+        (nz, ny, nx)
+    facies_ids, facies_counts : np.ndarray
+        Facies presentes (orden ascendente) y número de celdas de cada una
+    properties : dict
+        {nombre: PropertyStats}
+    """
+
+    def __init__(self, data: Dict):
+        self.shape = tuple(data["shape"])
+        self.facies_ids = data["facies"]["ids"]
+        self.facies_counts = data["facies"]["counts"]
+        self.properties = {name: PropertyStats(entry, self.shape)
+                           for name, entry in data["properties"].items()}
+
+    @property
+    def n_cells(self) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def n_facies(self) -> int:
+        return len(self.facies_ids)
+
+    def __getitem__(self, name: str) -> PropertyStats:
+        return self.properties[name]
+
+
+def value_counts(values: np.ndarray):
+    """Valores distintos y sus conteos; `bincount` si son enteros no negativos pequeños."""
+    values = np.asarray(values).ravel()
+    if values.size:
+        low, high = values.min(), values.max()
+        if low >= 0 and high < 1 << 16 and np.array_equal(values, np.floor(values)):
+            counts = np.bincount(values.astype(np.int64), minlength=int(high) + 1)
+            ids = np.flatnonzero(counts)
+            return ids.astype(values.dtype), counts[ids]
+    return np.unique(values, return_counts=True)
+
+
+def _property_entry(values: np.ndarray, log: bool) -> Dict:
+    values = np.asarray(values)
+    mask = values > 0
+    valid = values[mask].astype(np.float64)
+    if valid.size:
+        scale = np.log10(valid) if log else valid
+        counts, edges = np.histogram(scale, bins=HISTOGRAM_BINS)
+        summary = (valid.min(), valid.max(), valid.mean(), np.quantile(valid, QUANTILES))
+    else:
+        counts, edges = np.zeros(HISTOGRAM_BINS, np.int64), np.linspace(0.0, 1.0, HISTOGRAM_BINS + 1)
+        summary = (np.nan, np.nan, np.nan, np.full(len(QUANTILES), np.nan))
+    return {
+        "n_valid": int(valid.size),
+        "min": float(summary[0]),
+        "max": float(summary[1]),
+        "mean": float(summary[2]),
+        "quantiles": np.asarray(summary[3], dtype=np.float64),
+        "edges": edges,
+        "counts": counts.astype(np.int64),
+        "log": log,
+        "valid_mask": np.packbits(mask.ravel()),
+    }
+
+
+def compute_stats(data: Dict[str, np.ndarray]) -> Dict:
+    """Estadísticas de {'facies', 'permeability', 'porosity'} (formato serializable)."""
+    facies_ids, facies_counts = value_counts(data["facies"])
+    return {
+        "shape": list(np.shape(data["facies"])),
+        "facies": {"ids": facies_ids, "counts": facies_counts.astype(np.int64)},
+        "properties": {name: _property_entry(data[name], log)
+                       for name, log in PROPERTIES.items() if name in data},
+    }
+
+
+def load_or_compute_stats(source: Union[str, Path], data: Dict[str, np.ndarray],
+                          directory: Optional[Union[str, Path]] = None) -> ReservoirStats:
+    """
+    Estadísticas guardadas junto a `source` (el `.npz`), o calculadas y guardadas.
+
+    Parameters
+    ----------
+    source : str or Path
+        Archivo de origen de `data`; su huella valida el archivo guardado
+    data : dict
+        Propiedades del reservorio
+    directory : str or Path, optional
+        Dónde guardar `reservoir_stats.gvc` (por defecto: el de `source`, que
+        es el de `metadata.json`). Si no es escribible se calculan sin guardar
+    """
+    source = Path(source)
+    stats_file = Path(directory or source.parent) / STATS_NAME
+    try:
+        stored = loads(stats_file.read_bytes())
+        if stored.get("version") == STATS_VERSION and matches_fingerprint(source, stored.get("source")):
+            return ReservoirStats(stored)
+    except (OSError, ValueError, KeyError, AttributeError, zlib.error):
+        pass
+
+    stats = compute_stats(data)
+    try:
+        stats.update(version=STATS_VERSION, source=file_fingerprint(source))
+        payload = dumps(stats)
+        atomic_write(stats_file, lambda f: f.write(payload))
+    except OSError:
+        pass
+    return ReservoirStats(stats)
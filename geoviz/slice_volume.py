@@ -0,0 +1,111 @@
+"""
+Volúmenes derivados para los cortes 3D de propiedades.
+
+La transformación de color (log10 de la permeabilidad, facies normalizadas a
+[0, 1]) se aplica una sola vez al cubo completo y se guarda en float32; cada
+movimiento de un slider solo extrae los tres planos con `SliceVolume.slices`,
+que devuelve vistas en la orientación que esperan las superficies de Plotly.
+Para los cortes en el navegador, `strided` submuestrea el volumen (una celda
+de cada `stride` por eje) hasta el tamaño que se quiera enviar.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+TRANSFORMS = ("linear", "log10", "facies")
+# Facies de GEOSX: 2 -> shalty (0), 3 -> sand (1); el resto queda en 0
+FACIES_LEVELS = {2: 0.0, 3: 1.0}
+
+
+class SliceVolume:
+    """
+    Volumen float32 (nz, ny, nx) de solo lectura, ya transformado.
+
+    Parameters
+    ----------
+    volume : np.ndarray
+        Valores transformados (se convierten a float32 contiguo)
+    transform : str
+        Transformación aplicada (ver `TRANSFORMS`)
+    """
+
+    def __init__(self, volume: np.ndarray, transform: str = "linear"):
+        volume = np.ascontiguousarray(volume, dtype=np.float32)
+        volume.flags.writeable = False
+        self.volume = volume
+        self.transform = transform
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.volume.shape
+
+    def clamp(self, x_slice: Optional[int], y_slice: Optional[int],
+              z_slice: Optional[int]) -> Tuple[int, int, int]:
+        """Índices de corte dentro del dominio (None -> mitad del eje)."""
+        nz, ny, nx = self.shape
+        indices = []
+        for index, n in ((x_slice, nx), (y_slice, ny), (z_slice, nz)):
+            index = n // 2 if index is None else index
+            indices.append(max(0, min(n - 1, int(index))))
+        return tuple(indices)
+
+    def slice_x(self, index: int) -> np.ndarray:
+        """Plano YZ como (ny, nz), con Z invertido."""
+        return self.volume[::-1, :, index].T
+
+    def slice_y(self, index: int) -> np.ndarray:
+        """Plano XZ como (nx, nz), con Z invertido."""
+        return self.volume[::-1, index, :].T
+
+    def slice_z(self, index: int) -> np.ndarray:
+        """Plano XY como (ny, nx)."""
+        return self.volume[index, :, :]
+
+    def strided(self, stride: int) -> np.ndarray:
+        """Una celda de cada `stride` por eje (contiguo, float32)."""
+        stride = max(1, int(stride))
+        return np.ascontiguousarray(self.volume[::stride, ::stride, ::stride])
+
+    def slices(self, x_slice: int, y_slice: int, z_slice: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Los tres planos (vistas, sin copiar el cubo)."""
+        return self.slice_x(x_slice), self.slice_y(y_slice), self.slice_z(z_slice)
+
+
+def fit_stride(shape: Tuple[int, ...], max_cells: int) -> int:
+    """Menor paso por eje con el que el volumen submuestreado no supera `max_cells`."""
+    stride = 1
+    while int(np.prod([-(-n // stride) for n in shape])) > max_cells and stride < max(shape):
+        stride += 1
+    return stride
+
+
+def facies_levels(data: np.ndarray, levels: Dict[int, float] = FACIES_LEVELS) -> np.ndarray:
+    """Facies discretas a niveles de color en [0, 1] (float32)."""
+    normalized = np.zeros(np.shape(data), dtype=np.float32)
+    for facies_id, level in levels.items():
+        normalized[data == facies_id] = level
+    return normalized
+
+
+def derive_volume(data: np.ndarray, transform: str = "linear") -> SliceVolume:
+    """
+    Aplica `transform` al cubo completo una sola vez.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Propiedad (nz, ny, nx)
+    transform : str
+        'linear' (solo float32), 'log10' (`log10(valor + 1e-20)`, calculado en
+        float64) o 'facies' (`facies_levels`)
+    """
+    if transform == "log10":
+        volume = np.log10(np.asarray(data, dtype=np.float64) + 1e-20)
+    elif transform == "facies":
+        volume = facies_levels(data)
+    elif transform == "linear":
+        volume = data
+    else:
+        raise ValueError(f"Transformación desconocida: {transform!r} (opciones: {', '.join(TRANSFORMS)})")
+    return SliceVolume(volume, transform)
@@ -0,0 +1,110 @@
+"""
+Series temporales de resumen (SMSPEC/UNSMRY) de Eclipse/PFLOTRAN.
+
+El SMSPEC se parsea una sola vez para construir las claves de los vectores
+(`FPAV`, `WBHP:INJS1`, `BPR:1234`...). Los registros PARAMS del UNSMRY se
+extraen del memory-map como una matriz (ministep × vector) float32, y la
+selección por nombre o comodín (`WBHP:*`, `FCMIP?`) devuelve columnas de esa
+matriz sin recorrer los ministeps en Python.
+"""
+
+import fnmatch
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from geoviz.ecl import EclFile
+
+# Nombres de pozo/grupo que Eclipse usa como "sin nombre"
+_NO_NAME = {"", ":+:+:+:+"}
+
+
+def _vector_keys(keywords: np.ndarray, wgnames: np.ndarray, nums: np.ndarray) -> List[str]:
+    """Claves únicas estilo Eclipse: `KW`, `KW:POZO` o `KW:NUM`."""
+    keys = []
+    for kw, wg, num in zip(keywords, wgnames, nums):
+        if kw[:1] == "W" or kw[:1] == "G":
+            keys.append(kw if wg in _NO_NAME else f"{kw}:{wg}")
+        elif kw[:1] in ("B", "R", "C") and num > 0:
+            keys.append(f"{kw}:{num}")
+        else:
+            keys.append(kw)
+    return keys
+
+
+class EclSummary:
+    """
+    Vectores de resumen de un caso (`CASE.SMSPEC` + `CASE.UNSMRY`).
+
+    Parameters
+    ----------
+    case_path : str or Path
+        Ruta al SMSPEC, al UNSMRY o al caso sin extensión
+    """
+
+    def __init__(self, case_path: Union[str, Path]):
+        case_path = Path(case_path)
+        if case_path.suffix.upper() in (".SMSPEC", ".UNSMRY"):
+            case_path = case_path.with_suffix("")
+        self.smspec_file = case_path.with_suffix(".SMSPEC")
+        self.unsmry_file = case_path.with_suffix(".UNSMRY")
+
+        with EclFile(self.smspec_file) as spec:
+            keywords = spec.get("KEYWORDS")
+            wgnames = spec.get("WGNAMES") if "WGNAMES" in spec else spec.get("NAMES")
+            nums = spec.get("NUMS") if "NUMS" in spec else np.zeros(keywords.size, dtype=np.int32)
+            units = spec.get("UNITS")
+            start = spec.get("STARTDAT")
+
+        self.keys: List[str] = _vector_keys(keywords, wgnames, nums)
+        self._index: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self.units: Dict[str, str] = dict(zip(self.keys, units.tolist()))
+        day, month, year = (int(v) for v in start[:3])
+        self.start_date = np.datetime64(f"{year:04d}-{month:02d}-{day:02d}")
+
+        with EclFile(self.unsmry_file) as f:
+            self.data: np.ndarray = f.stack("PARAMS").astype(np.float32, copy=False)
+
+    @property
+    def n_ministeps(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def time(self) -> np.ndarray:
+        """Tiempo simulado (días) por ministep."""
+        return self["TIME"]
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Fechas (datetime64[s]) por ministep a partir de STARTDAT."""
+        seconds = np.round(self.time.astype(np.float64) * 86400.0).astype("timedelta64[s]")
+        return self.start_date.astype("datetime64[s]") + seconds
+
+    def __contains__(self, key: str) -> bool:
+        return key.upper() in self._index
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """Vector 1D (vista de la columna) de una clave exacta."""
+        return self.data[:, self._index[key.upper()]]
+
+    def match(self, patterns: Union[str, List[str]]) -> List[str]:
+        """Claves que coinciden con uno o varios nombres/comodines, sin repetir."""
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        regex = re.compile("|".join(fnmatch.translate(p.upper()) for p in patterns))
+        return [key for key in self.keys if regex.match(key)]
+
+    def select(self, patterns: Union[str, List[str]]) -> Tuple[List[str], np.ndarray]:
+        """
+        Selecciona vectores por nombre o comodín.
+
+        Returns
+        -------
+        tuple
+            (claves, matriz (ministep × claves) float32)
+        """
+        keys = self.match(patterns)
+        columns = np.fromiter((self._index[k] for k in keys), dtype=np.intp, count=len(keys))
+        return keys, self.data[:, columns]
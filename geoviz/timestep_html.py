@@ -0,0 +1,285 @@
+"""
+Renderizado por lotes de los HTML autónomos de YMFS por timestep
+(`outputs/html/timesteps_embedded/ymfs_ts_NNNN_thr0p10_z1_on.html`).
+
+Cada combinación (timestep, umbral, escala Z, inyectores) es un trabajo
+independiente: se lee el GRDECL del timestep, se extraen las caras
+expuestas de las celdas `>= umbral` y se escribe un fragmento HTML de
+Plotly. Los trabajos se reparten entre procesos de un pool (spawn, como en
+`geoviz.ingest`). plotly.js se copia una vez al directorio de salida
+(`geoviz.plotly_bundle`) y los HTML lo cargan por ruta relativa, sin CDN.
+
+El directorio de salida lleva un `manifest.json` con, por archivo, sus
+parámetros, la huella de contenido del GRDECL de entrada y la clave
+resultante (`geoviz.preprocess_cache.cache_key`). Un archivo cuya clave
+coincide con la del manifiesto y que sigue en disco con el mismo tamaño
+está al día y no se vuelve a renderizar; incrementar `RENDER_VERSION`
+invalida todos.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import plotly.graph_objects as go
+
+from geoviz.fingerprint import atomic_write
+from geoviz.grdecl import read_grdecl_property_cached
+from geoviz.ingest import default_workers
+from geoviz.plotly_bundle import bundle_name, install_bundle
+from geoviz.plume_index import axis_coordinates
+from geoviz.preprocess_cache import cache_key, input_fingerprint
+from geoviz.voxel_mesh import VoxelMesh, exposed_faces
+
+RENDER_VERSION = 2
+NAMESPACE = "timestep_html"
+MANIFEST_NAME = "manifest.json"
+
+# Grilla YMFS (nz, ny, nx) y extensión del dominio en metros
+GRID_DIMS = (10, 100, 100)
+X_RANGE = (0.0, 10000.0)
+Y_RANGE = (0.0, 10000.0)
+Z_RANGE = (-2500.0, -2700.0)  # (tope, base)
+
+YMFS_COLORSCALE = [
+    [0.0, "rgb(0,0,0)"],
+    [1 / 3, "rgb(230,0,0)"],
+    [2 / 3, "rgb(255,210,0)"],
+    [1.0, "rgb(255,255,255)"],
+]
+INJECTOR_CENTERS = ((2500, 2500, -2500), (2500, 7500, -2500), (7500, 2500, -2500), (7438, 7438, -2500))
+INJECTOR_SIZE = 200.0
+FIGURE_SIZE = (1200, 850)
+
+# Cubo unitario: esquinas y 12 triángulos
+_CUBE_CORNERS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+], dtype=np.float64) - 0.5
+_CUBE_TRIANGLES = np.array([
+    (0, 1, 2), (0, 2, 3), (4, 6, 5), (4, 7, 6),
+    (0, 4, 5), (0, 5, 1), (2, 6, 7), (2, 7, 3),
+    (0, 3, 7), (0, 7, 4), (1, 5, 6), (1, 6, 2),
+], dtype=np.uint32)
+
+
+class RenderJob(NamedTuple):
+    """Una combinación a renderizar."""
+    timestep: int
+    source: Path
+    threshold: float
+    z_scale: float
+    injectors: bool
+
+    @property
+    def filename(self) -> str:
+        return output_name(self.timestep, self.threshold, self.z_scale, self.injectors)
+
+    def params(self) -> Dict:
+        return {"timestep": self.timestep, "threshold": self.threshold,
+                "z_scale": self.z_scale, "injectors": self.injectors}
+
+
+class RenderResult(NamedTuple):
+    """Archivo escrito por un trabajo."""
+    name: str
+    seconds: float
+    pid: int
+    n_triangles: int
+    bytes: int
+
+
+class BatchReport(NamedTuple):
+    """Resultado de `render_batch`: renderizados, omitidos (al día) y tiempo total."""
+    rendered: List[RenderResult]
+    skipped: List[str]
+    wall_seconds: float
+
+
+def output_name(timestep: int, threshold: float, z_scale: float, injectors: bool) -> str:
+    """Nombre del HTML: `ymfs_ts_0000_thr0p10_z1_on.html`."""
+    threshold_tag = f"{threshold:.2f}".replace(".", "p")
+    z_tag = f"{z_scale:g}".replace(".", "p")
+    return f"ymfs_ts_{timestep:04d}_thr{threshold_tag}_z{z_tag}_{'on' if injectors else 'off'}.html"
+
+
+def plan_jobs(files: Sequence[Tuple[int, Path]], thresholds: Iterable[float],
+              z_scales: Iterable[float], injectors: Iterable[bool]) -> List[RenderJob]:
+    """Producto cartesiano de timesteps ([(timestep, ruta)]) y parámetros."""
+    return [RenderJob(ts, Path(source), float(threshold), float(z_scale), bool(inj))
+            for (ts, source), threshold, z_scale, inj
+            in itertools.product(files, thresholds, z_scales, injectors)]
+
+
+def ymfs_mesh(values: np.ndarray, threshold: float,
+              dims: Tuple[int, int, int] = GRID_DIMS) -> VoxelMesh:
+    """
+    Caras expuestas de las celdas con `valor >= threshold`.
+
+    Misma geometría que `streamlit_co2_frames.build_voxel_mesh`: nodos
+    repartidos de borde a borde del dominio, sin dibujar la última capa de
+    cada eje.
+    """
+    nz, ny, nx = dims
+    total = nx * ny * nz
+    full = np.zeros(total)
+    n = min(len(values), total)
+    full[:n] = np.asarray(values).ravel()[:n]
+    full = full.reshape(dims)
+
+    dx = (X_RANGE[1] - X_RANGE[0]) / (nx - 1)
+    dy = (Y_RANGE[1] - Y_RANGE[0]) / (ny - 1)
+    dz = (Z_RANGE[1] - Z_RANGE[0]) / (nz - 1)
+    mask = full >= threshold
+    mask[-1, :, :] = False
+    mask[:, -1, :] = False
+    mask[:, :, -1] = False
+    return exposed_faces(mask,
+                         axis_coordinates(nx, X_RANGE[0], dx),
+                         axis_coordinates(ny, Y_RANGE[0], dy),
+                         axis_coordinates(nz, Z_RANGE[0], dz),
+                         (dx, dy, dz), full)
+
+
+def injector_mesh(centers=INJECTOR_CENTERS, size: float = INJECTOR_SIZE) -> VoxelMesh:
+    """Un cubo de lado `size` por inyector."""
+    centers = np.asarray(centers, dtype=np.float64)
+    vertices = (centers[:, None, :] + _CUBE_CORNERS[None, :, :] * size).reshape(-1, 3)
+    offsets = (np.arange(len(centers), dtype=np.uint32) * len(_CUBE_CORNERS))[:, None, None]
+    triangles = (_CUBE_TRIANGLES[None, :, :] + offsets).reshape(-1, 3)
+    return VoxelMesh(vertices.astype(np.float32), triangles, np.zeros(len(triangles), np.float32))
+
+
+def timestep_figure(values: np.ndarray, timestep: int, threshold: float, z_scale: float,
+                    injectors: bool) -> Tuple[go.Figure, int]:
+    """Figura de un timestep y número de triángulos de la pluma."""
+    mesh = ymfs_mesh(values, threshold)
+    fig = go.Figure()
+    if mesh.n_triangles:
+        c = mesh.as_columns()
+        fig.add_trace(go.Mesh3d(
+            x=c["x"], y=c["y"], z=c["z"], i=c["i"], j=c["j"], k=c["k"],
+            intensity=c["intensity"], intensitymode="cell", colorscale=YMFS_COLORSCALE,
+            cmin=threshold, cmax=1.0, showscale=True, name=f"YMFS ts{timestep}",
+            flatshading=False, lighting=dict(ambient=0.6, diffuse=0.7, specular=0.2),
+        ))
+    else:
+        fig.add_trace(go.Scatter3d(x=[], y=[], z=[], mode="markers", name="Sin datos"))
+        fig.add_annotation(text="Sin celdas ≥ umbral", xref="paper", yref="paper", x=0.02, y=0.95,
+                           showarrow=False, bgcolor="rgba(255,255,255,0.7)",
+                           font=dict(color="#666", size=16))
+
+    if injectors:
+        c = injector_mesh().as_columns()
+        fig.add_trace(go.Mesh3d(
+            x=c["x"], y=c["y"], z=c["z"], i=c["i"], j=c["j"], k=c["k"],
+            color="blue", opacity=0.9, flatshading=True, name="Inyectores", showscale=False,
+        ))
+
+    fig.update_layout(
+        title=dict(text=f"YMFS - timestep {timestep}", x=0.5),
+        scene=dict(
+            xaxis_title="X (m)", yaxis_title="Y (m)", zaxis_title="Z (m)",
+            aspectmode="manual", aspectratio=dict(x=1, y=1, z=z_scale),
+            xaxis=dict(range=list(X_RANGE)), yaxis=dict(range=list(Y_RANGE)),
+            zaxis=dict(range=[Z_RANGE[1], Z_RANGE[0]]),
+        ),
+        width=FIGURE_SIZE[0], height=FIGURE_SIZE[1], margin=dict(l=0, r=0, t=60, b=0),
+    )
+    return fig, mesh.n_triangles
+
+
+def render_job(job: RenderJob, output_dir: Path) -> RenderResult:
+    """Renderiza `job` en `output_dir` (escritura atómica)."""
+    start = time.perf_counter()
+    values = read_grdecl_property_cached(job.source)
+    fig, n_triangles = timestep_figure(values, job.timestep, job.threshold, job.z_scale, job.injectors)
+    html = f'<script src="{bundle_name()}"></script>\n' + fig.to_html(include_plotlyjs=False, full_html=False)
+    html = html.encode("utf-8")
+    atomic_write(Path(output_dir) / job.filename, lambda f: f.write(html))
+    return RenderResult(job.filename, time.perf_counter() - start, os.getpid(), n_triangles, len(html))
+
+
+def load_manifest(output_dir: Union[str, Path]) -> Dict:
+    """Manifiesto del directorio (vacío si no existe o no se puede leer)."""
+    try:
+        manifest = json.loads((Path(output_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"files": {}}
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def is_up_to_date(output_dir: Path, job: RenderJob, key: str, manifest: Dict) -> bool:
+    """Si el archivo de `job` existe y se generó con la misma clave."""
+    entry = manifest["files"].get(job.filename)
+    if not entry or entry.get("key") != key:
+        return False
+    try:
+        return (output_dir / job.filename).stat().st_size == entry.get("bytes")
+    except OSError:
+        return False
+
+
+def render_batch(jobs: Sequence[RenderJob], output_dir: Union[str, Path],
+                 workers: Optional[int] = None, force: bool = False) -> BatchReport:
+    """
+    Renderiza los trabajos que no están al día y actualiza el manifiesto.
+
+    Parameters
+    ----------
+    jobs : sequence
+        Combinaciones (ver `plan_jobs`)
+    output_dir : str or Path
+        Directorio de salida (se crea si no existe)
+    workers : int, optional
+        Procesos del pool (por defecto `default_workers`); con 1 se renderiza
+        en el proceso actual
+    force : bool
+        Renderizar aunque el manifiesto diga que están al día
+    """
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    if install_bundle(output_dir) is None:
+        raise OSError(f"No se pudo copiar plotly.js a {output_dir}")
+
+    pending, keys, skipped = [], {}, []
+    for job in jobs:
+        # La versión de plotly.js forma parte de la clave: el HTML nombra su archivo
+        key = cache_key(NAMESPACE, RENDER_VERSION, {**job.params(), "plotlyjs": bundle_name()}, [job.source])
+        keys[job.filename] = key
+        if not force and is_up_to_date(output_dir, job, key, manifest):
+            skipped.append(job.filename)
+        else:
+            pending.append(job)
+
+    workers = default_workers() if workers is None else workers
+    workers = min(workers, len(pending))
+    if workers <= 1:
+        rendered = [render_job(job, output_dir) for job in pending]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            rendered = list(pool.map(render_job, pending, [output_dir] * len(pending)))
+
+    for job, result in zip(pending, rendered):
+        manifest["files"][job.filename] = {
+            "key": keys[job.filename],
+            "params": job.params(),
+            "input": input_fingerprint(job.source),
+            "bytes": result.bytes,
+            "seconds": round(result.seconds, 4),
+        }
+    manifest["version"] = RENDER_VERSION
+    manifest["files"] = dict(sorted(manifest["files"].items()))
+    text = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    atomic_write(output_dir / MANIFEST_NAME, lambda f: f.write(text))
+    return BatchReport(rendered, skipped, time.perf_counter() - start)
@@ -0,0 +1,202 @@
+"""
+Almacén consolidado de propiedades dinámicas por timestep.
+
+Empaqueta los archivos `{PROP}_ts_{NNNN}.GRDECL` de `timesteps_export/`
+(PRESSURE, SGAS, SOIL, SWAT, YMFS) en un único `.npy` con forma
+(propiedad, timestep, celda) más un `manifest.json`. El cubo se abre con
+memory-map, así que cualquier corte propiedad/timestep o la historia temporal
+de una celda es una vista sin copia en lugar de un re-parseo.
+"""
+
+import json
+import re
+import time
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from geoviz.fingerprint import atomic_write, file_fingerprint, matches_fingerprint
+from geoviz.grdecl import read_grdecl_property
+from geoviz.ingest import iter_load
+
+STORE_VERSION = 1
+CUBE_FILE = "cube.npy"
+MANIFEST_FILE = "manifest.json"
+
+_TIMESTEP_FILE_RE = re.compile(r"^([A-Za-z0-9]+)_ts_(\d+)\.GRDECL$")
+
+
+def scan_timestep_files(source_dir: Union[str, Path]) -> Dict[str, Dict[int, Path]]:
+    """Agrupa los archivos `{PROP}_ts_{NNNN}.GRDECL` como {prop: {ts: ruta}}."""
+    found: Dict[str, Dict[int, Path]] = {}
+    for filepath in sorted(Path(source_dir).glob("*_ts_*.GRDECL")):
+        match = _TIMESTEP_FILE_RE.match(filepath.name)
+        if match:
+            found.setdefault(match.group(1).upper(), {})[int(match.group(2))] = filepath
+    return found
+
+
+class TimestepStore:
+    """Acceso perezoso (memory-mapped) al cubo (propiedad, timestep, celda)."""
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.properties: List[str] = self.manifest["properties"]
+        self.timesteps: List[int] = self.manifest["timesteps"]
+        self.available: Dict[str, List[int]] = self.manifest["available"]
+        self.n_cells: int = self.manifest["n_cells"]
+        self._prop_index = {name: i for i, name in enumerate(self.properties)}
+        self._ts_index = {ts: i for i, ts in enumerate(self.timesteps)}
+        self.cube = np.load(self.store_dir / CUBE_FILE, mmap_mode="r")
+
+    def property_cube(self, prop: str) -> np.ndarray:
+        """Vista (timestep, celda) de una propiedad."""
+        return self.cube[self._prop_index[prop.upper()]]
+
+    def slice(self, prop: str, timestep: int) -> np.ndarray:
+        """Vista 1D de una propiedad en un timestep."""
+        return self.cube[self._prop_index[prop.upper()], self._ts_index[timestep]]
+
+    def history(self, prop: str, cell: int) -> np.ndarray:
+        """Vista 1D (por timestep) de una propiedad en una celda."""
+        return self.cube[self._prop_index[prop.upper()], :, cell]
+
+    def as_dict(self, prop: str) -> Dict[int, np.ndarray]:
+        """{timestep: vista} de los timesteps exportados para la propiedad."""
+        return {ts: self.slice(prop, ts) for ts in self.available[prop.upper()]}
+
+    def is_fresh(self, source_dir: Union[str, Path]) -> bool:
+        """Indica si el almacén refleja los archivos actuales de `source_dir`."""
+        return _is_fresh(self.manifest, source_dir)
+
+
+def _is_fresh(manifest: Dict, source_dir: Union[str, Path]) -> bool:
+    if manifest.get("version") != STORE_VERSION:
+        return False
+    current = scan_timestep_files(source_dir)
+    sources = manifest.get("sources", {})
+    names = {fp.name for prop in manifest.get("properties", [])
+             for fp in current.get(prop, {}).values()}
+    if names != set(sources):
+        return False
+    source_dir = Path(source_dir)
+    return all(matches_fingerprint(source_dir / name, fp) for name, fp in sources.items())
+
+
+def build_timestep_store(source_dir: Union[str, Path], store_dir: Union[str, Path],
+                         properties: Optional[List[str]] = None,
+                         dtype=np.float64, workers: Optional[int] = None) -> TimestepStore:
+    """
+    Parsea los GRDECL de `source_dir` y escribe el cubo en `store_dir`.
+
+    Parameters
+    ----------
+    source_dir : str or Path
+        Directorio con archivos `{PROP}_ts_{NNNN}.GRDECL`
+    store_dir : str or Path
+        Directorio de salida (`cube.npy` y `manifest.json`)
+    properties : list, optional
+        Propiedades a incluir (por defecto: todas las encontradas)
+    dtype : numpy dtype
+        Tipo del cubo. Los timesteps que falten para una propiedad quedan en
+        NaN; un archivo con otro número de celdas es un `ValueError`
+    workers : int, optional
+        Procesos para parsear los archivos (ver `geoviz.ingest`). Los tiempos
+        por archivo quedan en `manifest['ingest']`
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    found = scan_timestep_files(source_dir)
+    if properties is not None:
+        found = {p.upper(): found[p.upper()] for p in properties if p.upper() in found}
+    if not found:
+        raise FileNotFoundError(f"No hay archivos *_ts_*.GRDECL en {source_dir}")
+
+    prop_names = sorted(found)
+    timesteps = sorted({ts for files in found.values() for ts in files})
+    prop_index = {name: i for i, name in enumerate(prop_names)}
+    ts_index = {ts: i for i, ts in enumerate(timesteps)}
+
+    # Orden de lectura: (propiedad, timestep). `iter_load` devuelve los
+    # resultados en ese orden aunque se parseen en paralelo
+    jobs = [(prop_index[prop] * len(timesteps) + ts_index[ts], found[prop][ts])
+            for prop in prop_names for ts in sorted(found[prop])]
+
+    # Escribir con `atomic_write`, para no dejar un cubo a medias. El primer
+    # archivo fija el número de celdas; el resto se escribe en streaming, en
+    # orden de `slot`, sin mantener todos los timesteps en memoria
+    n_slots = len(prop_names) * len(timesteps)
+    timings = []
+    n_cells = None
+
+    def write_cube(f):
+        nonlocal n_cells
+        next_slot = 0
+        for slot, values, timing in iter_load(jobs, partial(read_grdecl_property, dtype=dtype), workers):
+            if n_cells is None:
+                n_cells = values.size
+                np.lib.format.write_array_header_1_0(f, {
+                    "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                    "fortran_order": False,
+                    "shape": (len(prop_names), len(timesteps), n_cells),
+                })
+                gap = np.full(n_cells, np.nan, dtype=dtype)
+            if values.size != n_cells:
+                raise ValueError(f"{timing.name}: {values.size} valores, se esperaban {n_cells}")
+            for _ in range(next_slot, slot):
+                f.write(gap.data)
+            f.write(np.ascontiguousarray(values, dtype=dtype).data)
+            next_slot = slot + 1
+            timings.append(timing)
+        for _ in range(next_slot, n_slots):
+            f.write(gap.data)
+
+    start = time.perf_counter()
+    atomic_write(store_dir / CUBE_FILE, write_cube)
+    wall_seconds = time.perf_counter() - start
+
+    manifest = {
+        "version": STORE_VERSION,
+        "properties": prop_names,
+        "timesteps": timesteps,
+        "available": {prop: sorted(found[prop]) for prop in prop_names},
+        "n_cells": int(n_cells),
+        "dtype": np.dtype(dtype).str,
+        "sources": {fp.name: file_fingerprint(fp)
+                    for files in found.values() for fp in files.values()},
+        "ingest": {
+            "workers": len({t.pid for t in timings}),
+            "wall_seconds": wall_seconds,
+            "files": [t._asdict() for t in timings],
+        },
+    }
+    text = json.dumps(manifest, indent=2).encode("utf-8")
+    atomic_write(store_dir / MANIFEST_FILE, lambda f: f.write(text))
+
+    return TimestepStore(store_dir)
+
+
+def open_timestep_store(source_dir: Union[str, Path], store_dir: Union[str, Path],
+                        rebuild: bool = True, workers: Optional[int] = None) -> Optional[TimestepStore]:
+    """
+    Abre el almacén de `store_dir` si está al día con `source_dir`.
+
+    Si falta o está desactualizado lo reconstruye (con `rebuild=True`) o
+    devuelve None.
+    """
+    store_dir = Path(store_dir)
+    try:
+        store = TimestepStore(store_dir)
+        if store.is_fresh(source_dir):
+            return store
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if not rebuild or not scan_timestep_files(source_dir):
+        return None
+    return build_timestep_store(source_dir, store_dir, workers=workers)
@@ -0,0 +1,276 @@
+"""
+Serialización de los datos de los visores HTML para JavaScript.
+
+Los datos preprocesados son dicts/listas con columnas NumPy. `payload_js`
+los envía en binario: las columnas viajan como un buffer base64 (comprimido
+con zlib) y el navegador las recupera como Float32Array/Uint32Array sin
+parsear texto. `to_js` es la alternativa en texto: las columnas float32 se
+escriben con `%.9g` (9 cifras significativas recuperan el float32 exacto)
+formateando el arreglo completo con un único `%` de cadena.
+
+Las partes envueltas en `Lazy` (ej. un timestep) viajan en su propio buffer
+y el navegador las decodifica solo cuando se piden (`loadLazy`). La
+decodificación base64 + inflado corre en un Web Worker.
+"""
+
+import base64
+import json
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+_FLOAT_FORMATS = {np.dtype(np.float32): "%.9g", np.dtype(np.float64): "%.17g"}
+
+
+def _array_to_js(values: np.ndarray) -> str:
+    values = values.ravel()
+    fmt = _FLOAT_FORMATS.get(values.dtype)
+    if fmt is None or not np.isfinite(values).all():
+        # Enteros, o NaN/Infinity (json.dumps los escribe como literales JS)
+        return json.dumps(values.tolist())
+    return "[" + ",".join([fmt] * values.size) % tuple(values.tolist()) + "]"
+
+
+class Lazy:
+    """Marca una parte de los datos para empaquetarla aparte y decodificarla bajo demanda."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+
+def to_js(obj) -> str:
+    """Literal JavaScript de `obj` (dicts, listas, escalares y arreglos NumPy)."""
+    if isinstance(obj, Lazy):
+        # En texto no hay buffer aparte: `loadLazy` devuelve el valor tal cual
+        return to_js(obj.obj)
+    if isinstance(obj, np.ndarray):
+        return _array_to_js(obj)
+    if isinstance(obj, dict):
+        return "{" + ",".join(f"{json.dumps(str(key))}:{to_js(value)}" for key, value in obj.items()) + "}"
+    if isinstance(obj, (list, tuple)):
+        return "[" + ",".join(to_js(value) for value in obj) + "]"
+    if isinstance(obj, np.generic):
+        return json.dumps(obj.item())
+    return json.dumps(obj)
+
+
+# Transporte binario: las columnas se concatenan en un buffer (alineado a 8
+# bytes), opcionalmente comprimido con zlib, y viajan en base64. En el literal
+# quedan referencias {"$array": [tipo, offset, n]} que `decodePayload` (ver
+# DECODER_JS) reemplaza por vistas Float32Array/Uint32Array/... del buffer.
+# Cada `Lazy` queda como {"$lazy": [literal, base64, codec]} con su propio buffer.
+_TYPED_ARRAYS = {
+    np.dtype("<f4"): "Float32Array",
+    np.dtype("<f8"): "Float64Array",
+    np.dtype("<u4"): "Uint32Array",
+    np.dtype("<i4"): "Int32Array",
+    np.dtype("u1"): "Uint8Array",
+}
+
+
+def _typed_array(values: np.ndarray) -> np.ndarray:
+    """
+    Convierte al tipo little-endian equivalente de JavaScript más cercano.
+
+    Los enteros de 64 bits pasan a 32 bits solo si todos los valores caben;
+    si no, es un `ValueError` (no se truncan en silencio).
+    """
+    kind, itemsize = values.dtype.kind, values.dtype.itemsize
+    if kind == "f":
+        dtype = "<f4" if itemsize <= 4 else "<f8"
+    elif kind == "u":
+        dtype = "<u4"
+    elif kind == "i":
+        dtype = "<i4"
+    elif kind == "b":
+        dtype = "u1"
+    else:
+        raise TypeError(f"Tipo no soportado en el payload binario: {values.dtype}")
+    if kind in "iu" and itemsize > 4 and values.size:
+        limits = np.iinfo(dtype)
+        low, high = values.min(), values.max()
+        if low < limits.min or high > limits.max:
+            raise ValueError(f"Valores fuera del rango de {_TYPED_ARRAYS[np.dtype(dtype)]} "
+                             f"({values.dtype}, [{low}, {high}])")
+    return np.ascontiguousarray(values.ravel(), dtype=dtype)
+
+
+def _pack(obj, chunks: List[bytes], offset: List[int], compress: bool) -> str:
+    if isinstance(obj, Lazy):
+        meta, buffer, codec = pack_binary(obj.obj, compress)
+        blob = base64.b64encode(buffer).decode("ascii")
+        return f'{{"$lazy":[{meta},"{blob}","{codec}"]}}'
+    if isinstance(obj, np.ndarray):
+        values = _typed_array(obj)
+        ref = [_TYPED_ARRAYS[values.dtype], offset[0], int(values.size)]
+        data = values.tobytes()
+        padding = -len(data) % 8
+        chunks.append(data + b"\0" * padding)
+        offset[0] += len(data) + padding
+        return json.dumps({"$array": ref})
+    if isinstance(obj, dict):
+        return "{" + ",".join(f"{json.dumps(str(key))}:{_pack(value, chunks, offset, compress)}"
+                              for key, value in obj.items()) + "}"
+    if isinstance(obj, (list, tuple)):
+        return "[" + ",".join(_pack(value, chunks, offset, compress) for value in obj) + "]"
+    if isinstance(obj, np.generic):
+        return json.dumps(obj.item())
+    return json.dumps(obj)
+
+
+def pack_binary(obj, compress: bool = True) -> Tuple[str, bytes, str]:
+    """
+    Separa los arreglos de `obj` en un buffer binario.
+
+    Returns
+    -------
+    tuple
+        (literal JS con referencias, buffer, codec: 'deflate' o '')
+    """
+    chunks: List[bytes] = []
+    meta = _pack(obj, chunks, [0], compress)
+    buffer = b"".join(chunks)
+    if compress:
+        return meta, zlib.compress(buffer, 6), "deflate"
+    return meta, buffer, ""
+
+
+def payload_js(obj, binary: bool = True, compress: bool = True) -> str:
+    """
+    Expresión JavaScript que resuelve (Promise) a los datos de `obj`.
+
+    Requiere DECODER_JS en la página. Con `binary=False` los datos van como
+    literal de texto (`to_js`).
+    """
+    if not binary:
+        return f"Promise.resolve({to_js(obj)})"
+    meta, buffer, codec = pack_binary(obj, compress)
+    blob = base64.b64encode(buffer).decode("ascii")
+    return f'decodePayload({meta}, "{blob}", "{codec}")'
+
+
+# Decodificador del lado del navegador. La descompresión usa
+# DecompressionStream ('deflate' = formato zlib), nativo del navegador, y
+# corre en un Web Worker (creado desde un Blob con `_INFLATE_JS`): el hilo
+# principal recibe el buffer ya inflado como transferible y solo crea las
+# vistas tipadas. Sin Worker disponible se inflan en el hilo principal.
+_INFLATE_JS = """
+async function inflateBlob(blob, codec) {
+    const binary = atob(blob);
+    let bytes = new Uint8Array(binary.length);
+    for (let n = 0; n < binary.length; n++) {
+        bytes[n] = binary.charCodeAt(n);
+    }
+    if (codec) {
+        const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream(codec));
+        return await new Response(stream).arrayBuffer();
+    }
+    return bytes.buffer;
+}
+"""
+
+_WORKER_JS = _INFLATE_JS + """
+self.onmessage = async (event) => {
+    const { id, blob, codec } = event.data;
+    try {
+        const buffer = await inflateBlob(blob, codec);
+        self.postMessage({ id, buffer }, [buffer]);
+    } catch (err) {
+        self.postMessage({ id, error: String(err) });
+    }
+};
+"""
+
+DECODER_JS = _INFLATE_JS + """
+const PAYLOAD_TYPES = {
+    Float32Array, Float64Array, Uint32Array, Int32Array, Uint8Array
+};
+const PAYLOAD_WORKER_SOURCE = """ + json.dumps(_WORKER_JS) + """;
+
+// Devuelve una copia: el literal queda intacto para volver a decodificarlo
+function reviveArrays(node, buffer) {
+    if (Array.isArray(node)) {
+        return node.map(value => reviveArrays(value, buffer));
+    }
+    if (node && typeof node === 'object') {
+        if (node.$array) {
+            const [type, offset, length] = node.$array;
+            return new PAYLOAD_TYPES[type](buffer, offset, length);
+        }
+        if (node.$lazy) {
+            return node;  // buffer propio: se decodifica con loadLazy
+        }
+        const revived = {};
+        for (const key of Object.keys(node)) {
+            revived[key] = reviveArrays(node[key], buffer);
+        }
+        return revived;
+    }
+    return node;
+}
+
+// Worker compartido; null si el entorno no permite crearlo
+let payloadWorker;
+const payloadJobs = new Map();
+let payloadJobId = 0;
+
+function getPayloadWorker() {
+    if (payloadWorker !== undefined) {
+        return payloadWorker;
+    }
+    try {
+        const url = URL.createObjectURL(new Blob([PAYLOAD_WORKER_SOURCE], { type: 'text/javascript' }));
+        payloadWorker = new Worker(url);
+    } catch (err) {
+        payloadWorker = null;
+        return payloadWorker;
+    }
+    payloadWorker.onmessage = (event) => {
+        const { id, buffer, error } = event.data;
+        const job = payloadJobs.get(id);
+        payloadJobs.delete(id);
+        if (error === undefined) {
+            job.resolve(buffer);
+        } else {
+            job.reject(new Error(error));
+        }
+    };
+    payloadWorker.onerror = () => {
+        // Worker inutilizable: lo pendiente (y lo siguiente) va al hilo principal
+        payloadWorker.terminate();
+        payloadWorker = null;
+        for (const job of payloadJobs.values()) {
+            inflateBlob(job.blob, job.codec).then(job.resolve, job.reject);
+        }
+        payloadJobs.clear();
+    };
+    return payloadWorker;
+}
+
+function inflateOffThread(blob, codec) {
+    const worker = getPayloadWorker();
+    if (!worker) {
+        return inflateBlob(blob, codec);
+    }
+    return new Promise((resolve, reject) => {
+        const id = payloadJobId++;
+        payloadJobs.set(id, { resolve, reject, blob, codec });
+        worker.postMessage({ id, blob, codec });
+    });
+}
+
+async function decodePayload(meta, blob, codec) {
+    return reviveArrays(meta, await inflateOffThread(blob, codec));
+}
+
+// Decodifica una parte `Lazy`; cualquier otro valor se devuelve tal cual
+function loadLazy(node) {
+    if (node && node.$lazy) {
+        return decodePayload(...node.$lazy);
+    }
+    return Promise.resolve(node);
+}
+"""
@@ -0,0 +1,312 @@
+"""
+Mallas de vóxeles con solo las caras expuestas.
+
+Un cubo por celda activa emite 12 triángulos, pero la cara compartida entre
+dos celdas activas nunca se ve. `exposed_faces` trabaja sobre la máscara 3D
+de celdas activas y genera solo los quads cuyo vecino está inactivo (o fuera
+de la grilla), como arreglos indexados de vértices y triángulos listos para
+un `Mesh3d` de Plotly.
+
+Con coordenadas por eje (grilla regular) los vértices se comparten entre
+caras vecinas; con coordenadas por celda (ej. Z real del VTK) cada quad
+tiene sus 4 vértices.
+
+`greedy_faces` además fusiona las caras expuestas coplanares y contiguas con
+la misma etiqueta de color (facies, o valor discretizado con
+`color_buckets`) en rectángulos: una superficie plana de N×M caras pasa a
+ser un único quad.
+
+`share_vertices` reindexa varias mallas (ej. una por timestep) sobre una
+tabla de vértices común, para animaciones donde solo cambian los triángulos
+y sus valores.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Vértices del cubo unitario (di, dj, dk), en el orden usado por los visores
+_CUBE_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=np.int64)
+
+# Por dirección: (eje del arreglo (k, j, i) = (0, 1, 2), sentido, quad del cubo).
+# Los quads (a, b, c, d) dan los triángulos (a, b, c) y (a, c, d), igual que
+# las 12 caras del cubo que emitían los visores.
+_FACES = (
+    (0, -1, (0, 1, 2, 3)),
+    (0, +1, (4, 7, 6, 5)),
+    (1, -1, (0, 4, 5, 1)),
+    (1, +1, (2, 6, 7, 3)),
+    (2, -1, (0, 3, 7, 4)),
+    (2, +1, (1, 5, 6, 2)),
+)
+
+
+class VoxelMesh(NamedTuple):
+    """Malla indexada: vértices (V, 3), triángulos (T, 3) y valor por triángulo."""
+    vertices: np.ndarray
+    triangles: np.ndarray
+    values: np.ndarray
+
+    @property
+    def n_triangles(self) -> int:
+        return len(self.triangles)
+
+    def as_columns(self) -> Dict[str, np.ndarray]:
+        """Columnas `x, y, z, i, j, k, intensity` (float32/uint32) para Mesh3d."""
+        return {
+            "x": self.vertices[:, 0], "y": self.vertices[:, 1], "z": self.vertices[:, 2],
+            "i": self.triangles[:, 0], "j": self.triangles[:, 1], "k": self.triangles[:, 2],
+            "intensity": self.values,
+        }
+
+
+def _empty_mesh() -> VoxelMesh:
+    return VoxelMesh(np.empty((0, 3), np.float32), np.empty((0, 3), np.uint32), np.empty(0, np.float32))
+
+
+def exposed_mask(mask: np.ndarray, axis: int, side: int) -> np.ndarray:
+    """Celdas activas cuyo vecino en `axis` (sentido `side`) está inactivo o fuera."""
+    target, source = [slice(None)] * 3, [slice(None)] * 3
+    if side > 0:
+        target[axis], source[axis] = slice(None, -1), slice(1, None)
+    else:
+        target[axis], source[axis] = slice(1, None), slice(None, -1)
+    neighbor = np.zeros_like(mask)
+    neighbor[tuple(target)] = mask[tuple(source)]
+    return mask & ~neighbor
+
+
+def exposed_faces(mask: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                  cell_size: Tuple[float, float, float],
+                  values: Optional[np.ndarray] = None) -> VoxelMesh:
+    """
+    Extrae las caras expuestas de las celdas activas.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        Celdas activas, forma (nz, ny, nx) (x varía más rápido)
+    x, y, z : np.ndarray
+        Origen de cada celda: tablas por eje (longitudes nx, ny, nz) o
+        arreglos por celda (forma de `mask` o aplanados)
+    cell_size : tuple
+        (dx, dy, dz); el cubo de la celda va de `origen` a `origen + tamaño`
+    values : np.ndarray, optional
+        Valor por celda (forma de `mask` o aplanado) asignado a sus triángulos
+
+    Returns
+    -------
+    VoxelMesh
+        Vértices float32, triángulos uint32 y valores float32 por triángulo
+    """
+    mask = np.asarray(mask, dtype=bool)
+    nz, ny, nx = mask.shape
+    regular = np.ndim(x) == 1 and len(x) == nx and len(y) == ny and len(z) == nz
+    if values is not None:
+        values = np.asarray(values).reshape(mask.shape)
+
+    corners, cells = [], []
+    for axis, side, quad in _FACES:
+        k, j, i = np.nonzero(exposed_mask(mask, axis, side))
+        if k.size == 0:
+            continue
+        cells.append(np.stack([k, j, i], axis=1))
+        # Vértices del quad en índices de nodo (k + dk, j + dj, i + di)
+        offsets = _CUBE_CORNERS[list(quad)][:, ::-1]
+        corners.append(cells[-1][:, None, :] + offsets[None, :, :])
+    if not cells:
+        return _empty_mesh()
+
+    cells = np.concatenate(cells)        # (F, 3) celda de cada quad
+    corners = np.concatenate(corners)    # (F, 4, 3) nodos de cada quad
+    n_faces = len(cells)
+    dx, dy, dz = cell_size
+
+    if regular:
+        # Nodos de la grilla compartidos entre quads vecinos
+        node_ids = np.ravel_multi_index((corners[..., 0], corners[..., 1], corners[..., 2]),
+                                        (nz + 1, ny + 1, nx + 1))
+        unique_ids, inverse = np.unique(node_ids.ravel(), return_inverse=True)
+        nk, nj, ni = np.unravel_index(unique_ids, (nz + 1, ny + 1, nx + 1))
+        x_nodes = np.append(np.asarray(x, dtype=np.float64), x[-1] + dx)
+        y_nodes = np.append(np.asarray(y, dtype=np.float64), y[-1] + dy)
+        z_nodes = np.append(np.asarray(z, dtype=np.float64), z[-1] + dz)
+        vertices = np.stack([x_nodes[ni], y_nodes[nj], z_nodes[nk]], axis=1)
+        quads = inverse.reshape(n_faces, 4)
+    else:
+        # Origen por celda: 4 vértices propios por quad
+        flat = np.ravel_multi_index((cells[:, 0], cells[:, 1], cells[:, 2]), mask.shape)
+        origin = np.stack([np.asarray(c).ravel()[flat] for c in (x, y, z)], axis=1)
+        offset = (corners - cells[:, None, :])[..., ::-1] * np.array([dx, dy, dz])
+        vertices = (origin[:, None, :] + offset).reshape(-1, 3)
+        quads = np.arange(n_faces * 4).reshape(n_faces, 4)
+
+    triangles = np.empty((n_faces, 2, 3), dtype=np.uint32)
+    triangles[:, 0] = quads[:, [0, 1, 2]]
+    triangles[:, 1] = quads[:, [0, 2, 3]]
+
+    if values is None:
+        face_values = np.zeros(n_faces, dtype=np.float32)
+    else:
+        face_values = values[cells[:, 0], cells[:, 1], cells[:, 2]].astype(np.float32)
+
+    return VoxelMesh(vertices.astype(np.float32), triangles.reshape(-1, 3), np.repeat(face_values, 2))
+
+
+def share_vertices(meshes: Sequence[VoxelMesh]) -> Tuple[np.ndarray, List[VoxelMesh]]:
+    """
+    Une los vértices de varias mallas en una sola tabla.
+
+    Returns
+    -------
+    tuple
+        (vértices float32 únicos (V, 3), mallas con esos vértices y sus
+        triángulos reindexados; los valores no cambian)
+    """
+    if not meshes:
+        return np.empty((0, 3), np.float32), []
+    stacked = np.ascontiguousarray(np.concatenate([np.asarray(m.vertices, dtype=np.float32) for m in meshes]))
+    # Cada fila como un bloque de 12 bytes: np.unique compara bytes en vez de filas
+    rows = stacked.view(np.dtype((np.void, stacked.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    vertices = stacked[first]
+    inverse = inverse.ravel().astype(np.uint32)
+    shared, start = [], 0
+    for mesh in meshes:
+        remap = inverse[start:start + len(mesh.vertices)]
+        shared.append(VoxelMesh(vertices, remap[mesh.triangles], mesh.values))
+        start += len(mesh.vertices)
+    return vertices, shared
+
+
+def color_buckets(values: np.ndarray, n_buckets: int, vmin: float = 0.0,
+                  vmax: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Discretiza valores continuos en `n_buckets` etiquetas de color.
+
+    Returns
+    -------
+    tuple
+        (etiqueta 0..n_buckets-1 por valor, valor central de cada etiqueta)
+    """
+    scaled = (np.asarray(values, dtype=np.float64) - vmin) / (vmax - vmin) * n_buckets
+    labels = np.clip(np.floor(scaled), 0, n_buckets - 1).astype(np.int64)
+    edges = np.linspace(vmin, vmax, n_buckets + 1)
+    return labels, (edges[:-1] + edges[1:]) / 2
+
+
+def merge_rectangles(labels: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Cubre con rectángulos las celdas con etiqueta >= 0 de cada plano.
+
+    Primero se agrupan las rachas de igual etiqueta a lo largo de cada fila y
+    luego se apilan las rachas idénticas (mismas columnas y etiqueta) de filas
+    consecutivas. Todo vectorizado; los rectángulos no se solapan.
+
+    Parameters
+    ----------
+    labels : np.ndarray
+        Etiquetas (planos, filas, columnas); -1 = celda vacía
+
+    Returns
+    -------
+    tuple
+        (plano, fila0, fila1, col0, col1, etiqueta) con extremos inclusivos
+    """
+    n_planes, n_rows, n_cols = labels.shape
+    flat = labels.reshape(n_planes * n_rows, n_cols)
+    prev = np.full_like(flat, -1)
+    prev[:, 1:] = flat[:, :-1]
+    nxt = np.full_like(flat, -1)
+    nxt[:, :-1] = flat[:, 1:]
+    valid = flat >= 0
+
+    # Cada racha tiene un inicio y un fin; nonzero los da en el mismo orden
+    row, col0 = np.nonzero(valid & (flat != prev))
+    _, col1 = np.nonzero(valid & (flat != nxt))
+    label = flat[row, col0]
+    plane, row = np.divmod(row, n_rows)
+    if row.size == 0:
+        return plane, row, row, col0, col1, label
+
+    order = np.lexsort((row, label, col1, col0, plane))
+    plane, row, col0, col1, label = (a[order] for a in (plane, row, col0, col1, label))
+    new = np.ones(len(row), dtype=bool)
+    new[1:] = ((plane[1:] != plane[:-1]) | (col0[1:] != col0[:-1]) | (col1[1:] != col1[:-1])
+               | (label[1:] != label[:-1]) | (row[1:] != row[:-1] + 1))
+    first = np.flatnonzero(new)
+    last = np.append(first[1:] - 1, len(row) - 1)
+    return plane[first], row[first], row[last], col0[first], col1[first], label[first]
+
+
+def greedy_faces(mask: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                 cell_size: Tuple[float, float, float], labels: np.ndarray,
+                 label_values: Optional[np.ndarray] = None) -> VoxelMesh:
+    """
+    Como `exposed_faces`, fusionando caras coplanares con la misma etiqueta.
+
+    Parameters
+    ----------
+    mask, x, y, z, cell_size
+        Ver `exposed_faces`. Con coordenadas por celda, los vértices de cada
+        rectángulo salen de las celdas de sus esquinas
+    labels : np.ndarray
+        Etiqueta entera >= 0 por celda (facies, o `color_buckets`)
+    label_values : np.ndarray, optional
+        Valor de cada etiqueta para los triángulos (por defecto, la etiqueta)
+
+    Returns
+    -------
+    VoxelMesh
+        4 vértices por rectángulo (sin compartir: los rectángulos vecinos no
+        coinciden en sus vértices)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    nz, ny, nx = mask.shape
+    regular = np.ndim(x) == 1 and len(x) == nx and len(y) == ny and len(z) == nz
+    labels = np.asarray(labels).reshape(mask.shape)
+    size = np.array(cell_size, dtype=np.float64)
+
+    vertices, values = [], []
+    for axis, side, quad in _FACES:
+        plane_labels = np.moveaxis(np.where(exposed_mask(mask, axis, side), labels, -1), axis, 0)
+        plane, r0, r1, c0, c1, label = merge_rectangles(plane_labels)
+        if plane.size == 0:
+            continue
+        row_axis, col_axis = [ax for ax in range(3) if ax != axis]
+
+        # Celda (k, j, i) de cada esquina: el lado 0 del cubo toma la primera
+        # celda del rectángulo y el lado 1 la última
+        offsets = _CUBE_CORNERS[list(quad)][:, ::-1]
+        cells = np.empty((plane.size, 4, 3), dtype=np.int64)
+        cells[..., axis] = plane[:, None]
+        cells[..., row_axis] = np.where(offsets[:, row_axis] == 0, r0[:, None], r1[:, None])
+        cells[..., col_axis] = np.where(offsets[:, col_axis] == 0, c0[:, None], c1[:, None])
+
+        if regular:
+            origin = np.stack([np.asarray(x, dtype=np.float64)[cells[..., 2]],
+                               np.asarray(y, dtype=np.float64)[cells[..., 1]],
+                               np.asarray(z, dtype=np.float64)[cells[..., 0]]], axis=-1)
+        else:
+            flat = np.ravel_multi_index((cells[..., 0], cells[..., 1], cells[..., 2]), mask.shape)
+            origin = np.stack([np.asarray(c).ravel()[flat] for c in (x, y, z)], axis=-1)
+        vertices.append((origin + offsets[:, ::-1] * size).reshape(-1, 3))
+        values.append(label)
+
+    if not vertices:
+        return _empty_mesh()
+
+    vertices = np.concatenate(vertices)
+    values = np.concatenate(values)
+    if label_values is not None:
+        values = np.asarray(label_values)[values]
+
+    quads = np.arange(len(vertices)).reshape(-1, 4)
+    triangles = np.empty((len(quads), 2, 3), dtype=np.uint32)
+    triangles[:, 0] = quads[:, [0, 1, 2]]
+    triangles[:, 1] = quads[:, [0, 2, 3]]
+    return VoxelMesh(vertices.astype(np.float32), triangles.reshape(-1, 3),
+                     np.repeat(values.astype(np.float32), 2))
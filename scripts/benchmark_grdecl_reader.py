@@ -0,0 +1,115 @@
+"""
+Benchmark del lector GRDECL vectorizado (`geoviz.grdecl`) contra el parser
+línea a línea que usaban `app.py` y los scripts.
+
+Uso:
+    python scripts/benchmark_grdecl_reader.py [archivo.GRDECL ...]
+
+Sin argumentos mide todos los archivos de `timesteps_export/`.
+
+Mide el parseo del texto y, aparte, la lectura con `read_grdecl_property_cached`
+con el sidecar `.npy` ya escrito: ese es el camino que usan la app y los
+scripts en lecturas repetidas, y el que da la mejora de 10× o más (el parseo
+del texto solo no llega).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from geoviz.grdecl import read_grdecl_property, read_grdecl_property_cached  # noqa: E402
+
+
+def read_grdecl_property_legacy(filepath: str) -> np.ndarray:
+    """Parser original (un float() por token), usado como referencia."""
+    values = []
+    reading = False
+    with open(filepath, "r", encoding="utf-8") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("--"):
+                continue
+            if any(key in line for key in ["YMFS", "SOIL", "SWAT", "SGAS", "PRESSURE"]):
+                reading = True
+                continue
+            if line == "/" or line.startswith("/"):
+                break
+            if reading:
+                parts = line.replace("/", "").split()
+                for part in parts:
+                    if "*" in part:
+                        count_str, value_str = part.split("*")
+                        try:
+                            values.extend([float(value_str)] * int(count_str))
+                        except Exception:
+                            continue
+                    else:
+                        try:
+                            values.append(float(part))
+                        except Exception:
+                            continue
+    return np.array(values, dtype=float)
+
+
+def read_from_sidecar(filepath) -> np.ndarray:
+    """Lectura desde el sidecar, materializando los valores (no solo el memmap)."""
+    return np.array(read_grdecl_property_cached(filepath))
+
+
+def best_time(func, filepath: str, repeats: int = 5) -> float:
+    """Mejor tiempo (s) de `repeats` ejecuciones."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(filepath)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    files = [Path(p) for p in sys.argv[1:]] or sorted((BASE_DIR / "timesteps_export").glob("*.GRDECL"))
+    if not files:
+        print("No se encontraron archivos GRDECL")
+        return
+
+    print("=" * 60)
+    print("Benchmark lector GRDECL")
+    print("=" * 60)
+
+    total_legacy = 0.0
+    total_new = 0.0
+    total_cached = 0.0
+    for filepath in files:
+        legacy = read_grdecl_property_legacy(str(filepath))
+        new = read_grdecl_property(filepath)
+        if not np.array_equal(legacy, new):
+            print(f"  ✗ {filepath.name}: resultados distintos")
+            continue
+
+        if not np.array_equal(read_from_sidecar(filepath), new):
+            print(f"  ✗ {filepath.name}: sidecar distinto")
+            continue
+
+        t_legacy = best_time(read_grdecl_property_legacy, str(filepath))
+        t_new = best_time(read_grdecl_property, str(filepath))
+        t_cached = best_time(read_from_sidecar, filepath)
+        total_legacy += t_legacy
+        total_new += t_new
+        total_cached += t_cached
+        print(f"  ✓ {filepath.name:28s} {new.size:>8,} valores  "
+              f"{t_legacy * 1e3:8.1f} ms -> {t_new * 1e3:7.1f} ms  (x{t_legacy / t_new:.1f})  "
+              f"sidecar {t_cached * 1e3:6.2f} ms  (x{t_legacy / t_cached:.0f})")
+
+    if total_new > 0:
+        print("-" * 60)
+        print(f"Parseo:  {total_legacy:.2f} s -> {total_new:.2f} s  (x{total_legacy / total_new:.1f})")
+        print(f"Sidecar: {total_legacy:.2f} s -> {total_cached:.3f} s  (x{total_legacy / total_cached:.0f})")
+
+
+if __name__ == "__main__":
+    main()
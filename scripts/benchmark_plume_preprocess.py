@@ -0,0 +1,170 @@
+"""
+Benchmark del preprocesado del visor CO₂: columnas vectorizadas
+(`plume_columns`, sobre `geoviz.plume_index`) contra el triple bucle con un
+dict por celda que usaba `preprocess_all_data`.
+
+Usa plumas sintéticas (esferas que crecen con el timestep) en grillas del
+tamaño de Bunter (110 × 63 × 65 = 450.450 celdas) y Sleipner
+(263 × 118 × 64 = 1.986.176 celdas).
+
+Uso:
+    python scripts/benchmark_plume_preprocess.py [--timesteps N] [--thresholds 0.01 0.1 ...]
+                                                 [--skip-legacy]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from geoviz.plume_index import PlumeIndex, axis_coordinates, build_plume_index  # noqa: E402
+
+GRIDS = {
+    "Bunter": (110, 63, 65),
+    "Sleipner": (263, 118, 64),
+}
+
+
+def plume_columns(index: PlumeIndex, timestep: int, threshold: float,
+                  x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                  shape: Optional[Tuple[int, int, int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Columnas float32 `x`, `y`, `z`, `value` de las celdas `>= threshold`.
+
+    Formato por punto del visor anterior; el visor actual envía mallas
+    (`plume_mask`).
+
+    Parameters
+    ----------
+    index : PlumeIndex
+        Índice de la pluma
+    timestep : int
+        Timestep a consultar
+    threshold : float
+        Umbral mínimo (inclusive)
+    x, y, z : np.ndarray
+        Coordenadas por celda o, con `shape`, tablas por eje
+        (ver `axis_coordinates`)
+    shape : tuple, optional
+        (nz, ny, nx) de la grilla, con x variando más rápido
+
+    Returns
+    -------
+    dict
+        Columnas en orden de celda; las celdas fuera de las coordenadas se
+        descartan
+    """
+    cells, values = index.select(timestep, threshold, cell_order=True)
+    if shape is not None:
+        keep = cells < int(np.prod(shape))
+        cells, values = cells[keep], values[keep]
+        k, j, i = np.unravel_index(cells, shape)
+        x, y, z = x[i], y[j], z[k]
+    else:
+        keep = cells < len(x)
+        cells, values = cells[keep], values[keep]
+        x, y, z = x[cells], y[cells], z[cells]
+    return {
+        "x": x.astype(np.float32),
+        "y": y.astype(np.float32),
+        "z": z.astype(np.float32),
+        "value": values.astype(np.float32),
+    }
+
+
+def synthetic_plume(shape, n_timesteps: int, seed: int = 0):
+    """{timestep: YMFS} con esferas alrededor de 4 inyectores que crecen con el tiempo."""
+    nx, ny, nz = shape
+    rng = np.random.default_rng(seed)
+    k, j, i = np.meshgrid(np.arange(nz), np.arange(ny), np.arange(nx), indexing="ij")
+    wells = [(nx * fx, ny * fy) for fx, fy in ((0.25, 0.25), (0.25, 0.75), (0.75, 0.25), (0.75, 0.75))]
+    data = {}
+    for ts in range(n_timesteps):
+        radius = 1.0 + ts * min(nx, ny) / (4.0 * max(n_timesteps - 1, 1))
+        values = np.zeros((nz, ny, nx))
+        for wx, wy in wells:
+            dist = np.sqrt((i - wx) ** 2 + (j - wy) ** 2 + (2.0 * k) ** 2) / radius
+            values = np.maximum(values, np.clip(1.0 - dist, 0.0, None))
+        noise = rng.uniform(0.9, 1.0, values.shape)
+        data[ts] = (values * noise).ravel()
+    return data
+
+
+def preprocess_legacy(values: np.ndarray, shape, axes, threshold: float):
+    """Triple bucle original: un dict {'x','y','z','value'} por celda activa."""
+    nx, ny, nz = shape
+    x_min, dx, y_min, dy, z_top, dz = axes
+    cells = []
+    for k in range(nz):
+        for j in range(ny):
+            for i in range(nx):
+                idx = i + j * nx + k * nx * ny
+                value = values[idx]
+                if value >= threshold:
+                    cells.append({
+                        'x': float(x_min + i * dx),
+                        'y': float(y_min + j * dy),
+                        'z': float(z_top + k * dz),
+                        'value': float(value)
+                    })
+    return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del preprocesado del visor CO₂")
+    parser.add_argument("--timesteps", type=int, default=5, help="Timesteps sintéticos por grilla")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.01, 0.1, 0.5])
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="No medir el bucle original (lento en Sleipner)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Benchmark preprocesado visor CO₂")
+    print("=" * 60)
+
+    for name, shape in GRIDS.items():
+        nx, ny, nz = shape
+        axes = (0.0, 100.0, 0.0, 100.0, -2500.0, -20.0)
+        x_axis = axis_coordinates(nx, axes[0], axes[1])
+        y_axis = axis_coordinates(ny, axes[2], axes[3])
+        z_axis = axis_coordinates(nz, axes[4], axes[5])
+
+        data = synthetic_plume(shape, args.timesteps)
+        start = time.perf_counter()
+        index = build_plume_index(data)
+        t_index = time.perf_counter() - start
+        print(f"\n{name}: {nx * ny * nz:,} celdas, {args.timesteps} timesteps "
+              f"(índice en {t_index * 1e3:.0f} ms)")
+
+        for threshold in args.thresholds:
+            start = time.perf_counter()
+            columns = {ts: plume_columns(index, ts, threshold, x_axis, y_axis, z_axis, shape=(nz, ny, nx))
+                       for ts in data}
+            t_new = time.perf_counter() - start
+            n_active = sum(c["value"].size for c in columns.values())
+
+            if args.skip_legacy:
+                print(f"  ✓ umbral {threshold:.2f}: {n_active:>10,} celdas  {t_new * 1e3:8.1f} ms")
+                continue
+
+            start = time.perf_counter()
+            legacy = {ts: preprocess_legacy(values, shape, axes, threshold) for ts, values in data.items()}
+            t_legacy = time.perf_counter() - start
+
+            same = all(
+                np.array_equal(np.array([c[key] for c in legacy[ts]], dtype=np.float32).reshape(-1),
+                               columns[ts][key])
+                for ts in data for key in ("x", "y", "z", "value"))
+            mark = "✓" if same else "✗"
+            print(f"  {mark} umbral {threshold:.2f}: {n_active:>10,} celdas  "
+                  f"{t_legacy * 1e3:9.1f} ms -> {t_new * 1e3:7.1f} ms  (x{t_legacy / t_new:.0f})")
+
+
+if __name__ == "__main__":
+    main()
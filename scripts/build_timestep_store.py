@@ -0,0 +1,55 @@
+"""
+Empaqueta los GRDECL dinámicos de `timesteps_export/` en el almacén
+memory-mapped (propiedad, timestep, celda) que usa `app.py`.
+
+Uso:
+    python scripts/build_timestep_store.py [--source DIR] [--output DIR] [--properties YMFS SGAS ...]
+                                           [--workers N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from geoviz.ingest import FileTiming, format_timings  # noqa: E402
+from geoviz.timestep_store import build_timestep_store  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye el almacén de timesteps")
+    parser.add_argument("--source", type=Path, default=BASE_DIR / "timesteps_export",
+                        help="Directorio con archivos {PROP}_ts_{NNNN}.GRDECL")
+    parser.add_argument("--output", type=Path, default=BASE_DIR / "outputs" / "cache" / "timesteps_store",
+                        help="Directorio de salida (cube.npy + manifest.json)")
+    parser.add_argument("--properties", nargs="+", default=None,
+                        help="Propiedades a incluir (por defecto: todas)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos de parseo (por defecto: GEOVIZ_INGEST_WORKERS o 1, en serie)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Construyendo almacén de timesteps")
+    print("=" * 60)
+    print(f"Origen: {args.source}")
+    print(f"Destino: {args.output}")
+
+    start = time.perf_counter()
+    store = build_timestep_store(args.source, args.output, properties=args.properties,
+                                 workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    ingest = store.manifest["ingest"]
+    print("\nTiempos por archivo:")
+    print(format_timings([FileTiming(**t) for t in ingest["files"]], ingest["wall_seconds"]))
+
+    print(f"\n✓ Cubo {store.cube.shape} ({store.cube.nbytes / 1e6:.1f} MB) en {elapsed:.2f} s")
+    print(f"  Propiedades: {', '.join(store.properties)}")
+    print(f"  Timesteps: {store.timesteps[0]}..{store.timesteps[-1]} ({len(store.timesteps)})")
+
+
+if __name__ == "__main__":
+    main()
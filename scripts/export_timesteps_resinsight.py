@@ -5,21 +5,27 @@ Este script:
 1. Conecta a ResInsight
 2. Carga el archivo EGRID
 3. Exporta todas las propiedades para cada timestep
+
+Si el archivo .UNRST está junto al EGRID, las propiedades se leen
+directamente con `geoviz.ecl` (dinámicas del UNRST, estáticas del INIT) y
+no hace falta ResInsight.
 """
 
 import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geoviz.ecl import try_export_restart
+from geoviz.grdecl import write_grdecl_property
+
+# ResInsight solo hace falta si no hay archivo UNRST junto al EGRID
 try:
     import rips
-    print(f"✓ ResInsight API {rips.__version__ if hasattr(rips, '__version__') else 'cargada'}")
 except ImportError:
-    print("Error: ResInsight Python API no está instalada")
-    print("Asegúrate de tener ResInsight instalado y la API disponible")
-    sys.exit(1)
+    rips = None
 
 
-def export_all_timesteps(egrid_file, output_dir=None, properties=None):
+def export_all_timesteps(egrid_file, output_dir=None, properties=None, rle=False):
     """
     Exporta todas las propiedades para todos los timesteps desde ResInsight.
     
@@ -31,6 +37,8 @@ def export_all_timesteps(egrid_file, output_dir=None, properties=None):
         Directorio de salida (por defecto: mismo directorio que el EGRID)
     properties : list, optional
         Lista de propiedades a exportar (por defecto: todas disponibles)
+    rle : bool, optional
+        Escribir rachas de valores iguales como `N*valor` (archivos más chicos)
     """
     
     # Verificar que el archivo existe
@@ -49,7 +57,20 @@ def export_all_timesteps(egrid_file, output_dir=None, properties=None):
     print("="*60)
     print(f"\nArchivo EGRID: {egrid_file}")
     print(f"Directorio de salida: {output_dir}")
-    
+
+    if properties is None:
+        properties = ['SOIL', 'SWAT', 'SGAS', 'PRESSURE', 'PORO', 'PERMX', 'PERMY', 'PERMZ']
+    print(f"\nPropiedades a exportar: {properties}")
+
+    # Lectura local del UNRST (sin ResInsight ni gRPC) si está junto al EGRID
+    if try_export_restart(egrid_file, output_dir, properties, rle=rle):
+        return
+
+    if rips is None:
+        print("Error: No hay archivo UNRST y la API de Python de ResInsight no está instalada")
+        return
+    print(f"✓ ResInsight API {rips.__version__ if hasattr(rips, '__version__') else 'cargada'}")
+
     # Conectar a ResInsight
     print("\nConectando a ResInsight...")
     try:
@@ -129,17 +150,6 @@ def export_all_timesteps(egrid_file, output_dir=None, properties=None):
         print(f"Error al obtener timesteps: {e}")
         return
     
-    # Obtener propiedades disponibles
-    if properties is None:
-        try:
-            # Intentar obtener propiedades disponibles
-            # Nota: La API puede variar, esto es un ejemplo
-            properties = ['SOIL', 'SWAT', 'SGAS', 'PRESSURE', 'PORO', 'PERMX', 'PERMY', 'PERMZ']
-            print(f"\nPropiedades a exportar: {properties}")
-        except Exception as e:
-            print(f"Advertencia: No se pudieron obtener propiedades automáticamente: {e}")
-            properties = ['SOIL', 'SWAT', 'SGAS']
-    
     # Exportar para cada timestep
     print("\n" + "="*60)
     print("Exportando propiedades para cada timestep")
@@ -187,15 +197,9 @@ def export_all_timesteps(egrid_file, output_dir=None, properties=None):
                             )
                             
                             # Escribir en formato GRDECL
-                            with open(output_file, 'w') as f:
-                                f.write(f"-- Exported from ResInsight - Timestep {i}\n")
-                                f.write(f"{prop}\n")
-                                # Formatear valores (5 por línea como en GRDECL)
-                                if values:
-                                    for j in range(0, len(values), 5):
-                                        line_vals = values[j:j+5]
-                                        f.write(" ".join(f"{v:15.6f}" for v in line_vals) + "\n")
-                                f.write("/\n")
+                            write_grdecl_property(output_file, prop, values or [],
+                                                  header=f"Exported from ResInsight - Timestep {i}",
+                                                  rle=rle)
                             print(f"  ✓ {prop} exportado -> {output_file}")
                         except Exception as e2:
                             print(f"  ✗ Error al exportar {prop}: {e2}")
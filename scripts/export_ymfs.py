@@ -1,18 +1,25 @@
 """
 Script para exportar YMFS (propiedad de inyección) desde ResInsight.
+
+Si el archivo .UNRST está junto al EGRID se lee directamente con
+`geoviz.ecl`, sin necesidad de tener ResInsight abierto.
 """
 
 import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geoviz.ecl import try_export_restart
+from geoviz.grdecl import write_grdecl_property
+
+# ResInsight solo hace falta si no hay archivo UNRST junto al EGRID
 try:
     import rips
 except ImportError:
-    print("Error: ResInsight Python API no está instalada")
-    sys.exit(1)
+    rips = None
 
 
-def export_ymfs_timesteps(egrid_file, output_dir=None):
+def export_ymfs_timesteps(egrid_file, output_dir=None, rle=False):
     """Exporta YMFS para todos los timesteps."""
     
     if not os.path.exists(egrid_file):
@@ -29,6 +36,14 @@ def export_ymfs_timesteps(egrid_file, output_dir=None):
     print("="*60)
     print(f"\nArchivo EGRID: {egrid_file}")
     print(f"Directorio de salida: {output_dir}")
+
+    # Lectura local del UNRST (sin ResInsight ni gRPC) si está junto al EGRID
+    if try_export_restart(egrid_file, output_dir, ["YMFS"], rle=rle):
+        return
+
+    if rips is None:
+        print("Error: No hay archivo UNRST y la API de Python de ResInsight no está instalada")
+        return
     
     # Conectar a ResInsight
     print("\nConectando a ResInsight...")
@@ -89,14 +104,8 @@ def export_ymfs_timesteps(egrid_file, output_dir=None):
             if values:
                 # Escribir en formato GRDECL
                 output_file = os.path.join(output_dir, f"YMFS_ts_{i:04d}.GRDECL")
-                with open(output_file, 'w') as f:
-                    f.write(f"-- Exported from ResInsight - Timestep {i}\n")
-                    f.write(f"YMFS\n")
-                    # Formatear valores (5 por línea como en GRDECL)
-                    for j in range(0, len(values), 5):
-                        line_vals = values[j:j+5]
-                        f.write(" ".join(f"{v:15.6f}" for v in line_vals) + "\n")
-                    f.write("/\n")
+                write_grdecl_property(output_file, "YMFS", values,
+                                      header=f"Exported from ResInsight - Timestep {i}", rle=rle)
                 print(f"  ✓ YMFS exportado -> {output_file}")
             else:
                 print(f"  ⚠ No se obtuvieron datos para timestep {i}")
@@ -5,6 +5,9 @@ Este script:
 1. Exporta YMFS desde ResInsight usando la API
 2. Convierte los datos GRDECL a formato VTK usando PyVista
 3. Guarda archivos VTK por timestep para visualización en Streamlit
+
+Si el archivo .UNRST está junto al EGRID, YMFS, las dimensiones y la
+extensión del grid se leen directamente con `geoviz.ecl` (sin ResInsight).
 """
 
 import os
@@ -15,12 +18,15 @@ from pathlib import Path
 os.environ['PYVISTA_OFF_SCREEN'] = 'true'
 os.environ['DISPLAY'] = ''
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from geoviz.ecl import EclGrid, read_restart_property, restart_path  # noqa: E402
+from geoviz.grdecl import write_grdecl_property  # noqa: E402
+
+# ResInsight solo hace falta si no hay archivo UNRST junto al EGRID
 try:
     import rips
 except ImportError:
-    print("Error: ResInsight Python API no está instalada")
-    print("Instala ResInsight y asegúrate de que la API esté disponible")
-    sys.exit(1)
+    rips = None
 
 try:
     import pyvista as pv
@@ -32,35 +38,46 @@ except ImportError:
     sys.exit(1)
 
 
-def read_grdecl_property(filepath: str) -> np.ndarray:
-    """Lee valores de un archivo GRDECL."""
-    values = []
-    reading = False
-    with open(filepath, "r", encoding="utf-8") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("--"):
-                continue
-            if "YMFS" in line:
-                reading = True
-                continue
-            if line == "/" or line.startswith("/"):
-                break
-            if reading:
-                parts = line.replace("/", "").split()
-                for part in parts:
-                    if "*" in part:
-                        count_str, value_str = part.split("*")
-                        try:
-                            values.extend([float(value_str)] * int(count_str))
-                        except Exception:
-                            continue
-                    else:
-                        try:
-                            values.append(float(part))
-                        except Exception:
-                            continue
-    return np.array(values, dtype=float)
+def export_ymfs_to_vtk_local(egrid_file: str, output_dir: Path, grdecl_dir: Path) -> int:
+    """
+    Exporta YMFS a GRDECL y VTK leyendo EGRID y UNRST directamente.
+
+    Returns
+    -------
+    int
+        Número de timesteps exportados
+    """
+    unrst_file = restart_path(egrid_file)
+    print(f"\n[1/2] Leyendo {Path(egrid_file).name} y {unrst_file.name}...")
+    grid = EclGrid(egrid_file)
+    nx, ny, nz = grid.dims
+    (x_min, x_max), (y_min, y_max), (z_min, z_max) = grid.corner_bounds()
+    ymfs_by_step = read_restart_property(unrst_file, "YMFS")
+    print(f"✓ Grid: {nx} × {ny} × {nz} ({grid.n_active} celdas activas)")
+    print(f"✓ Timesteps encontrados: {len(ymfs_by_step)}")
+    if not ymfs_by_step:
+        print("No hay YMFS en el UNRST")
+        return 0
+
+    x = np.linspace(x_min, x_max, nx + 1)
+    y = np.linspace(y_min, y_max, ny + 1)
+    z = np.linspace(z_min, z_max, nz + 1)
+    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+    grid_base = pv.StructuredGrid()
+    grid_base.points = np.column_stack([X.ravel(), Y.ravel(), Z.ravel()])
+    grid_base.dimensions = [nx + 1, ny + 1, nz + 1]
+
+    print("\n[2/2] Convirtiendo timesteps...")
+    for i, step in enumerate(sorted(ymfs_by_step)):
+        values = grid.to_global(ymfs_by_step[step], fill=0.0).astype(float)
+        write_grdecl_property(grdecl_dir / f"YMFS_ts_{i:04d}.GRDECL", "YMFS", values,
+                              header=f"Exported from UNRST - GEOSX Simulation - Timestep {i}")
+        grid_with_ymfs = grid_base.copy()
+        grid_with_ymfs.cell_data['YMFS'] = values
+        vtk_file = output_dir / f"ymfs_ts_{i:04d}.vtk"
+        grid_with_ymfs.save(str(vtk_file))
+        print(f"  ✓ Timestep {i} -> {vtk_file.name}  (Min: {values.min():.6f}, Max: {values.max():.6f})")
+    return len(ymfs_by_step)
 
 
 def export_ymfs_to_vtk_geosx(egrid_file: str, output_dir: str = None):
@@ -98,7 +115,20 @@ def export_ymfs_to_vtk_geosx(egrid_file: str, output_dir: str = None):
     print(f"\nArchivo EGRID: {egrid_file}")
     print(f"Directorio VTK: {output_dir}")
     print(f"Directorio GRDECL temporal: {grdecl_dir}")
-    
+
+    # Lectura local del UNRST (sin ResInsight ni gRPC) si está junto al EGRID
+    if restart_path(egrid_file) is not None:
+        exported_count = export_ymfs_to_vtk_local(egrid_file, output_dir, grdecl_dir)
+        print("\n" + "="*60)
+        print(f"✓ Exportación completada: {exported_count} timesteps")
+        print("="*60)
+        print(f"\nArchivos VTK guardados en: {output_dir}")
+        return
+
+    if rips is None:
+        print("Error: No hay archivo UNRST y la API de Python de ResInsight no está instalada")
+        return
+
     # Paso 1: Conectar a ResInsight
     print("\n[1/3] Conectando a ResInsight...")
     try:
@@ -377,13 +407,8 @@ def export_ymfs_to_vtk_geosx(egrid_file: str, output_dir: str = None):
             
             # Guardar temporalmente en GRDECL
             grdecl_file = grdecl_dir / f"YMFS_ts_{i:04d}.GRDECL"
-            with open(grdecl_file, 'w') as f:
-                f.write(f"-- Exported from ResInsight - GEOSX Simulation - Timestep {i}\n")
-                f.write(f"YMFS\n")
-                for j in range(0, len(values), 5):
-                    line_vals = values[j:j+5]
-                    f.write(" ".join(f"{v:15.6f}" for v in line_vals) + "\n")
-                f.write("/\n")
+            write_grdecl_property(grdecl_file, "YMFS", values,
+                                  header=f"Exported from ResInsight - GEOSX Simulation - Timestep {i}")
             
             # Crear copia del grid base
             grid_with_ymfs = grid_base.copy()
@@ -5,7 +5,10 @@ Este script carga los datos sin intentar renderizar, útil cuando no hay display
 """
 
 import os
-import numpy as np
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geoviz.grdecl import read_grdecl_property
 
 # Configurar para evitar inicialización de OpenGL
 os.environ['PYVISTA_OFF_SCREEN'] = 'true'
@@ -20,44 +23,6 @@ except ImportError:
     exit(1)
 
 
-def read_grdecl_property(filename):
-    """
-    Lee una propiedad desde un archivo GRDECL.
-    """
-    values = []
-    property_name_found = False
-    
-    with open(filename, 'r') as f:
-        for line in f:
-            line = line.strip()
-            
-            # Ignorar comentarios y líneas vacías
-            if not line or line.startswith('--'):
-                continue
-            
-            # Detectar el final de los datos
-            if line == '/':
-                break
-            
-            # Buscar el nombre de la propiedad
-            if not property_name_found:
-                if not any(char.isdigit() for char in line):
-                    property_name_found = True
-                    continue
-            
-            # Después del nombre, empezar a leer datos numéricos
-            if property_name_found:
-                parts = line.split()
-                for part in parts:
-                    try:
-                        val = float(part)
-                        values.append(val)
-                    except ValueError:
-                        continue
-                            
-    return np.array(values)
-
-
 def main():
     """Función principal para cargar los archivos GRDECL."""
     
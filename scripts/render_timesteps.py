@@ -0,0 +1,75 @@
+"""
+Pre-renderiza en paralelo los HTML autónomos de YMFS por timestep en
+`outputs/html/timesteps_embedded/` para una grilla de combinaciones
+(timestep × umbral × escala Z × inyectores). Las combinaciones al día según
+el `manifest.json` del directorio se omiten.
+
+Uso:
+    python scripts/render_timesteps.py [--timesteps 0 1 2 ...] [--thresholds 0.10 0.52]
+                                       [--zscales 1 5] [--injectors on off]
+                                       [--workers N] [--output DIR] [--force]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from geoviz.ingest import timestep_files  # noqa: E402
+from geoviz.timestep_html import plan_jobs, render_batch  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-renderiza HTML de YMFS por timestep")
+    parser.add_argument("--source", type=Path, default=BASE_DIR / "timesteps_export",
+                        help="Directorio con archivos YMFS_ts_{NNNN}.GRDECL")
+    parser.add_argument("--output", type=Path, default=BASE_DIR / "outputs" / "html" / "timesteps_embedded",
+                        help="Directorio de salida (HTML + manifest.json)")
+    parser.add_argument("--timesteps", type=int, nargs="+", default=None,
+                        help="Timesteps a renderizar (por defecto: todos)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.10],
+                        help="Umbrales de YMFS")
+    parser.add_argument("--zscales", type=float, nargs="+", default=[1],
+                        help="Escalas verticales")
+    parser.add_argument("--injectors", choices=["on", "off"], nargs="+", default=["on"],
+                        help="Mostrar inyectores")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos (por defecto: GEOVIZ_INGEST_WORKERS o 1, en serie)")
+    parser.add_argument("--force", action="store_true",
+                        help="Renderizar también las combinaciones al día")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Pre-renderizando timesteps")
+    print("=" * 60)
+
+    files = timestep_files(args.source, "YMFS_ts_*.GRDECL")
+    if args.timesteps is not None:
+        wanted = set(args.timesteps)
+        missing = sorted(wanted - {ts for ts, _ in files})
+        if missing:
+            print(f"⚠ Timesteps sin archivo: {missing}")
+        files = [(ts, fp) for ts, fp in files if ts in wanted]
+    if not files:
+        print(f"✗ No hay archivos YMFS_ts_*.GRDECL en {args.source}")
+        sys.exit(1)
+
+    jobs = plan_jobs(files, args.thresholds, args.zscales, [flag == "on" for flag in args.injectors])
+    print(f"Origen: {args.source}")
+    print(f"Destino: {args.output}")
+    print(f"Combinaciones: {len(jobs)} ({len(files)} timesteps × {len(args.thresholds)} umbrales × "
+          f"{len(args.zscales)} escalas × {len(args.injectors)} inyectores)")
+
+    report = render_batch(jobs, args.output, workers=args.workers, force=args.force)
+
+    for result in report.rendered:
+        print(f"  ✓ {result.name:40s} {result.seconds * 1e3:7.1f} ms  "
+              f"{result.bytes / 1e6:5.2f} MB  {result.n_triangles:7d} triángulos  (pid {result.pid})")
+    print(f"\n✓ {len(report.rendered)} renderizados, {len(report.skipped)} al día, "
+          f"en {report.wall_seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,10 @@ sin problemas de OpenGL/display.
 """
 
 import os
-import numpy as np
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geoviz.grdecl import read_grdecl_property
 
 # Configurar para solucionar problema de OpenGL
 os.environ['LIBGL_ALWAYS_SOFTWARE'] = '1'
@@ -23,38 +26,6 @@ except ImportError:
     exit(1)
 
 
-def read_grdecl_property(filename):
-    """Lee una propiedad desde un archivo GRDECL."""
-    values = []
-    property_name_found = False
-    
-    with open(filename, 'r') as f:
-        for line in f:
-            line = line.strip()
-            
-            if not line or line.startswith('--'):
-                continue
-            
-            if line == '/':
-                break
-            
-            if not property_name_found:
-                if not any(char.isdigit() for char in line):
-                    property_name_found = True
-                    continue
-            
-            if property_name_found:
-                parts = line.split()
-                for part in parts:
-                    try:
-                        val = float(part)
-                        values.append(val)
-                    except ValueError:
-                        continue
-                            
-    return np.array(values)
-
-
 def main():
     """Función principal."""
     
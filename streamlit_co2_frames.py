@@ -1,44 +1,17 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-import re
 from pathlib import Path
 
-st.set_page_config(page_title="CO2 Frames (Client-side)", page_icon="⚡", layout="wide")
-
+from geoviz.ingest import load_timesteps, timestep_files
+from geoviz.plume_index import axis_coordinates
+from geoviz.voxel_mesh import VoxelMesh, exposed_faces, share_vertices
 
-def read_grdecl_property(filepath: str) -> np.ndarray:
-    values = []
-    reading = False
-    with open(filepath, 'r') as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith('--'):
-                continue
-            if any(k in line for k in ['YMFS', 'SOIL', 'SWAT', 'SGAS', 'PRESSURE']):
-                reading = True
-                continue
-            if line == '/' or line.startswith('/'):
-                break
-            if reading:
-                parts = line.replace('/', '').split()
-                for p in parts:
-                    if '*' in p:
-                        cnt, val = p.split('*')
-                        try:
-                            values.extend([float(val)] * int(cnt))
-                        except Exception:
-                            continue
-                    else:
-                        try:
-                            values.append(float(p))
-                        except Exception:
-                            continue
-    return np.array(values)
+st.set_page_config(page_title="CO2 Frames (Client-side)", page_icon="⚡", layout="wide")
 
 
-def build_voxels_from_values(ymfs_values: np.ndarray, threshold: float,
-                             nx: int = 100, ny: int = 100, nz: int = 10):
+def build_voxel_mesh(ymfs_values: np.ndarray, threshold: float,
+                     nx: int = 100, ny: int = 100, nz: int = 10) -> VoxelMesh:
     x_min, x_max = 0, 10000
     y_min, y_max = 0, 10000
     z_top, z_bottom = -2500, -2700
@@ -48,51 +21,22 @@ def build_voxels_from_values(ymfs_values: np.ndarray, threshold: float,
     cell_size_z = (z_bottom - z_top) / (nz - 1)
 
     total = nx * ny * nz
-    if len(ymfs_values) < total:
-        full = np.zeros(total)
-        full[:len(ymfs_values)] = ymfs_values
-        ymfs_values = full
-
-    voxel_x, voxel_y, voxel_z = [], [], []
-    voxel_i, voxel_j, voxel_k = [], [], []
-    voxel_colors = []
-    vtx_count = 0
-
-    for k in range(nz - 1):
-        for j in range(ny - 1):
-            for i in range(nx - 1):
-                idx = i + j * nx + k * nx * ny
-                if ymfs_values[idx] >= threshold:
-                    val = ymfs_values[idx]
-                    x0 = x_min + i * cell_size_x
-                    y0 = y_min + j * cell_size_y
-                    z0 = z_top + k * cell_size_z
-                    verts = [
-                        [x0, y0, z0],
-                        [x0 + cell_size_x, y0, z0],
-                        [x0 + cell_size_x, y0 + cell_size_y, z0],
-                        [x0, y0 + cell_size_y, z0],
-                        [x0, y0, z0 + cell_size_z],
-                        [x0 + cell_size_x, y0, z0 + cell_size_z],
-                        [x0 + cell_size_x, y0 + cell_size_y, z0 + cell_size_z],
-                        [x0, y0 + cell_size_y, z0 + cell_size_z]
-                    ]
-                    voxel_x.extend([v[0] for v in verts])
-                    voxel_y.extend([v[1] for v in verts])
-                    voxel_z.extend([v[2] for v in verts])
-                    base = vtx_count
-                    faces = [
-                        [0,1,2],[0,2,3], [4,6,5],[4,7,6],
-                        [0,4,5],[0,5,1], [2,6,7],[2,7,3],
-                        [0,3,7],[0,7,4], [1,5,6],[1,6,2]
-                    ]
-                    for f in faces:
-                        voxel_i.append(base + f[0])
-                        voxel_j.append(base + f[1])
-                        voxel_k.append(base + f[2])
-                        voxel_colors.append(val)
-                    vtx_count += 8
-    return voxel_x, voxel_y, voxel_z, voxel_i, voxel_j, voxel_k, voxel_colors
+    full = np.zeros(total)
+    n = min(len(ymfs_values), total)
+    full[:n] = ymfs_values[:n]
+    ymfs_values = full.reshape(nz, ny, nx)
+
+    # Celdas activas (la última capa de cada eje no se dibuja). Solo se
+    # generan las caras no compartidas con otra celda activa
+    mask = ymfs_values >= threshold
+    mask[-1, :, :] = False
+    mask[:, -1, :] = False
+    mask[:, :, -1] = False
+    return exposed_faces(mask,
+                         axis_coordinates(nx, x_min, cell_size_x),
+                         axis_coordinates(ny, y_min, cell_size_y),
+                         axis_coordinates(nz, z_top, cell_size_z),
+                         (cell_size_x, cell_size_y, cell_size_z), ymfs_values)
 
 
 def build_injector_cubes():
@@ -139,31 +83,26 @@ def load_all_timesteps():
     tdir = base / 'timesteps_export'
     if not tdir.exists():
         return {}, []
-    files = sorted(tdir.glob('YMFS_ts_*.GRDECL'))
-    data = {}
-    idxs = []
-    for fp in files:
-        m = re.search(r'ts_(\d+)', fp.name)
-        if not m:
-            continue
-        ts = int(m.group(1))
-        arr = read_grdecl_property(str(fp))
-        data[ts] = arr
-        idxs.append(ts)
-    idxs.sort()
-    return data, idxs
+    data, _ = load_timesteps(timestep_files(tdir, 'YMFS_ts_*.GRDECL'))
+    return data, sorted(data)
 
 
 def build_figure_frames(ymfs_dict: dict, timestep_indices: list, threshold: float,
                         z_scale: int):
+    # Geometría compartida: una tabla de vértices para todos los timesteps;
+    # cada frame solo lleva sus triángulos (qué caras se ven) y su intensidad
+    vertices, meshes = share_vertices([build_voxel_mesh(ymfs_dict[ts], threshold) for ts in timestep_indices])
+    # Con menos de 65.536 vértices los índices viajan como uint16 (la mitad de bytes)
+    index_dtype = np.uint16 if len(vertices) <= np.iinfo(np.uint16).max + 1 else np.uint32
+    meshes = [mesh._replace(triangles=mesh.triangles.astype(index_dtype)) for mesh in meshes]
     frames = []
     first_ts = timestep_indices[0]
-    x,y,z,i,j,k,intensity = build_voxels_from_values(ymfs_dict[first_ts], threshold)
+    first = meshes[0].as_columns()
 
     fig = go.Figure(
         data=[go.Mesh3d(
-            x=x, y=y, z=z, i=i, j=j, k=k,
-            intensity=intensity, colorscale='Hot', cmin=threshold, cmax=1.0,
+            x=first['x'], y=first['y'], z=first['z'], i=first['i'], j=first['j'], k=first['k'],
+            intensity=first['intensity'], intensitymode='cell', colorscale='Hot', cmin=threshold, cmax=1.0,
             showscale=True, name=f'CO2 ts{first_ts}',
             flatshading=False, lighting=dict(ambient=0.7, diffuse=0.8, specular=0.2)
         )]
@@ -177,13 +116,12 @@ def build_figure_frames(ymfs_dict: dict, timestep_indices: list, threshold: floa
         showscale=False, visible=True
     ))
 
-    for ts in timestep_indices:
-        vx,vy,vz,vi,vj,vk,vcol = build_voxels_from_values(ymfs_dict[ts], threshold)
-        frames.append(go.Frame(name=f"ts{ts}", data=[go.Mesh3d(
-            x=vx, y=vy, z=vz, i=vi, j=vj, k=vk,
-            intensity=vcol, colorscale='Hot', cmin=threshold, cmax=1.0,
-            showscale=True, name=f'CO2 ts{ts}', flatshading=False,
-            lighting=dict(ambient=0.7, diffuse=0.8, specular=0.2)
+    # Los frames actualizan solo el trace 0; x/y/z, colores e iluminación
+    # se conservan del trace base
+    for ts, mesh in zip(timestep_indices, meshes):
+        c = mesh.as_columns()
+        frames.append(go.Frame(name=f"ts{ts}", traces=[0], data=[go.Mesh3d(
+            i=c['i'], j=c['j'], k=c['k'], intensity=c['intensity'], name=f'CO2 ts{ts}'
         )]))
 
     fig.frames = frames